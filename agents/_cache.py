@@ -0,0 +1,163 @@
+"""
+Content-addressed cache for provider responses.
+
+Entries are keyed by a SHA-256 digest of the prompt version, provider,
+model, role instructions and prompt, and hold the (content, citations,
+confidence) tuple returned by the provider. An in-memory LRU with a TTL
+serves repeated calls within a process; an optional JSON layer under
+data/llm_cache/<digest[:2]>/<digest>.json survives restarts.
+
+Environment:
+    LLM_CACHE:           true|false (default: true)
+    LLM_CACHE_SIZE:      Max in-memory entries (default: 1024)
+    LLM_CACHE_TTL_S:     Entry lifetime in seconds, 0 disables expiry (default: 3600)
+    LLM_CACHE_DISK:      true|false, also persist entries to disk (default: false)
+    LLM_CACHE_DIR:       Directory for the disk layer (default: data/llm_cache)
+
+These are read once into the agents._env snapshot along with the provider
+settings; invalid numbers are logged and replaced by their defaults.
+
+Sampling temperature (LLM_TEMPERATURE) is part of the key, and caching is
+skipped altogether above CACHEABLE_MAX_TEMPERATURE, where callers expect
+varied answers to the same prompt.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from agents._env import provider_env
+
+try:  # optional, faster JSON parsing
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# Bump when role instructions or prompt assembly change so stale entries are ignored.
+PROMPT_VERSION = "2"
+
+Result = Tuple[str, List[str], float]
+
+CACHEABLE_MAX_TEMPERATURE = 0.3
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "llm_cache"
+
+
+def cache_key(instructions: str, prompt: str) -> str:
+    """Digest identifying a provider call; includes provider/model/temperature so changing any misses."""
+    env = provider_env()
+    src = "\0".join((PROMPT_VERSION, env.provider_name, env.model_name, repr(env.temperature), instructions, prompt))
+    return hashlib.sha256(src.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU + TTL cache with an optional on-disk JSON layer."""
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl_s: float = 3600.0,
+        disk_dir: Optional[Path] = None,
+    ) -> None:
+        self.maxsize = max(1, maxsize)
+        self.ttl_s = ttl_s
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[str, Tuple[float, Result]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl_s > 0 and (time.time() - stored_at) > self.ttl_s
+
+    def _disk_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Result]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is not None:
+                stored_at, value = hit
+                if not self._expired(stored_at):
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+        if self.disk_dir is None:
+            return None
+        try:
+            data = _loads(self._disk_path(key).read_bytes())
+        except (OSError, ValueError):
+            return None
+        stored_at = float(data.get("stored_at", 0))
+        if self._expired(stored_at):
+            return None
+        value = (str(data["content"]), list(data.get("citations", [])), float(data["confidence"]))
+        self._remember(key, stored_at, value)
+        return value
+
+    def set(self, key: str, value: Result) -> None:
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+        if self.disk_dir is None:
+            return
+        content, citations, confidence = value
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(
+                json.dumps({
+                    "stored_at": stored_at,
+                    "prompt_version": PROMPT_VERSION,
+                    "content": content,
+                    "citations": citations,
+                    "confidence": confidence,
+                }, ensure_ascii=False),
+                encoding="utf-8",
+            )
+            os.replace(tmp, path)
+        except OSError as exc:
+            logging.warning("Failed to write LLM cache entry %s: %s", key[:12], exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, key: str, stored_at: float, value: Result) -> None:
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_CACHE: Optional[ResponseCache] = None
+_CACHE_SETTINGS: Optional[tuple] = None  # (size, ttl, disk dir) _CACHE was built with
+_CACHE_LOCK = threading.Lock()
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Process-wide cache configured from the provider snapshot, or None when disabled."""
+    global _CACHE, _CACHE_SETTINGS
+    env = provider_env()
+    if not env.cache_enabled or env.temperature > CACHEABLE_MAX_TEMPERATURE:
+        return None
+    settings = (env.cache_size, env.cache_ttl_s, env.cache_dir)
+    if settings != _CACHE_SETTINGS:
+        with _CACHE_LOCK:
+            if settings != _CACHE_SETTINGS:
+                _CACHE = ResponseCache(
+                    maxsize=env.cache_size,
+                    ttl_s=env.cache_ttl_s,
+                    disk_dir=Path(env.cache_dir or _DEFAULT_DIR) if env.cache_dir is not None else None,
+                )
+                _CACHE_SETTINGS = settings
+    return _CACHE
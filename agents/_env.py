@@ -0,0 +1,83 @@
+"""
+Process-wide snapshot of the provider-related environment.
+
+Agents consult these settings on every call; reading them once keeps
+os.getenv out of the per-call path. The snapshot is taken lazily on first
+use (so .env loading in api.server still applies) and can be rebuilt with
+ProviderEnv.refresh() after changing the environment, e.g. in tests.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import os
+from typing import Callable, ClassVar, Optional
+
+
+def _number(name: str, default: float, cast: Callable[[str], float] = float) -> float:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logging.warning("Ignoring invalid %s=%r, using %s", name, raw, default)
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class ProviderEnv:
+    """Frozen view of LLM provider configuration."""
+
+    require_provider: bool
+    provider_set: bool
+    provider_name: str
+    model_name: str
+    temperature: float
+    share_prefix: bool
+    # agents._cache response cache (LLM_CACHE*)
+    cache_enabled: bool
+    cache_size: int
+    cache_ttl_s: float
+    cache_dir: Optional[str]  # disk layer directory, None when LLM_CACHE_DISK is off
+
+    _current: ClassVar[Optional["ProviderEnv"]] = None
+
+    @classmethod
+    def from_environ(cls) -> "ProviderEnv":
+        explicit = (os.getenv("LLM_PROVIDER") or "").lower().strip()
+        gemini = os.getenv("GEMINI_API_KEY")
+        groq = os.getenv("GROQ_API_KEY")
+        grok = os.getenv("GROK_API_KEY")
+        # Same precedence the API reports: explicit provider, then whichever key is set
+        name = explicit or ("gemini" if gemini else "groq" if groq else "grok" if grok else "mock")
+        temperature = _number("LLM_TEMPERATURE", 0.2)
+        cache_disk = os.getenv("LLM_CACHE_DISK", "false").lower() == "true"
+        return cls(
+            require_provider=os.getenv("REQUIRE_PROVIDER", "false").lower() == "true",
+            provider_set=bool(gemini or groq or grok or explicit),
+            provider_name=name,
+            model_name=os.getenv("MODEL_NAME", ""),
+            temperature=temperature,
+            share_prefix=os.getenv("LLM_SHARE_PREFIX", "false").lower() in ("1", "true"),
+            cache_enabled=os.getenv("LLM_CACHE", "true").lower() == "true",
+            cache_size=_number("LLM_CACHE_SIZE", 1024, int),
+            cache_ttl_s=_number("LLM_CACHE_TTL_S", 3600.0),
+            cache_dir=(os.getenv("LLM_CACHE_DIR") or "") if cache_disk else None,
+        )
+
+    @classmethod
+    def get(cls) -> "ProviderEnv":
+        if cls._current is None:
+            cls._current = cls.from_environ()
+        return cls._current
+
+    @classmethod
+    def refresh(cls) -> "ProviderEnv":
+        cls._current = cls.from_environ()
+        return cls._current
+
+
+def provider_env() -> ProviderEnv:
+    """Current snapshot, taken on first call."""
+    return ProviderEnv.get()
@@ -3,19 +3,27 @@ Base agent abstractions and a placeholder Grok API client.
 
 Each role-specific agent should inherit from BaseAgent and supply role
 instructions. The send() method composes a role-prefixed prompt and calls
-a mock Grok API function to obtain a structured response.
+a mock Grok API function to obtain a structured response; asend() is the
+awaitable equivalent used by the async orchestrator.
 """
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import asyncio
 from dataclasses import dataclass
 import hashlib
 import os
-from typing import List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import logging
 
+try:  # optional, faster hashing for the mock path
+    from blake3 import blake3  # type: ignore
+except Exception:  # pragma: no cover
+    blake3 = None  # type: ignore
+
+from agents._cache import cache_key, get_cache
+from agents._env import provider_env
 from schemas.models import Message
-import os
 
 
 @dataclass
@@ -39,6 +47,9 @@ class BaseAgent(ABC):
 
     def __init__(self, config: AgentConfig) -> None:
         self.config = config
+        # Instructions are fixed per agent; pre-encode what the mock path needs
+        self._instructions_bytes = config.instructions.encode("utf-8")
+        self._instructions_first_line = (config.instructions.splitlines() or [""])[0].strip()
 
     @abstractmethod
     def role_prompt(self) -> str:
@@ -63,7 +74,37 @@ class BaseAgent(ABC):
             confidence=confidence,
         )
 
+    async def asend(self, prompt: str, on_delta: Optional[Callable[[str], None]] = None) -> Message:
+        """Async counterpart of send(); awaits the provider without blocking the loop.
+
+        With on_delta, a real provider response is streamed and each text
+        fragment is passed to on_delta as it arrives; cached and mock
+        responses complete at once without calling it.
+        """
+        content, citations, confidence = await self._acall_grok_api(
+            prompt=prompt, instructions=self.role_prompt(), on_delta=on_delta
+        )
+        return Message(
+            role=self.config.role_name,
+            content=content,
+            citations=citations,
+            confidence=confidence,
+        )
+
     # -------- Internals / Mock API --------
+    @staticmethod
+    def _provider_requested() -> bool:
+        """Whether a real provider call should be attempted.
+
+        Raises:
+            RuntimeError: REQUIRE_PROVIDER is true but no provider env is set.
+        """
+        # Try real provider (Gemini/Groq/Grok) if any relevant env is set.
+        env = provider_env()
+        if not env.provider_set and env.require_provider:
+            raise RuntimeError("REQUIRE_PROVIDER is true but no provider configuration was found")
+        return env.provider_set
+
     def _call_grok_api(self, prompt: str, instructions: str) -> Tuple[str, List[str], float]:
         """Placeholder for calling Grok's API.
 
@@ -73,36 +114,107 @@ class BaseAgent(ABC):
         Environment:
             GROK_API_KEY: If present, indicates a real integration can be wired later.
             MODEL_NAME:   Defaults to "grok-beta".
+            LLM_SHARE_PREFIX: Prepend SHARED_SYSTEM_PREFIX to the system message.
+
+        Successful provider responses are memoized in agents._cache (and in
+        agents.semantic_cache when enabled); mock fallbacks are not cached so
+        a transient outage doesn't stick.
         """
-        # Attempt real Grok call if API key is present; otherwise fallback to mock.
-        # Try real provider (Gemini/Groq/Grok) if any relevant env is set.
-        require_provider = (os.getenv("REQUIRE_PROVIDER", "false").lower() == "true")
-        provider_env_set = bool(os.getenv("GEMINI_API_KEY") or os.getenv("GROQ_API_KEY") or os.getenv("GROK_API_KEY") or os.getenv("LLM_PROVIDER"))
-        if provider_env_set:
+        # Attempt real provider call if configured; otherwise fallback to mock.
+        if self._provider_requested():
+            system = _system_prompt(instructions)
+            key, vec, cached = self._cache_lookup(system, prompt)
+            if cached is not None:
+                return cached
             try:
-                from integrations.grok_client import LLMClient  # local import to avoid hard dep when mocking
-
-                client = LLMClient()
-                return client.generate(instructions=instructions, prompt=prompt)
+                client = _shared_llm_client()
+                result = client.generate(instructions=system, prompt=prompt)
+                self._cache_store(system, key, vec, result)
+                return result
             except Exception as exc:
-                if require_provider:
+                if _require_provider():
                     # Surface failure if real provider is required
                     raise
                 logging.warning("Provider API call failed, falling back to mock: %s", exc)
-        elif require_provider:
-            raise RuntimeError("REQUIRE_PROVIDER is true but no provider configuration was found")
+        return self._mock_response(prompt, instructions)
+
+    async def _acall_grok_api(
+        self, prompt: str, instructions: str, on_delta: Optional[Callable[[str], None]] = None
+    ) -> Tuple[str, List[str], float]:
+        """Async counterpart of _call_grok_api with the same fallback rules."""
+        if self._provider_requested():
+            system = _system_prompt(instructions)
+            key, vec, cached = await self._acache_lookup(system, prompt)
+            if cached is not None:
+                return cached
+            try:
+                async def _fetch(emit: Optional[Callable[[str], None]]) -> Tuple[str, List[str], float]:
+                    client = _shared_llm_client()
+                    if emit is None:
+                        result = await client.agenerate(instructions=system, prompt=prompt)
+                    else:
+                        result = await client.agenerate_streamed(instructions=system, prompt=prompt, on_delta=emit)
+                    await self._acache_store(system, key, vec, result)
+                    return result
+
+                return await _coalesced(key, _fetch, on_delta)
+            except Exception as exc:
+                if _require_provider():
+                    raise
+                logging.warning("Provider API call failed, falling back to mock: %s", exc)
+        return self._mock_response(prompt, instructions)
+
+    @staticmethod
+    def _cache_lookup(instructions: str, prompt: str) -> Tuple[str, Any, Optional[Tuple[str, List[str], float]]]:
+        """Check the exact cache, then the semantic cache when enabled."""
+        key = cache_key(instructions, prompt)
+        cache = get_cache()
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            return key, None, cached
+        return (key, *_semantic_lookup(instructions, prompt))
 
-        # Fallback: deterministic offline-friendly mock.
+    @staticmethod
+    async def _acache_lookup(instructions: str, prompt: str) -> Tuple[str, Any, Optional[Tuple[str, List[str], float]]]:
+        """_cache_lookup with the embedding and search in a worker thread, off the event loop."""
+        key = cache_key(instructions, prompt)
+        cache = get_cache()
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None or not _semantic_enabled():
+            return key, None, cached
+        return (key, *await asyncio.to_thread(_semantic_lookup, instructions, prompt))
+
+    @staticmethod
+    def _cache_store(instructions: str, key: str, vec: Any, result: Tuple[str, List[str], float]) -> None:
+        cache = get_cache()
+        if cache is not None:
+            cache.set(key, result)
+        if vec is not None:
+            _semantic_store(instructions, vec, result)
+
+    @staticmethod
+    async def _acache_store(instructions: str, key: str, vec: Any, result: Tuple[str, List[str], float]) -> None:
+        cache = get_cache()
+        if cache is not None:
+            cache.set(key, result)
+        if vec is not None:
+            await asyncio.to_thread(_semantic_store, instructions, vec, result)
+
+    def _mock_response(self, prompt: str, instructions: str) -> Tuple[str, List[str], float]:
+        """Deterministic offline-friendly mock derived from a hash of the input."""
         # In a real implementation, you'd use self.config.api_key and self.config.model_name
         # to call the Grok client. For now we generate a simple, reproducible mock.
-        seed_src = f"{instructions}\n{prompt}".encode("utf-8")
-        h = hashlib.sha256(seed_src).hexdigest()
+        if instructions is self.config.instructions or instructions == self.config.instructions:
+            instructions_bytes, first_line = self._instructions_bytes, self._instructions_first_line
+        else:
+            instructions_bytes, first_line = instructions.encode("utf-8"), instructions.splitlines()[0].strip()
+        h = _mock_digest(instructions_bytes, prompt)
         # Map a portion of the hash to a confidence in [0.55, 0.95]
         conf_raw = int(h[:8], 16) / 0xFFFFFFFF
         confidence = round(0.55 + 0.4 * conf_raw, 3)
 
         content = (
-            f"[{self.config.role_name.upper()}] {instructions.splitlines()[0].strip()}\n"
+            f"[{self.config.role_name.upper()}] {first_line}\n"
             f"Prompt: {prompt}\n"
             f"Response: Based on the provided context, here are the key points and next steps."
         )
@@ -113,6 +225,152 @@ class BaseAgent(ABC):
         return content, citations, confidence
 
 
+class _Flight:
+    """A shared provider call: its result, and the text it has streamed so far."""
+
+    __slots__ = ("future", "parts", "listeners")
+
+    def __init__(self, future: "asyncio.Future[Tuple[str, List[str], float]]") -> None:
+        self.future = future
+        self.parts: List[str] = []
+        self.listeners: List[Callable[[str], None]] = []
+
+    def emit(self, piece: str) -> None:
+        self.parts.append(piece)
+        for listener in list(self.listeners):
+            listener(piece)
+
+
+# In-flight provider calls keyed by (event loop id, cache key), so concurrent
+# identical prompts share one request instead of each hitting the provider.
+_INFLIGHT: Dict[Tuple[int, str], _Flight] = {}
+
+
+async def _coalesced(
+    key: str,
+    fetch: Callable[[Optional[Callable[[str], None]]], Awaitable[Tuple[str, List[str], float]]],
+    on_delta: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, List[str], float]:
+    """Run fetch() once per key at a time; concurrent callers await the same result.
+
+    fetch is given the callback to stream text through, or None for a plain
+    call. The leading caller streams when it has on_delta, and every
+    streaming caller then receives the deltas, a late joiner first getting
+    the text streamed so far. A streaming caller that joins a plain call
+    gets the whole text at once when it completes.
+    """
+    loop = asyncio.get_running_loop()
+    flight_key = (id(loop), key)
+    pending = _INFLIGHT.get(flight_key)
+    if pending is not None:
+        if on_delta is not None:
+            for piece in pending.parts:
+                on_delta(piece)
+            pending.listeners.append(on_delta)
+        try:
+            result = await asyncio.shield(pending.future)
+        except asyncio.CancelledError:
+            if not pending.future.cancelled():
+                raise  # this caller was cancelled, not the shared call
+            # The leading caller was cancelled; make the call ourselves below.
+        else:
+            if on_delta is not None and not pending.parts and result[0]:
+                on_delta(result[0])
+            return result
+        finally:
+            if on_delta is not None and on_delta in pending.listeners:
+                pending.listeners.remove(on_delta)
+    flight = _Flight(loop.create_future())
+    if on_delta is not None:
+        flight.listeners.append(on_delta)
+    _INFLIGHT[flight_key] = flight
+    try:
+        result = await fetch(flight.emit if on_delta is not None else None)
+    except asyncio.CancelledError:
+        flight.future.cancel()
+        raise
+    except BaseException as exc:
+        flight.future.set_exception(exc)
+        flight.future.exception()  # mark retrieved; followers re-raise it themselves
+        raise
+    else:
+        flight.future.set_result(result)
+        return result
+    finally:
+        if _INFLIGHT.get(flight_key) is flight:
+            del _INFLIGHT[flight_key]
+
+
+_LLM_CLIENT: Optional[Tuple[Any, Any]] = None  # (ProviderEnv snapshot, LLMClient)
+
+
+def _shared_llm_client():
+    """One LLMClient per provider configuration, reused by every agent."""
+    global _LLM_CLIENT
+    env = provider_env()
+    if _LLM_CLIENT is None or _LLM_CLIENT[0] is not env:
+        from integrations.grok_client import LLMClient  # local import to avoid hard dep when mocking
+
+        _LLM_CLIENT = (env, LLMClient())
+    return _LLM_CLIENT[1]
+
+
+def _semantic_enabled() -> bool:
+    return os.getenv("SEMANTIC_CACHE", "false").lower() == "true"
+
+
+def _semantic_lookup(instructions: str, prompt: str) -> Tuple[Any, Optional[Tuple[str, List[str], float]]]:
+    """(embedding, cached result) from agents.semantic_cache, or (None, None) when it is off."""
+    if not _semantic_enabled():
+        return None, None
+    from agents.semantic_cache import get_semantic_cache  # local import, it loads numpy
+
+    semantic = get_semantic_cache()
+    if semantic is None:
+        return None, None
+    return semantic.lookup(instructions, prompt)
+
+
+def _semantic_store(instructions: str, vec: Any, result: Tuple[str, List[str], float]) -> None:
+    from agents.semantic_cache import get_semantic_cache
+
+    semantic = get_semantic_cache()
+    if semantic is not None:
+        semantic.store(instructions, vec, result)
+
+
+def _mock_digest(instructions: bytes, prompt: str) -> str:
+    """Hex digest of instructions + "\\n" + prompt, fed in parts to skip the joined copy."""
+    hasher = blake3() if blake3 is not None else hashlib.sha256()
+    hasher.update(instructions)
+    hasher.update(b"\n")
+    hasher.update(prompt.encode("utf-8"))
+    if blake3 is not None:
+        return hasher.hexdigest(length=16)
+    return hasher.hexdigest()
+
+
+# Role-agnostic preamble placed ahead of every role's instructions when
+# LLM_SHARE_PREFIX is on, so providers with prefix caching can reuse the prefill.
+SHARED_SYSTEM_PREFIX = (
+    "You are one agent in a multi-agent research pipeline (Reader, Critic, Synthesizer, "
+    "Verifier, FollowUp). Work only from the material you are given, cite sources when "
+    "they are available, and keep answers concise and well structured.\n\n"
+    "Your role:\n"
+)
+
+
+def _system_prompt(instructions: str) -> str:
+    """System message sent to the provider for the given role instructions."""
+    if provider_env().share_prefix:
+        return SHARED_SYSTEM_PREFIX + instructions
+    return instructions
+
+
+def _require_provider() -> bool:
+    return provider_env().require_provider
+
+
 # Convenience helper to build default agent config from environment
 
 def default_agent_config(role_name: str, instructions: str) -> AgentConfig:
@@ -4,31 +4,13 @@ from __future__ import annotations
 from agents.base_agent import BaseAgent, default_agent_config
 
 
-class FollowUpAgent(BaseAgent):
-    """Proposes follow-up research questions based on previous findings.
-
-    Role: Identifies gaps, proposes deeper questions, suggests new research directions.
-    """
-
-    def __init__(self) -> None:
-        super().__init__(
-            default_agent_config(
-                role_name="followup",
-                instructions=(
-                    "Identify knowledge gaps, propose follow-up research questions, suggest methodologies, "
-                    "and highlight connections among findings. Be specific and actionable."
-                ),
-            )
-        )
-
-    def role_prompt(self) -> str:  # noqa: D401
-        return self.config.instructions
-
-    def _build_prompt(self, input_text: str) -> str:
-        return f"""You are a research strategist analyzing findings to identify knowledge gaps and propose follow-up research questions.
+# Static template pieces; per-call work is a single join with the input.
+_PROMPT_HEAD = """You are a research strategist analyzing findings to identify knowledge gaps and propose follow-up research questions.
 
 PREVIOUS FINDINGS AND DISCUSSION:
-{input_text}
+"""
+
+_PROMPT_TAIL = """
 
 Your task:
 1. **Identify Knowledge Gaps**: What important aspects remain unexplored or unclear?
@@ -58,11 +40,39 @@ Format your response as:
 
 Be specific, actionable, and prioritize questions that would have the most impact on advancing understanding of the topic."""
 
-    def send(self, prompt: str):  # type: ignore[override]
-        # Wrap upstream composite prompt with role instructions for clarity.
-        full = (
-            f"{self.role_prompt()}\n\n"
-            f"=== PRIOR ANALYSIS ===\n{prompt}\n\n"
-            f"=== TASK ===\nProduce gaps, questions, directions, connections in the specified format."
+_WRAP_HEAD = "=== PRIOR ANALYSIS ===\n"
+_WRAP_TAIL = "\n\n=== TASK ===\nProduce gaps, questions, directions, connections in the specified format."
+
+
+class FollowUpAgent(BaseAgent):
+    """Proposes follow-up research questions based on previous findings.
+
+    Role: Identifies gaps, proposes deeper questions, suggests new research directions.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(
+            default_agent_config(
+                role_name="followup",
+                instructions=(
+                    "Identify knowledge gaps, propose follow-up research questions, suggest methodologies, "
+                    "and highlight connections among findings. Be specific and actionable."
+                ),
+            )
         )
-        return super().send(full)
+
+    def role_prompt(self) -> str:  # noqa: D401
+        return self.config.instructions
+
+    def _build_prompt(self, input_text: str) -> str:
+        return "".join((_PROMPT_HEAD, input_text, _PROMPT_TAIL))
+
+    def _wrap_prompt(self, prompt: str) -> str:
+        # Role instructions already travel as the system message; only frame the upstream prompt.
+        return "".join((_WRAP_HEAD, prompt, _WRAP_TAIL))
+
+    def send(self, prompt: str):  # type: ignore[override]
+        return super().send(self._wrap_prompt(prompt))
+
+    async def asend(self, prompt: str, on_delta=None):  # type: ignore[override]
+        return await super().asend(self._wrap_prompt(prompt), on_delta=on_delta)
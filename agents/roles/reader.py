@@ -2,10 +2,17 @@
 from __future__ import annotations
 
 from agents.base_agent import BaseAgent, default_agent_config
-from typing import Optional, TYPE_CHECKING, List, Dict, Any
+from typing import Optional, TYPE_CHECKING, List, Dict, Any, Tuple
+import asyncio
+import functools
 import json
 from pathlib import Path
 
+try:  # optional, faster JSON parsing
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 if TYPE_CHECKING:  # pragma: no cover
     from retrieval.bm25 import BM25Retriever
 
@@ -36,93 +43,125 @@ class ReaderAgent(BaseAgent):
         )
         self._retriever = retriever
         self._bm25_k = max(1, int(bm25_k))
-        self._knowledge_base = self._load_knowledge_base(knowledge_base_path)
+        # Parsed lazily through the module-level cache so readers share one copy
+        self._knowledge_base_path = knowledge_base_path or "data/knowledge_base.json"
 
-    def _load_knowledge_base(self, kb_path: Optional[str]) -> List[Dict[str, Any]]:
-        """Load the extracted knowledge base if it exists."""
-        if kb_path is None:
-            kb_path = "data/knowledge_base.json"
-        
-        kb_file = Path(kb_path)
-        if not kb_file.exists():
-            return []
-        
+    def _kb_entry(self) -> Tuple[List[Dict[str, Any]], str]:
+        """Parsed knowledge base and its prompt rendering, refreshed when the file changes."""
         try:
-            with open(kb_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception:
-            return []
+            mtime = Path(self._knowledge_base_path).stat().st_mtime
+        except OSError:
+            return [], ""
+        return _load_kb_cached(self._knowledge_base_path, mtime)
+
+    @property
+    def _knowledge_base(self) -> List[Dict[str, Any]]:
+        return self._kb_entry()[0]
 
     def role_prompt(self) -> str:  # noqa: D401
         return self.config.instructions
 
     def send(self, prompt: str):  # type: ignore[override]
+        return super().send(self._augment_prompt(prompt))
+
+    async def asend(self, prompt: str, on_delta=None):  # type: ignore[override]
+        # BM25 scoring and the first knowledge-base load would block the event loop
+        return await super().asend(await asyncio.to_thread(self._augment_prompt, prompt), on_delta=on_delta)
+
+    def _augment_prompt(self, prompt: str) -> str:
+        """Append knowledge-base and retrieved context to the prompt when available."""
         context_parts = []
         
         # 1. Add knowledge base if available
-        if self._knowledge_base:
-            kb_context = self._format_knowledge_base()
-            if kb_context:
-                context_parts.append("--- Extracted Knowledge Base ---\n" + kb_context)
+        kb_context = self._format_knowledge_base()
+        if kb_context:
+            context_parts.append("--- Extracted Knowledge Base ---\n" + kb_context)
         
         # 2. Add BM25 retrieval if available
         if self._retriever:
             docs = self._retriever.get_relevant_documents(prompt, k=self._bm25_k)
             if docs:
-                ctx = []
-                for d in docs:
-                    snippet = d.page_content.strip()
-                    if len(snippet) > 400:
-                        snippet = snippet[:400].rsplit(" ", 1)[0] + " ..."
-                    ctx.append(
-                        f"[SOURCE: {d.metadata.get('source','?')} | CHUNK: {d.metadata.get('chunk_id','?')}]\n{snippet}"
-                    )
-                context_parts.append("--- Retrieved Document Chunks ---\n" + "\n\n".join(ctx))
+                context_parts.append("--- Retrieved Document Chunks ---\n" + _assemble_chunks(docs))
         
         # 3. Build augmented prompt
         if context_parts:
-            augmented = (
+            return (
                 prompt
                 + "\n\n" + "\n\n".join(context_parts)
                 + "\n" + "-" * 50 + "\n"
             )
-            return super().send(augmented)
         
-        return super().send(prompt)
+        return prompt
     
     def _format_knowledge_base(self) -> str:
         """Format knowledge base for inclusion in prompt."""
-        if not self._knowledge_base:
-            return ""
+        return self._kb_entry()[1]
+
+
+def _render_knowledge_base(knowledge_base: List[Dict[str, Any]]) -> str:
+    """Format knowledge base for inclusion in prompt."""
+    if not knowledge_base:
+        return ""
+    
+    formatted = []
+    for i, doc_knowledge in enumerate(knowledge_base[:3], 1):  # Limit to first 3 documents
+        parts = [f"Document {i}: {doc_knowledge.get('source', 'Unknown')}"]
+        
+        if doc_knowledge.get('title'):
+            parts.append(f"  Title: {doc_knowledge['title']}")
         
-        formatted = []
-        for i, doc_knowledge in enumerate(self._knowledge_base[:3], 1):  # Limit to first 3 documents
-            parts = [f"Document {i}: {doc_knowledge.get('source', 'Unknown')}"]
-            
-            if doc_knowledge.get('title'):
-                parts.append(f"  Title: {doc_knowledge['title']}")
-            
-            if doc_knowledge.get('summary'):
-                summary = doc_knowledge['summary']
-                if len(summary) > 300:
-                    summary = summary[:300] + "..."
-                parts.append(f"  Summary: {summary}")
-            
-            if doc_knowledge.get('key_concepts'):
-                concepts = doc_knowledge['key_concepts'][:5]
-                parts.append(f"  Key Concepts: {', '.join(concepts)}")
-            
-            if doc_knowledge.get('main_findings'):
-                findings = doc_knowledge['main_findings'][:3]
-                parts.append("  Main Findings:")
-                for finding in findings:
-                    finding_text = finding if len(finding) < 150 else finding[:150] + "..."
-                    parts.append(f"    - {finding_text}")
-            
-            if doc_knowledge.get('methodologies'):
-                methods = doc_knowledge['methodologies'][:3]
-                parts.append(f"  Methodologies: {', '.join(methods)}")
-            
-            formatted.append("\n".join(parts))
+        if doc_knowledge.get('summary'):
+            summary = doc_knowledge['summary']
+            if len(summary) > 300:
+                summary = summary[:300] + "..."
+            parts.append(f"  Summary: {summary}")
         
-        return "\n\n".join(formatted)
+        if doc_knowledge.get('key_concepts'):
+            concepts = doc_knowledge['key_concepts'][:5]
+            parts.append(f"  Key Concepts: {', '.join(concepts)}")
+        
+        if doc_knowledge.get('main_findings'):
+            findings = doc_knowledge['main_findings'][:3]
+            parts.append("  Main Findings:")
+            for finding in findings:
+                finding_text = finding if len(finding) < 150 else finding[:150] + "..."
+                parts.append(f"    - {finding_text}")
+        
+        if doc_knowledge.get('methodologies'):
+            methods = doc_knowledge['methodologies'][:3]
+            parts.append(f"  Methodologies: {', '.join(methods)}")
+        
+        formatted.append("\n".join(parts))
+    
+    return "\n\n".join(formatted)
+
+
+def _format_snippet(text: str, limit: int = 400) -> str:
+    """Trim to `limit` chars on a word boundary; one rfind instead of slice + rsplit."""
+    text = text.strip()
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return (text[:cut] if cut >= 0 else text[:limit]) + " ..."
+
+
+def _assemble_chunks(docs: List[Any], limit: int = 400) -> str:
+    """Render retrieved chunks as tagged snippets joined in a single pass."""
+    return "\n\n".join(
+        f"[SOURCE: {d.metadata.get('source','?')} | CHUNK: {d.metadata.get('chunk_id','?')}]\n"
+        f"{_format_snippet(d.page_content, limit)}"
+        for d in docs
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _load_kb_cached(kb_path: str, mtime: float) -> Tuple[List[Dict[str, Any]], str]:
+    """Parse the knowledge base once per (path, mtime) and pre-render its prompt block."""
+    try:
+        raw = Path(kb_path).read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except Exception:
+        return [], ""
+    if not isinstance(data, list):
+        return [], ""
+    return data, _render_knowledge_base(data)
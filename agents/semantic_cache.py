@@ -0,0 +1,175 @@
+"""
+Embedding-similarity cache for near-duplicate prompts.
+
+Sits behind the exact cache in agents._cache: when a prompt misses there,
+its embedding is compared against earlier prompts sent with the same role
+instructions, provider, model and temperature, and the stored response is reused if the
+cosine similarity clears a threshold.
+
+Embeddings come from sentence-transformers when installed, otherwise from
+a hashed bag-of-words/bigram projection in numpy. Search uses a FAISS
+inner-product index when available, otherwise a numpy dot product.
+
+Environment:
+    SEMANTIC_CACHE:            true|false (default: false)
+    SEMANTIC_CACHE_THRESHOLD:  Minimum cosine similarity for a hit (default: 0.92)
+    SEMANTIC_CACHE_SIZE:       Max entries per role/model namespace (default: 512)
+    SEMANTIC_CACHE_MODEL:      sentence-transformers model (default: all-MiniLM-L6-v2)
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:  # optional, better embeddings
+    from sentence_transformers import SentenceTransformer  # type: ignore
+except Exception:  # pragma: no cover
+    SentenceTransformer = None  # type: ignore
+
+try:  # optional, faster search on large namespaces
+    import faiss  # type: ignore
+except Exception:  # pragma: no cover
+    faiss = None  # type: ignore
+
+from agents._cache import CACHEABLE_MAX_TEMPERATURE, PROMPT_VERSION, Result
+from agents._env import provider_env
+
+_HASH_DIM = 512
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class _Embedder:
+    """Wraps sentence-transformers, falling back to a hashed projection."""
+
+    def __init__(self) -> None:
+        self._model = None
+        if SentenceTransformer is not None:
+            name = os.getenv("SEMANTIC_CACHE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+            try:
+                self._model = SentenceTransformer(name)
+            except Exception as exc:
+                logging.warning("Semantic cache model %s unavailable, using hashed embeddings: %s", name, exc)
+
+    def embed(self, text: str) -> np.ndarray:
+        if self._model is not None:
+            vec = np.asarray(self._model.encode(text, normalize_embeddings=True), dtype=np.float32)
+            return vec
+        return _hashed_embedding(text)
+
+
+def _hashed_embedding(text: str) -> np.ndarray:
+    """Signed feature hashing of unigrams and bigrams, L2-normalized."""
+    vec = np.zeros(_HASH_DIM, dtype=np.float32)
+    tokens = _TOKEN_RE.findall(text.lower())
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for feat in features:
+        h = zlib.crc32(feat.encode("utf-8"))
+        vec[h % _HASH_DIM] += 1.0 if (h >> 31) & 1 else -1.0
+    norm = float(np.linalg.norm(vec))
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+class _Namespace:
+    """Fixed-capacity ring of (embedding, result) pairs for one role/model."""
+
+    def __init__(self, dim: int, capacity: int) -> None:
+        self.capacity = capacity
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.results: List[Optional[Result]] = [None] * capacity
+        self.size = 0
+        self.next = 0
+        self.index = faiss.IndexFlatIP(dim) if faiss is not None else None
+
+    def search(self, vec: np.ndarray) -> Tuple[float, Optional[Result]]:
+        if self.size == 0:
+            return 0.0, None
+        if self.index is not None:
+            scores, ids = self.index.search(vec.reshape(1, -1), 1)
+            idx = int(ids[0][0])
+            if idx < 0:
+                return 0.0, None
+            return float(scores[0][0]), self.results[idx]
+        scores = self.vectors[: self.size] @ vec
+        idx = int(np.argmax(scores))
+        return float(scores[idx]), self.results[idx]
+
+    def add(self, vec: np.ndarray, result: Result) -> None:
+        slot = self.next
+        self.vectors[slot] = vec
+        self.results[slot] = result
+        self.next = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        if self.index is not None:
+            if self.size < self.capacity:
+                self.index.add(vec.reshape(1, -1))
+            else:
+                # Ring wrapped: rebuild so FAISS ids stay aligned with slots.
+                self.index.reset()
+                self.index.add(self.vectors)
+
+
+class SemanticCache:
+    """Nearest-neighbour response cache partitioned by role instructions and model."""
+
+    def __init__(self, threshold: float = 0.92, capacity: int = 512) -> None:
+        self.threshold = threshold
+        self.capacity = max(1, capacity)
+        self._embedder = _Embedder()
+        self._spaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _namespace(instructions: str) -> str:
+        env = provider_env()
+        src = "\0".join((PROMPT_VERSION, env.provider_name, env.model_name, repr(env.temperature), instructions))
+        return hashlib.sha256(src.encode("utf-8")).hexdigest()
+
+    def lookup(self, instructions: str, prompt: str) -> Tuple[np.ndarray, Optional[Result]]:
+        """Return the prompt embedding and a cached result if one is similar enough."""
+        vec = self._embedder.embed(prompt)
+        with self._lock:
+            space = self._spaces.get(self._namespace(instructions))
+            if space is None:
+                return vec, None
+            score, result = space.search(vec)
+        if result is not None and score >= self.threshold:
+            return vec, result
+        return vec, None
+
+    def store(self, instructions: str, vec: np.ndarray, result: Result) -> None:
+        ns = self._namespace(instructions)
+        with self._lock:
+            space = self._spaces.get(ns)
+            if space is None:
+                space = self._spaces[ns] = _Namespace(vec.shape[0], self.capacity)
+            space.add(vec, result)
+
+
+_SEMANTIC: Optional[SemanticCache] = None
+_SEMANTIC_LOCK = threading.Lock()
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Process-wide semantic cache, or None unless SEMANTIC_CACHE=true."""
+    global _SEMANTIC
+    if os.getenv("SEMANTIC_CACHE", "false").lower() != "true":
+        return None
+    if provider_env().temperature > CACHEABLE_MAX_TEMPERATURE:
+        return None
+    if _SEMANTIC is None:
+        with _SEMANTIC_LOCK:
+            if _SEMANTIC is None:
+                _SEMANTIC = SemanticCache(
+                    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+                    capacity=int(os.getenv("SEMANTIC_CACHE_SIZE", "512")),
+                )
+    return _SEMANTIC
@@ -10,13 +10,21 @@ Environment variables:
 - GROK_API_KEY: API key for future Grok integration (unused in mock)
 - MODEL_NAME:   Model name to use (default: grok-beta)
 - PORT:         Server port (default: 8080)
+- GRAPH_MINIFY: Minify graph pages when minify-html is installed (default: true)
+- GRAPH_CACHE_DIR: Materialized pages of completed runs (default: data/graph_cache)
 """
 from __future__ import annotations
 
+import asyncio
+import functools
+import gzip
+import json
+import logging
 import os
-from typing import Annotated
+import threading
+from typing import TYPE_CHECKING, Annotated, Any, AsyncIterator, Dict, NamedTuple, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Path
+from fastapi import FastAPI, HTTPException, Path, Request, WebSocket, WebSocketDisconnect
 
 # Optional: load environment from .env if present
 try:  # pragma: no cover - optional dependency
@@ -25,28 +33,108 @@ try:  # pragma: no cover - optional dependency
     load_dotenv()
 except Exception:
     pass
-from fastapi.responses import HTMLResponse
-from orchestrator.graph import Orchestrator
+from fastapi.responses import FileResponse, HTMLResponse, Response
+from agents._env import provider_env
+# Schemas stay eager: FastAPI resolves request/response annotations at route registration.
 from schemas.models import InsightReport, RunRequest, RunResponse, Trace
+from visualization import static_pages
+
+try:  # optional, faster JSON parsing
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+try:  # optional, smaller graph pages
+    import minify_html  # type: ignore
+except Exception:  # pragma: no cover
+    minify_html = None  # type: ignore
+
+if TYPE_CHECKING:  # pragma: no cover
+    from orchestrator.graph import Orchestrator
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 app = FastAPI(title="Agentic Research Collaborator", version="0.1.0")
 
-_orchestrator = Orchestrator()
+
+@functools.lru_cache(maxsize=1)
+def get_orchestrator() -> "Orchestrator":
+    """Build the shared Orchestrator on first use.
+
+    Importing it pulls in every agent, BM25 indexing and the knowledge base,
+    so deferring it keeps server start-up and /health cheap.
+    """
+    from orchestrator.graph import Orchestrator
+
+    return Orchestrator()
+
+
+_orchestrator_lock = threading.Lock()
+
+
+async def _aget_orchestrator() -> "Orchestrator":
+    """get_orchestrator() from a worker thread; the first call may build the BM25 index.
+
+    The lock keeps concurrent first requests from building it twice.
+    """
+    def build() -> "Orchestrator":
+        with _orchestrator_lock:
+            return get_orchestrator()
+
+    return await asyncio.to_thread(build)
+
+
+def _read_from(path, offset: int) -> bytes:
+    """Bytes appended to `path` after `offset`."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        return f.read()
+
+async def _file_changes(path, poll_s: float = 0.3):
+    """Yield once immediately, then whenever `path` may have changed.
+
+    Uses watchfiles (inotify/FSEvents) when installed so idle streams cost
+    nothing; otherwise falls back to polling every `poll_s` seconds. Also
+    yields on a periodic timeout so callers can enforce their own deadline.
+    """
+    yield None
+    try:
+        from watchfiles import awatch
+    except Exception:  # pragma: no cover - optional dependency
+        awatch = None
+    if awatch is None:
+        while True:
+            await asyncio.sleep(poll_s)
+            yield None
+    stop = asyncio.Event()
+    try:
+        async for _ in awatch(
+            path.parent,
+            stop_event=stop,
+            step=50,
+            rust_timeout=5000,
+            yield_on_timeout=True,
+            watch_filter=lambda _change, changed: changed.endswith(path.name),
+        ):
+            yield None
+    finally:
+        stop.set()
+
+
+@app.on_event("shutdown")
+async def _close_provider_pools() -> None:
+    """Drain the shared provider connection pool bound to the server's loop."""
+    from integrations.grok_client import aclose_shared_clients
+
+    await aclose_shared_clients()
 
 
 @app.get("/")
 def root() -> dict:
     """Landing route to help users discover available endpoints."""
-    import os
-
-    provider = os.getenv("LLM_PROVIDER") or (
-        "gemini" if os.getenv("GEMINI_API_KEY") else (
-            "groq" if os.getenv("GROQ_API_KEY") else (
-                "grok" if os.getenv("GROK_API_KEY") else "mock"
-            )
-        )
-    )
-    model = os.getenv("MODEL_NAME", "")
+    env = provider_env()
+    provider = env.provider_name
+    model = env.model_name
     return {
         "app": "Agentic Research Collaborator",
         "status": "ok",
@@ -75,10 +163,11 @@ def health() -> dict:
 
 
 @app.post("/run", response_model=RunResponse)
-def start_run(req: RunRequest) -> RunResponse:
+async def start_run(req: RunRequest) -> RunResponse:
     """Start an orchestration run for the given topic."""
     try:
-        run_id = _orchestrator.run(
+        orchestrator = await _aget_orchestrator()
+        run_id = await orchestrator.arun(
             topic=req.topic,
             max_turns=req.max_turns,
             consensus_threshold=req.consensus_threshold,
@@ -93,216 +182,280 @@ def start_run(req: RunRequest) -> RunResponse:
 
 
 @app.get("/trace/{run_id}", response_model=Trace)
-def get_trace(run_id: Annotated[str, Path(min_length=3)]) -> Trace:
-    """Retrieve the full trace for a run."""
-    trace = _orchestrator.load_trace(run_id)
-    if not trace:
+async def get_trace(run_id: Annotated[str, Path(min_length=3)]) -> Response:
+    """Retrieve the full trace for a run.
+
+    The persisted JSON was produced from a validated Trace, so it is served
+    as-is instead of being re-parsed and re-serialized through Pydantic.
+    """
+    raw = await asyncio.to_thread((await _aget_orchestrator()).load_trace_raw, run_id)
+    if raw is None:
         raise HTTPException(status_code=404, detail="Run not found")
-    return trace
+    return Response(content=raw, media_type="application/json")
 
 
 @app.get("/insight/{run_id}", response_model=InsightReport)
-def get_insight(run_id: Annotated[str, Path(min_length=3)]) -> InsightReport:
-    """Retrieve the final report for a run."""
-    report = _orchestrator.load_report(run_id)
-    if not report:
+async def get_insight(run_id: Annotated[str, Path(min_length=3)]) -> Response:
+    """Retrieve the final report for a run (served from disk like /trace)."""
+    raw = await asyncio.to_thread((await _aget_orchestrator()).load_report_raw, run_id)
+    if raw is None:
         raise HTTPException(status_code=404, detail="Run not found")
-    return report
+    return Response(content=raw, media_type="application/json")
+
+
+_LATEST_RUN_TTL_S = 1.0
+_latest_run_cache: tuple = (0.0, None)  # (monotonic timestamp, run_id)
+
+
+def _latest_run_id() -> str:
+    """Most recently modified run directory, cached for about a second.
+
+    A single os.scandir pass: is_dir() comes from the directory listing, so
+    only one stat() per entry is needed for the mtime.
+
+    Raises:
+        HTTPException: 404 when there are no runs yet.
+    """
+    import time
+
+    global _latest_run_cache
+    now = time.monotonic()
+    stamp, cached = _latest_run_cache
+    if cached is not None and now - stamp < _LATEST_RUN_TTL_S:
+        return cached
+
+    runs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "runs")
+    best_name, best_mtime = None, -1.0
+    try:
+        with os.scandir(runs_dir) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best_name, best_mtime = entry.name, mtime
+    except FileNotFoundError:
+        pass
+    if best_name is None:
+        raise HTTPException(status_code=404, detail="No runs found")
+
+    _latest_run_cache = (now, best_name)
+    return best_name
+
+
+def _trace_path(run_id: str) -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "runs", run_id, "trace.json")
+
+
+class _GraphPage(NamedTuple):
+    html: str
+    gzipped: bytes  # html compressed once, served to clients that accept gzip
+
+
+def _minify(html: str) -> str:
+    if minify_html is None or os.getenv("GRAPH_MINIFY", "true").lower() != "true":
+        return html
+    try:
+        return minify_html.minify(html, minify_js=True, minify_css=True)
+    except Exception:  # malformed input: serve it as built
+        return html
+
+
+@functools.lru_cache(maxsize=64)
+def _graph_page_cached(kind: str, run_id: str, mtime_ns: int) -> Optional[_GraphPage]:
+    """Render a graph page once per trace version; mtime_ns is part of the key."""
+    # The builders only read plain fields, and the file was written from a validated
+    # Trace, so they stream trace.json directly instead of a Trace round-trip
+    if kind == "animated":
+        from visualization.animated_graph import build_animated_graph_page as build
+    else:
+        from visualization.graph_builder import build_html_page as build
+    trace_path = _trace_path(run_id)
+    try:
+        html = _minify(build(trace_path))
+    except OSError:
+        return None
+    page = _GraphPage(html, gzip.compress(html.encode("utf-8"), compresslevel=6))
+    if static_pages.trace_status(trace_path) == "complete":
+        # Final: later gzip-capable requests are served from the file
+        try:
+            static_pages.materialize(kind, run_id, page.gzipped)
+        except OSError as exc:
+            logging.warning(f"Could not materialize {kind} page of run {run_id}: {exc}")
+    return page
+
+
+def _graph_page(kind: str, run_id: str) -> Optional[_GraphPage]:
+    """The 'flow' or 'animated' view of a run, or None if it has no trace."""
+    try:
+        mtime_ns = os.stat(_trace_path(run_id)).st_mtime_ns
+    except OSError:
+        return None
+    return _graph_page_cached(kind, run_id, mtime_ns)
+
+
+_GZIP_HEADERS = {"Content-Encoding": "gzip", "Vary": "Accept-Encoding"}
+
+
+def _html_response(request: Request, page: _GraphPage) -> Response:
+    """page as HTML, gzip-encoded when the client accepts it."""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(content=page.gzipped, media_type="text/html; charset=utf-8", headers=_GZIP_HEADERS)
+    return HTMLResponse(content=page.html, headers={"Vary": "Accept-Encoding"})
+
+
+async def _graph_response(request: Request, kind: str, run_id: str, not_found: str) -> Response:
+    """The 'flow' or 'animated' page of a run; 404 with not_found if it has no trace."""
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        # A completed run's materialized page is sent from disk as-is
+        path = await asyncio.to_thread(static_pages.fresh_page, kind, run_id, _trace_path(run_id))
+        if path is not None:
+            return FileResponse(path, media_type="text/html; charset=utf-8", headers=_GZIP_HEADERS)
+    page = await asyncio.to_thread(_graph_page, kind, run_id)
+    if page is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    return _html_response(request, page)
 
 
 # Graph endpoints - ORDER MATTERS! Specific routes must come before parameterized routes
 @app.get("/graph/animated", response_class=HTMLResponse)
 def get_latest_animated_graph():
     """Get an ANIMATED graph page for the most recent run."""
-    from pathlib import Path
     from fastapi.responses import RedirectResponse
     
-    # Find the most recent run directory
-    runs_dir = Path(__file__).resolve().parent.parent / "data" / "runs"
-    if not runs_dir.exists():
-        raise HTTPException(status_code=404, detail="No runs found")
-    
-    run_dirs = [d for d in runs_dir.iterdir() if d.is_dir()]
-    if not run_dirs:
-        raise HTTPException(status_code=404, detail="No runs found")
-    
-    latest_run_dir = max(run_dirs, key=lambda d: d.stat().st_mtime)
-    run_id = latest_run_dir.name
+    run_id = _latest_run_id()
     
     # Redirect to the animated graph for this run
     return RedirectResponse(url=f"/graph/animated/{run_id}")
 
 
 @app.get("/graph/animated/{run_id}", response_class=HTMLResponse)
-def get_animated_graph(run_id: Annotated[str, Path(min_length=3)]):
+async def get_animated_graph(request: Request, run_id: Annotated[str, Path(min_length=3)]):
     """Retrieve an ANIMATED visual graph that plays automatically."""
-    from fastapi.responses import HTMLResponse
-    from visualization.animated_graph import build_animated_graph_page
-    
-    trace = _orchestrator.load_trace(run_id)
-    if not trace:
-        raise HTTPException(status_code=404, detail="Run not found")
-    
-    # Convert trace to dict
-    trace_data = trace.model_dump()
-    html_content = build_animated_graph_page(trace_data)
-    return HTMLResponse(content=html_content)
+    return await _graph_response(request, "animated", run_id, "Run not found")
 
 
 @app.get("/graph/live", response_class=HTMLResponse)
 def get_latest_live_graph():
     """Get a live-updating graph page for the most recent run."""
-    from pathlib import Path
     from fastapi.responses import RedirectResponse
     
-    # Find the most recent run directory
-    runs_dir = Path(__file__).resolve().parent.parent / "data" / "runs"
-    if not runs_dir.exists():
-        raise HTTPException(status_code=404, detail="No runs found")
-    
-    run_dirs = [d for d in runs_dir.iterdir() if d.is_dir()]
-    if not run_dirs:
-        raise HTTPException(status_code=404, detail="No runs found")
-    
-    latest_run_dir = max(run_dirs, key=lambda d: d.stat().st_mtime)
-    run_id = latest_run_dir.name
+    run_id = _latest_run_id()
     
     # Redirect to the live graph for this run
     return RedirectResponse(url=f"/graph/live/{run_id}")
 
 
 @app.get("/graph/live/{run_id}", response_class=HTMLResponse)
-def get_live_graph(run_id: Annotated[str, Path(min_length=3)]):
+def get_live_graph(request: Request, run_id: Annotated[str, Path(min_length=3)]):
     """Get a live-updating graph page for an ongoing run."""
-    from visualization.live_graph import build_live_html_page
-    html_content = build_live_html_page()
-    return HTMLResponse(content=html_content)
+    from visualization.live_graph import build_live_html_compressed
+    body, coding = build_live_html_compressed(request.headers.get("accept-encoding", ""))
+    headers = {"Vary": "Accept-Encoding"}
+    if coding is not None:
+        headers["Content-Encoding"] = coding
+    return Response(content=body, media_type="text/html; charset=utf-8", headers=headers)
 
 
 @app.get("/graph", response_class=HTMLResponse)
-def get_latest_graph():
+async def get_latest_graph(request: Request):
     """Retrieve a visual graph of the most recent run."""
-    from fastapi.responses import HTMLResponse
-    from visualization.graph_builder import build_html_page
-    import os
-    from pathlib import Path
+    run_id = await asyncio.to_thread(_latest_run_id)
     
-    # Find the most recent run directory
-    runs_dir = Path(__file__).resolve().parent.parent / "data" / "runs"
-    if not runs_dir.exists():
-        raise HTTPException(status_code=404, detail="No runs found")
-    
-    # Get all run directories sorted by modification time (most recent first)
-    run_dirs = [d for d in runs_dir.iterdir() if d.is_dir()]
-    if not run_dirs:
-        raise HTTPException(status_code=404, detail="No runs found")
-    
-    latest_run_dir = max(run_dirs, key=lambda d: d.stat().st_mtime)
-    run_id = latest_run_dir.name
-    
-    trace = _orchestrator.load_trace(run_id)
-    if not trace:
-        raise HTTPException(status_code=404, detail="Latest run trace not found")
-    
-    # Convert trace to dict
-    trace_data = trace.model_dump()
-    html_content = build_html_page(trace_data)
-    return HTMLResponse(content=html_content)
+    return await _graph_response(request, "flow", run_id, "Latest run trace not found")
 
 
 @app.get("/graph/{run_id}", response_class=HTMLResponse)
-def get_graph(run_id: Annotated[str, Path(min_length=3)]):
+async def get_graph(request: Request, run_id: Annotated[str, Path(min_length=3)]):
     """Retrieve a visual graph of the agent conversation flow."""
-    from fastapi.responses import HTMLResponse
-    from visualization.graph_builder import build_html_page
-    
-    trace = _orchestrator.load_trace(run_id)
-    if not trace:
-        raise HTTPException(status_code=404, detail="Run not found")
-    
-    # Convert trace to dict
-    trace_data = trace.model_dump()
-    html_content = build_html_page(trace_data)
-    return HTMLResponse(content=html_content)
+    return await _graph_response(request, "flow", run_id, "Run not found")
 
 
-@app.get("/graph/live/{run_id}/stream")
-async def stream_graph_updates(run_id: Annotated[str, Path(min_length=3)]):
-    """Stream live updates for the graph visualization using Server-Sent Events."""
-    from fastapi.responses import StreamingResponse
+async def _live_events(run_id: str) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """(update type, data) pairs for a run's live graph, tailing its trace.jsonl."""
     from pathlib import Path
-    import asyncio
-    import json
-    from visualization.live_graph import generate_sse_update
+    from visualization.live_graph import message_update
     
-    async def event_generator():
-        """Generate SSE events by monitoring the trace file."""
-        runs_dir = Path(__file__).resolve().parent.parent / "data" / "runs"
-        trace_file = runs_dir / run_id / "trace.json"
-        
+    run_dir = Path(__file__).resolve().parent.parent / "data" / "runs" / run_id
+    log_file = run_dir / "trace.jsonl"
+    trace_file = run_dir / "trace.json"
+    
+    if not log_file.exists():
+        # Runs recorded before trace.jsonl existed: replay the finished trace once
         if not trace_file.exists():
-            yield generate_sse_update("error", {"message": "Run not found"})
+            yield "error", {"message": "Run not found"}
             return
-        
-        last_message_count = 0
-        max_checks = 600  # 10 minutes max (600 * 1 second)
-        check_count = 0
-        
-        # Send initial event
         try:
-            with open(trace_file, 'r', encoding='utf-8') as f:
-                trace_data = json.load(f)
-                topic = trace_data.get('topic', 'Research in progress...')
-                yield generate_sse_update("init", {"topic": topic})
+            trace_data = _loads(trace_file.read_bytes())
         except Exception as e:
-            yield generate_sse_update("error", {"message": str(e)})
+            yield "error", {"message": str(e)}
             return
-        
-        # Poll for updates
-        while check_count < max_checks:
-            try:
-                if not trace_file.exists():
-                    yield generate_sse_update("error", {"message": "Trace file disappeared"})
-                    return
-                
-                with open(trace_file, 'r', encoding='utf-8') as f:
-                    trace_data = json.load(f)
-                
-                messages = trace_data.get('messages', [])
-                current_message_count = len(messages)
-                
-                # Send new messages
-                if current_message_count > last_message_count:
-                    for i in range(last_message_count, current_message_count):
-                        msg = messages[i]
-                        yield generate_sse_update("message", {
-                            "role": msg.get('role', ''),
-                            "content": msg.get('content', '')[:200],  # First 200 chars for preview
-                            "index": i
-                        })
-                    last_message_count = current_message_count
-                
-                # Check if run is complete
-                final_insight = trace_data.get('final_insight')
-                if final_insight and final_insight.get('status') == 'complete':
-                    yield generate_sse_update("complete", {
+        yield "init", {"topic": trace_data.get('topic', 'Research in progress...')}
+        messages = [m for turn in trace_data.get('turns', []) for m in turn.get('messages', [])]
+        for i, msg in enumerate(messages):
+            yield "message", message_update(msg.get('role', ''), msg.get('content') or '', i)
+        yield "complete", {
+            "message": "Run completed successfully",
+            "total_messages": len(messages)
+        }
+        return
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + 600  # 10 minutes max
+    offset = 0
+    pending = b""
+    index = 0
+    
+    async for _ in _file_changes(log_file):
+        try:
+            # Only the bytes appended since the last wake are read and parsed
+            data = await asyncio.to_thread(_read_from, log_file, offset)
+            offset += len(data)
+            *lines, pending = (pending + data).split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                event = _loads(line)
+                kind = event.get("event")
+                if kind == "init":
+                    yield "init", {"topic": event.get('topic') or 'Research in progress...'}
+                elif kind == "message":
+                    yield "message", message_update(event.get('role', ''), event.get('content') or '', index)
+                    index += 1
+                elif kind == "delta":
+                    yield "delta", {
+                        "role": event.get('role', ''),
+                        "text": event.get('text') or '',
+                    }
+                elif kind == "complete":
+                    yield "complete", {
                         "message": "Run completed successfully",
-                        "total_messages": current_message_count
-                    })
+                        "total_messages": index
+                    }
                     return
-                
-                await asyncio.sleep(0.3)  # Check every 300ms for faster updates
-                check_count += 1
-                
-            except json.JSONDecodeError:
-                # File might be being written, wait and try again
-                await asyncio.sleep(0.5)
-            except Exception as e:
-                yield generate_sse_update("error", {"message": str(e)})
-                return
+                elif kind == "error":
+                    yield "error", {"message": event.get('message', 'Run failed')}
+                    return
+        except Exception as e:
+            yield "error", {"message": str(e)}
+            return
         
-        # Timeout
-        yield generate_sse_update("complete", {"message": "Monitoring timeout"})
+        if loop.time() >= deadline:
+            break
+    
+    # Timeout
+    yield "complete", {"message": "Monitoring timeout"}
+
+
+@app.get("/graph/live/{run_id}/stream")
+async def stream_graph_updates(run_id: Annotated[str, Path(min_length=3)]):
+    """Stream live updates for the graph visualization using Server-Sent Events."""
+    from fastapi.responses import StreamingResponse
+    from visualization.live_graph import generate_sse_update
+    
+    async def event_generator():
+        async for update_type, data in _live_events(run_id):
+            yield generate_sse_update(update_type, data)
     
     return StreamingResponse(
         event_generator(),
@@ -315,6 +468,20 @@ async def stream_graph_updates(run_id: Annotated[str, Path(min_length=3)]):
     )
 
 
+@app.websocket("/graph/live/{run_id}/ws")
+async def stream_graph_updates_ws(websocket: WebSocket, run_id: Annotated[str, Path(min_length=3)]):
+    """The live updates of /graph/live/{run_id}/stream as binary WebSocket frames."""
+    from visualization.live_graph import encode_live_frame
+    
+    await websocket.accept()
+    try:
+        async for update_type, data in _live_events(run_id):
+            await websocket.send_bytes(encode_live_frame(update_type, data))
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
 @app.get("/debug/config")
 def debug_config() -> dict:
     """Non-sensitive configuration summary to help diagnose setup.
@@ -324,19 +491,14 @@ def debug_config() -> dict:
     """
     import os as _os
 
-    provider = _os.getenv("LLM_PROVIDER") or (
-        "gemini" if _os.getenv("GEMINI_API_KEY") else (
-            "groq" if _os.getenv("GROQ_API_KEY") else (
-                "grok" if _os.getenv("GROK_API_KEY") else "mock"
-            )
-        )
-    )
-    model = _os.getenv("MODEL_NAME", "")
+    env = provider_env()
+    provider = env.provider_name
+    model = env.model_name
 
     # Inspect reader retriever
     retriever_info = {"enabled": False, "files_dir": _os.getenv("BM25_FILES_DIR", "files"), "chunks": 0}
     try:
-        reader = getattr(_orchestrator, "reader", None)
+        reader = getattr(get_orchestrator(), "reader", None)
         r = getattr(reader, "_retriever", None)
         if r is not None and hasattr(r, "chunks"):
             retriever_info["enabled"] = True
@@ -348,7 +510,7 @@ def debug_config() -> dict:
         "provider": provider,
         "model": model,
         "bm25": retriever_info,
-        "require_provider": (_os.getenv("REQUIRE_PROVIDER", "false").lower() == "true"),
+        "require_provider": env.require_provider,
     }
 
 
@@ -0,0 +1,84 @@
+"""Drive several topics through the FastAPI /run endpoint concurrently.
+
+Usage:
+  python examples/batch_run.py "topic one" "topic two" ...
+  python examples/batch_run.py --file topics.txt      # one topic per line
+
+Requires server running on http://localhost:8080 (API_BASE overrides).
+At most BATCH_CONCURRENCY runs (default: 8) are in flight at once; results
+are printed as each run finishes, not in submission order.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+API_BASE = os.getenv("API_BASE", "http://localhost:8080")
+
+DEFAULT_TOPICS = [
+    "Summarize recent advances in education with LLMs",
+    "What are effective evaluation methods for LLM-based code assistants?",
+    "How do retrieval-augmented models reduce hallucinations?",
+]
+MAX_TURNS = 3
+CONSENSUS_THRESHOLD = 0.75
+# Each /run call blocks until the orchestration completes
+RUN_TIMEOUT_S = 600
+
+
+def read_topics(argv: List[str]) -> List[str]:
+    if len(argv) >= 2 and argv[0] == "--file":
+        with open(argv[1], encoding="utf-8") as fh:
+            return [line.strip() for line in fh if line.strip()]
+    return [t for t in argv if t.strip()] or DEFAULT_TOPICS
+
+
+async def run_one(
+    client: httpx.AsyncClient, sem: asyncio.Semaphore, topic: str
+) -> Tuple[str, Dict[str, Any], float]:
+    payload: Dict[str, Any] = {
+        "topic": topic,
+        "max_turns": MAX_TURNS,
+        "consensus_threshold": CONSENSUS_THRESHOLD,
+    }
+    async with sem:
+        started = time.perf_counter()
+        resp = await client.post(f"{API_BASE}/run", json=payload)
+        resp.raise_for_status()
+        return topic, resp.json(), time.perf_counter() - started
+
+
+async def amain(topics: List[str]) -> None:
+    concurrency = max(1, int(os.getenv("BATCH_CONCURRENCY", "8")))
+    sem = asyncio.Semaphore(concurrency)
+    print(f"Submitting {len(topics)} topics, {concurrency} at a time\n")
+
+    started = time.perf_counter()
+    failures = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(timeout=RUN_TIMEOUT_S, limits=limits) as client:
+        tasks = [asyncio.create_task(run_one(client, sem, topic)) for topic in topics]
+        for fut in asyncio.as_completed(tasks):
+            try:
+                topic, body, elapsed = await fut
+            except httpx.HTTPError as exc:
+                failures += 1
+                print(f"FAILED: {exc}")
+                continue
+            print(f"[{elapsed:6.1f}s] run_id={body.get('run_id')}  {topic}")
+
+    total = time.perf_counter() - started
+    print(f"\n{len(topics) - failures}/{len(topics)} runs completed in {total:.1f}s")
+
+
+def main() -> None:
+    asyncio.run(amain(read_topics(sys.argv[1:])))
+
+
+if __name__ == "__main__":
+    main()
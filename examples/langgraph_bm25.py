@@ -2,16 +2,30 @@
 LangGraph + BM25 example using Groq (ChatGroq) LLM.
 
 - Loads PDFs from ./files (or BM25_FILES_DIR)
-- Builds BM25 index
-- Runs a 3-node LangGraph pipeline: researcher -> reviewer -> synthesizer
+- Builds BM25 index, saved under data/bm25_cache (or BM25_CACHE_DIR) and
+  memory-mapped on later runs while the PDFs' paths, sizes and mtimes are unchanged
+- Runs a LangGraph pipeline: retrieve -> researcher -> (reviewer || checker) -> synthesizer
+  (async nodes awaiting ChatGroq.ainvoke, driven by app.ainvoke); the reviewer
+  and the source checker fan out from the summary and run concurrently
+- Streams the researcher's summary and the synthesizer's report to the console
+  through a bounded asyncio.Queue as tokens decode; other sections print when
+  their node finishes
+- SINGLE_SHOT=1 replaces the four LLM nodes with one JSON-mode call returning
+  summary, critique, source check and insight together (one round trip)
+- Builds the index and the LLM client in the background while the first topic is
+  typed; the REPL uses prompt_toolkit's async prompt when installed
 - Reads GROQ_API_KEY and MODEL_NAME from environment (defaults model if unset)
 
 Ensure project root is on sys.path when executing from examples/.
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import json
 import os
-from typing import List, Dict, Any, Optional, TypedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, TypedDict
 
 from pathlib import Path
 import sys
@@ -23,37 +37,61 @@ if str(PROJECT_ROOT) not in sys.path:
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph
 
-from retrieval.bm25 import BM25Retriever, load_and_chunk_pdfs
+try:  # optional, async line editing with history
+    from prompt_toolkit import PromptSession  # type: ignore
+    from prompt_toolkit.patch_stdout import patch_stdout  # type: ignore
+except Exception:  # pragma: no cover
+    PromptSession = None  # type: ignore
+    patch_stdout = None  # type: ignore
+
+from retrieval.bm25 import BM25Retriever, load_or_build_retriever
 
 
 class ResearchState(TypedDict):
     topic: str
+    context: Optional[str]
     summary: Optional[str]
+    source_check: Optional[str]
     critique: Optional[str]
     insight: Optional[str]
     sources: Optional[List[str]]
 
 
 def build_retriever() -> Optional[BM25Retriever]:
-    files_dir = os.getenv("BM25_FILES_DIR", "files")
-    chunks = load_and_chunk_pdfs(files_dir)
-    if not chunks:
-        return None
-    return BM25Retriever(chunks)
+    return load_or_build_retriever(os.getenv("BM25_FILES_DIR", "files"))
+
+
+@functools.lru_cache(maxsize=4)
+def _llm_for(model: str) -> ChatGroq:
+    return ChatGroq(model=model, temperature=0)
+
 
+def get_llm() -> ChatGroq:
+    """ChatGroq for the current MODEL_NAME, shared by all nodes so its HTTP connection pool is reused."""
+    return _llm_for(os.getenv("MODEL_NAME", "llama-3.3-70b-versatile"))
 
-def researcher_agent(state: ResearchState, retriever: Optional[BM25Retriever]):
+
+# Static pieces of the researcher prompt; per-call work is a single join
+_RESEARCH_HEAD = "You are a research assistant. The user asked about: '"
+_RESEARCH_MID = (
+    "'.\n\n"
+    "Read the following retrieved excerpts (lexical retrieval via BM25) and produce a concise summary "
+    "of the main findings or facts relevant to the topic. Be explicit about which sources support which points.\n\n"
+    "EXCERPTS:\n\n"
+)
+_RESEARCH_TAIL = "\n\nReturn a short summary and a short list of (source -> supporting sentence)."
+
+
+def retrieve(state: ResearchState, retriever: Optional[BM25Retriever]):
+    """BM25 lookup and excerpt formatting; no LLM call."""
     topic = (state.get("topic") or "").strip()
-    if not topic:
-        return {"summary": "No topic provided."}
-    if not retriever:
-        return {"summary": "No documents indexed for retrieval."}
+    if not topic or not retriever:
+        return {"context": None, "sources": []}
     docs = retriever.get_relevant_documents(topic, k=4)
-    if not docs:
-        return {"summary": "No relevant documents found."}
 
     context_pieces = []
-    sources: List[str] = []
+    # Insertion-ordered set of source names
+    sources: Dict[str, None] = {}
     for d in docs:
         snippet = d.page_content.strip()
         if len(snippet) > 800:
@@ -61,23 +99,97 @@ def researcher_agent(state: ResearchState, retriever: Optional[BM25Retriever]):
         source = d.metadata.get("source", "unknown")
         chunk_id = d.metadata.get("chunk_id", "")
         context_pieces.append(f"[SOURCE: {source} | CHUNK: {chunk_id}]\n{snippet}")
-        sources.append(source)
+        sources.setdefault(source, None)
+
+    context = "\n\n---\n\n".join(context_pieces) or None
+    return {"context": context, "sources": list(sources)}
+
+
+SECTION_TITLES = {
+    "summary": "📘 Researcher Summary:",
+    "critique": "🔍 Reviewer Critique:",
+    "source_check": "🧾 Source Check:",
+    "insight": "💡 Collective Insight:",
+}
+
+# Nodes that print their own section while they run (see _stream_section)
+SELF_PRINTING = {"retrieve", "researcher", "synthesizer"}
+
+
+async def _llm_tokens(prompt: str) -> AsyncIterator[str]:
+    async for chunk in get_llm().astream(prompt):
+        text = getattr(chunk, "content", None) or ""
+        if text:
+            yield text
+
+
+async def _once(text: str) -> AsyncIterator[str]:
+    yield text
+
+
+async def _stream_section(title: str, tokens: AsyncIterator[str]) -> str:
+    """Print a section as its tokens arrive and return the full text.
+
+    The producer feeds a bounded queue that a printer task drains, so a slow
+    terminal applies backpressure instead of buffering the whole response.
+    """
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=64)
+    pieces: List[str] = []
+
+    async def produce() -> None:
+        try:
+            async for text in tokens:
+                pieces.append(text)
+                await queue.put(text)
+        finally:
+            await queue.put(None)
+
+    async def show() -> None:
+        print(f"{title}\n")
+        while (text := await queue.get()) is not None:
+            print(text, end="", flush=True)
+        print("\n\n" + "=" * 80 + "\n")
+
+    await asyncio.gather(produce(), show())
+    return "".join(pieces)
+
+
+async def researcher_agent(state: ResearchState, retriever: Optional[BM25Retriever]):
+    topic = (state.get("topic") or "").strip()
+    title = SECTION_TITLES["summary"]
+    if not topic:
+        return {"summary": await _stream_section(title, _once("No topic provided."))}
+    if not retriever:
+        return {"summary": await _stream_section(title, _once("No documents indexed for retrieval."))}
+    context = state.get("context")
+    if not context:
+        return {"summary": await _stream_section(title, _once("No relevant documents found."))}
+
+    prompt = "".join((_RESEARCH_HEAD, topic, _RESEARCH_MID, context, _RESEARCH_TAIL))
+    # Summary tokens reach the console while they decode; reviewer and checker need
+    # the whole summary in their prompts, so they still start when this node returns.
+    return {"summary": await _stream_section(title, _llm_tokens(prompt))}
 
-    context = "\n\n---\n\n".join(context_pieces)
+
+async def checker_agent(state: ResearchState):
+    """Checks the summary's source attributions against the retrieved excerpts, alongside the reviewer."""
+    summary = state.get("summary", "") or ""
+    context = state.get("context", "") or ""
+    if not summary or not context:
+        return {"source_check": "No excerpts to check against."}
     prompt = (
-        f"You are a research assistant. The user asked about: '{topic}'.\n\n"
-        f"Read the following retrieved excerpts (lexical retrieval via BM25) and produce a concise summary "
-        f"of the main findings or facts relevant to the topic. Be explicit about which sources support which points.\n\n"
-        f"EXCERPTS:\n\n{context}\n\n"
-        "Return a short summary and a short list of (source -> supporting sentence)."
+        "You are a source checker. For each (source -> supporting sentence) pair in the summary, "
+        "say whether the cited excerpt actually contains that support, and flag any claim attributed "
+        "to the wrong source or to no source.\n\n"
+        f"SUMMARY:\n\n{summary}\n\nEXCERPTS:\n\n{context}\n\n"
+        "Answer in bullet points, one per claim."
     )
-    llm = ChatGroq(model=os.getenv("MODEL_NAME", "llama-3.3-70b-versatile"), temperature=0)
-    resp = llm.invoke(prompt)
-    summary_text = getattr(resp, "content", None) or str(resp)
-    return {"summary": summary_text, "sources": list(dict.fromkeys(sources))}
+    resp = await get_llm().ainvoke(prompt)
+    check_text = getattr(resp, "content", None) or str(resp)
+    return {"source_check": check_text}
 
 
-def reviewer_agent(state: ResearchState):
+async def reviewer_agent(state: ResearchState):
     summary = state.get("summary", "") or ""
     if not summary:
         return {"critique": "No summary to review."}
@@ -89,66 +201,152 @@ def reviewer_agent(state: ResearchState):
         f"SUMMARY:\n\n{summary}\n\n"
         "Give your critique in bullet points."
     )
-    llm = ChatGroq(model=os.getenv("MODEL_NAME", "llama-3.3-70b-versatile"), temperature=0)
-    resp = llm.invoke(prompt)
+    resp = await get_llm().ainvoke(prompt)
     critique_text = getattr(resp, "content", None) or str(resp)
     return {"critique": critique_text}
 
 
-def synthesizer_agent(state: ResearchState):
+async def synthesizer_agent(state: ResearchState):
     summary = state.get("summary", "") or ""
     critique = state.get("critique", "") or ""
+    source_check = state.get("source_check", "") or ""
     sources = state.get("sources", []) or []
     prompt = (
-        "You are a synthesizer. Combine the summary and critique into a 'Collective Insight Report'. "
+        "You are a synthesizer. Combine the summary, critique and source check into a 'Collective Insight Report'. "
         "Include: a 2-3 sentence insight, 2 testable hypotheses or follow-up experiments, and which sources "
         "would be most relevant to test those hypotheses. Keep it concise.\n\n"
-        f"SUMMARY:\n{summary}\n\nCRITIQUE:\n{critique}\n\nSOURCES:\n{', '.join(sources)}"
+        f"SUMMARY:\n{summary}\n\nCRITIQUE:\n{critique}\n\nSOURCE CHECK:\n{source_check}\n\n"
+        f"SOURCES:\n{', '.join(sources)}"
     )
-    llm = ChatGroq(model=os.getenv("MODEL_NAME", "llama-3.3-70b-versatile"), temperature=0)
-    resp = llm.invoke(prompt)
-    insight_text = getattr(resp, "content", None) or str(resp)
-    return {"insight": insight_text}
+    # Last node: stream tokens to the console as they arrive instead of waiting for the full report
+    return {"insight": await _stream_section(SECTION_TITLES["insight"], _llm_tokens(prompt))}
 
 
-def main() -> None:
-    print("📥 Ingesting PDFs and building BM25 index...")
-    retriever = build_retriever()
+async def single_shot_agent(state: ResearchState, retriever: Optional[BM25Retriever]):
+    """Summary, critique, source check and insight from one JSON-mode call."""
+    topic = (state.get("topic") or "").strip()
+    if not topic:
+        return {"summary": "No topic provided."}
+    if not retriever:
+        return {"summary": "No documents indexed for retrieval."}
+    context = state.get("context")
+    if not context:
+        return {"summary": "No relevant documents found."}
+
+    prompt = (
+        f"You are a research team. The user asked about: '{topic}'.\n\n"
+        f"EXCERPTS (lexical retrieval via BM25):\n\n{context}\n\n"
+        "Work through these stages in order and return a JSON object with exactly these string fields:\n"
+        '- "summary": a concise summary of the findings relevant to the topic, with a short list of '
+        "(source -> supporting sentence).\n"
+        '- "critique": bullet points on statements lacking direct support, possible biases or missing '
+        "considerations, and questions to verify the claims.\n"
+        '- "source_check": one bullet per claim saying whether the cited excerpt actually supports it.\n'
+        '- "insight": a \'Collective Insight Report\' with a 2-3 sentence insight, 2 testable hypotheses or '
+        "follow-up experiments, and which sources are most relevant to test them."
+    )
+    resp = await get_llm().ainvoke(prompt, response_format={"type": "json_object"})
+    raw = getattr(resp, "content", None) or str(resp)
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        # Model ignored JSON mode; keep the text rather than losing the answer
+        return {"summary": raw}
+    if not isinstance(data, dict):
+        return {"summary": raw}
+    return {key: str(data.get(key) or "") for key in ("summary", "critique", "source_check", "insight")}
+
+
+async def _build_retriever_in_background() -> Optional[BM25Retriever]:
+    retriever = await asyncio.to_thread(build_retriever)
     if retriever:
         print("✅ BM25 index ready.")
     else:
         print("❌ BM25 retriever not created (no chunks). Add PDFs to 'files/'")
+    return retriever
+
+
+async def _read_topic(session: Any) -> str:
+    prompt = "\nEnter a research topic (or 'exit' to quit): "
+    if session is not None:
+        return await session.prompt_async(prompt)
+    return await asyncio.to_thread(input, prompt)
+
+
+async def amain() -> None:
+    # Index building and LLM client setup overlap with the user typing the first topic
+    print("📥 Ingesting PDFs and building BM25 index in the background...")
+    retriever_task = asyncio.create_task(_build_retriever_in_background())
+    llm_task = asyncio.create_task(asyncio.to_thread(get_llm))
 
     graph = StateGraph(ResearchState)
-    graph.add_node("researcher", lambda s: researcher_agent(s, retriever))
-    graph.add_node("reviewer", reviewer_agent)
-    graph.add_node("synthesizer", synthesizer_agent)
-    graph.add_edge("researcher", "reviewer")
-    graph.add_edge("reviewer", "synthesizer")
-    graph.set_entry_point("researcher")
+    async def retrieve_node(s: ResearchState):
+        return await asyncio.to_thread(retrieve, s, await retriever_task)
+
+    async def researcher_node(s: ResearchState):
+        return await researcher_agent(s, await retriever_task)
+
+    async def single_shot_node(s: ResearchState):
+        return await single_shot_agent(s, await retriever_task)
+
+    single_shot = os.getenv("SINGLE_SHOT", "0").lower() in ("1", "true")
+    graph.add_node("retrieve", retrieve_node)
+    graph.set_entry_point("retrieve")
+    if single_shot:
+        graph.add_node("single_shot", single_shot_node)
+        graph.add_edge("retrieve", "single_shot")
+        pipeline = "single-shot summary + critique + source check + insight"
+    else:
+        graph.add_node("researcher", researcher_node)
+        graph.add_node("reviewer", reviewer_agent)
+        graph.add_node("checker", checker_agent)
+        graph.add_node("synthesizer", synthesizer_agent)
+        graph.add_edge("retrieve", "researcher")
+        # Fan out: reviewer and checker both read the summary and run in the same step
+        graph.add_edge("researcher", "reviewer")
+        graph.add_edge("researcher", "checker")
+        graph.add_edge(["reviewer", "checker"], "synthesizer")
+        pipeline = "researcher -> reviewer + checker -> synthesizer"
     app = graph.compile()
 
     print("🤖 LangGraph (BM25) research lab ready.")
+    session = PromptSession() if PromptSession is not None else None
+    try:
+        # patch_stdout keeps background prints (e.g. "index ready") from garbling the prompt line
+        with patch_stdout() if patch_stdout is not None else contextlib.nullcontext():
+            while True:
+                topic = (await _read_topic(session)).strip()
+                if topic.lower() in ("exit", "quit"):
+                    break
+                await llm_task
+                print(f"\nRunning agents pipeline ({pipeline})...\n")
+                print("\n" + "=" * 80 + "\n")
+                print(f"Topic: {topic}\n")
+                # Print each section as its node finishes; the synthesizer streams its own output
+                sources: List[str] = []
+                async for update in app.astream({"topic": topic}, stream_mode="updates"):
+                    for node, out in update.items():
+                        out = out or {}
+                        if node == "retrieve":
+                            sources = out.get("sources") or []
+                        if node in SELF_PRINTING:
+                            continue
+                        for key, title in SECTION_TITLES.items():
+                            if key in out:
+                                print(f"{title}\n")
+                                print(out[key] or "—")
+                                print("\n" + "=" * 80 + "\n")
+                print("📚 Sources used:", ", ".join(sources))
+                print("\n" + "=" * 80 + "\n")
+    except (KeyboardInterrupt, EOFError):
+        print("\nExiting.")
+    finally:
+        retriever_task.cancel()
+
+
+def main() -> None:
     try:
-        while True:
-            topic = input("\nEnter a research topic (or 'exit' to quit): ").strip()
-            if topic.lower() in ("exit", "quit"):
-                break
-            print("\nRunning agents pipeline (researcher -> reviewer -> synthesizer)...\n")
-            result = app.invoke({"topic": topic})
-            print("\n" + "=" * 80 + "\n")
-            print(f"Topic: {topic}\n")
-            print("📘 Researcher Summary:\n")
-            print(result.get("summary", "—"))
-            print("\n" + "=" * 80 + "\n")
-            print("🔍 Reviewer Critique:\n")
-            print(result.get("critique", "—"))
-            print("\n" + "=" * 80 + "\n")
-            print("💡 Collective Insight:\n")
-            print(result.get("insight", "—"))
-            print("\n" + "=" * 80 + "\n")
-            print("📚 Sources used:", ", ".join(result.get("sources", [])))
-            print("\n" + "=" * 80 + "\n")
+        asyncio.run(amain())
     except KeyboardInterrupt:
         print("\nExiting.")
 
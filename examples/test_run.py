@@ -13,6 +13,11 @@ from typing import Any, Dict
 
 import httpx
 
+try:  # optional, faster JSON for the debug dumps
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 API_BASE = "http://localhost:8080"
 
 TOPIC = "Summarize recent advances in education with LLMs"
@@ -23,8 +28,12 @@ FILES_DIR = "articles"  # folder with PDFs if BM25 enabled
 BM25_K = 3
 
 
-def pretty(obj: Any) -> str:
-    return json.dumps(obj, indent=2, ensure_ascii=False)[:4000]  # truncate for console
+def pretty(obj: Any, limit: int = 4000) -> str:
+    # truncate for console
+    if orjson is not None:
+        # Slice the bytes, then drop any multi-byte character cut in half
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)[: limit * 4].decode("utf-8", "ignore")[:limit]
+    return json.dumps(obj, indent=2, ensure_ascii=False)[:limit]
 
 
 def main() -> None:
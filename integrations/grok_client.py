@@ -16,44 +16,343 @@ Environment variables:
     - GROQ_API_URL: Override base URL for Groq (default: https://api.groq.com/openai/v1)
     - GROK_API_URL: Override base URL for Grok (default: https://api.x.ai/v1)
     - GEMINI_API_URL: Override base URL for Gemini (default: https://generativelanguage.googleapis.com/v1beta/openai)
+    - LLM_TEMPERATURE: Sampling temperature for every provider (default: 0.2)
+
+    - LLM_MAX_CONCURRENCY: Max in-flight async provider requests per process (default: 8)
+    - LLM_POOL_KEEPALIVE: Keep-alive connections held by the shared HTTP pools (default: 32)
+    - LLM_HTTP2: auto|true|false, HTTP/2 for provider calls when 'h2' is installed (default: auto)
+    - LLM_MIN_INTERVAL_S: Minimum spacing between provider calls in this process (default: 0)
+    - LLM_RPM: Requests-per-minute cap; spaces calls at least 60/LLM_RPM seconds apart (default: unset)
+    - LLM_RETRY_MAX: Retries for 429/5xx and transient network errors (default: 4)
+    - LLM_RETRY_BASE_DELAY: First backoff delay in seconds, doubled per retry up to 15s (default: 1.0)
+
+The transport and retry settings are read once, on first use; call
+ClientSettings.refresh() after changing them in-process.
+
+Responses are fetched compressed: httpx advertises gzip/deflate, plus br and zstd
+when 'brotli' / 'zstandard' are installed (requirements pull in httpx[brotli]), and
+decodes transparently. Accept-Encoding is left to httpx rather than set by hand so
+it never offers an encoding it cannot decode.
 
 Note: Gemini uses OpenAI-compatible endpoint but requires API key in URL query parameter.
 """
 from __future__ import annotations
 
+import asyncio
+import atexit
+from dataclasses import dataclass
+import json
 import os
-from typing import List, Tuple
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, ClassVar, Dict, Iterator, List, Optional, Tuple
 import httpx
 import time
 import random
 import logging
 
-# Simple in-process rate limiter state
+try:  # optional, faster JSON for request bodies and responses
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Encode a request payload to the bytes sent on the wire."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+# Simple in-process rate limiter state: monotonic time of the last reserved slot.
+# Reservations are taken under a lock so worker threads and the event loop never
+# hand out the same slot; the waiting itself happens outside the lock.
 _RATE_LAST_TS: float = 0.0
+_RATE_LOCK = threading.Lock()
 
-def _respect_min_interval():
-    """Sleep to enforce a minimum interval between provider calls.
+# Shared sync client (thread-safe), created on first use
+_SYNC_CLIENT: Optional[httpx.Client] = None
+
+# Shared async transport, (re)created lazily for the running event loop
+_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
+_ASYNC_SLOTS: Optional[asyncio.Semaphore] = None
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+_MAX_BACKOFF_S = 15.0
+# Transient transport failures worth retrying; pooled keep-alive connections can be
+# closed by the server between calls, which surfaces as RemoteProtocolError/ReadError.
+_NETWORK_ERRORS = (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadError)
+
+
+def _env_number(name: str, default: float, cast: Callable[[str], float] = float) -> float:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        logging.warning("Ignoring invalid %s=%r, using %s", name, raw, default)
+        return default
+
+
+@dataclass(frozen=True, slots=True)
+class ClientSettings:
+    """Frozen view of the transport and retry environment, parsed once."""
 
-    Controlled by env LLM_MIN_INTERVAL_S (default 0). This helps avoid 429s on
+    min_interval_s: float
+    retry_max: int
+    backoffs: Tuple[float, ...]
+    max_concurrency: int
+    pool_keepalive: int
+    http2_mode: str
+
+    _current: ClassVar[Optional["ClientSettings"]] = None
+
+    @classmethod
+    def from_environ(cls) -> "ClientSettings":
+        retry_max = max(0, int(_env_number("LLM_RETRY_MAX", 4, int)))
+        base_delay = _env_number("LLM_RETRY_BASE_DELAY", 1.0)
+        rpm = _env_number("LLM_RPM", 0.0)
+        return cls(
+            min_interval_s=max(_env_number("LLM_MIN_INTERVAL_S", 0.0), 60.0 / rpm if rpm > 0 else 0.0),
+            retry_max=retry_max,
+            # Capped exponential delays for retries 1..retry_max, e.g. (1, 2, 4, 8, 15)
+            backoffs=tuple(min(base_delay * (2 ** i), _MAX_BACKOFF_S) for i in range(retry_max)),
+            max_concurrency=max(1, int(_env_number("LLM_MAX_CONCURRENCY", 8, int))),
+            pool_keepalive=max(1, int(_env_number("LLM_POOL_KEEPALIVE", 32, int))),
+            http2_mode=os.getenv("LLM_HTTP2", "auto").lower(),
+        )
+
+    @classmethod
+    def get(cls) -> "ClientSettings":
+        if cls._current is None:
+            cls._current = cls.from_environ()
+        return cls._current
+
+    @classmethod
+    def refresh(cls) -> "ClientSettings":
+        cls._current = cls.from_environ()
+        return cls._current
+
+
+def _min_interval_wait() -> float:
+    """Reserve the next provider slot and return how long to wait for it.
+
+    Controlled by env LLM_MIN_INTERVAL_S / LLM_RPM (default off). This helps avoid 429s on
     accounts with strict RPM. Applies across all agents in this process.
     """
     global _RATE_LAST_TS
-    try:
-        min_interval = float(os.getenv("LLM_MIN_INTERVAL_S", "0"))
-    except Exception:
-        min_interval = 0.0
+    min_interval = ClientSettings.get().min_interval_s
     if min_interval <= 0:
-        return
-    now = time.monotonic()
-    if _RATE_LAST_TS > 0:
-        wait = _RATE_LAST_TS + min_interval - now
-        if wait > 0:
-            logging.info(f"Rate limit: waiting {wait:.2f}s before provider call (min_interval={min_interval}s)")
-            time.sleep(wait)
-    else:
+        return 0.0
+    with _RATE_LOCK:
+        now = time.monotonic()
+        first = _RATE_LAST_TS <= 0
+        wait = min_interval if first else max(0.0, _RATE_LAST_TS + min_interval - now)
+        _RATE_LAST_TS = now + wait
+    if first:
         logging.info(f"Rate limit: first call, enforcing {min_interval}s baseline delay")
-        time.sleep(min_interval)
-    _RATE_LAST_TS = time.monotonic()
+    elif wait > 0:
+        logging.info(f"Rate limit: waiting {wait:.2f}s before provider call (min_interval={min_interval}s)")
+    return wait
+
+
+def _respect_min_interval():
+    """Sleep to enforce a minimum interval between provider calls (sync callers only)."""
+    wait = _min_interval_wait()
+    if wait > 0:
+        time.sleep(wait)
+
+
+async def _arespect_min_interval():
+    """Async variant of _respect_min_interval that yields to the event loop; used by agenerate()."""
+    wait = _min_interval_wait()
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+def _pool_limits(max_connections: Optional[int] = None) -> httpx.Limits:
+    max_keepalive = ClientSettings.get().pool_keepalive
+    if max_connections is None:
+        max_connections = max(64, max_keepalive)
+    # Idle connections outlive the gaps between pipeline stages (httpx default: 5s)
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(max_keepalive, max_connections),
+        keepalive_expiry=30.0,
+    )
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 when LLM_HTTP2 allows it (default: auto) and the h2 package is installed."""
+    mode = ClientSettings.get().http2_mode
+    if mode in ("0", "false", "off"):
+        return False
+    try:
+        import h2  # noqa: F401  # type: ignore
+    except Exception:
+        if mode in ("1", "true", "on"):
+            logging.warning("LLM_HTTP2 requested but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def new_async_client(max_connections: Optional[int] = None) -> httpx.AsyncClient:
+    """A pooled AsyncClient configured like the shared one, for injection into LLMClient.
+
+    Size max_connections to the caller's own concurrency limit so the two
+    caps match. Use and close it on a single event loop.
+    """
+    return httpx.AsyncClient(timeout=60, limits=_pool_limits(max_connections), http2=_http2_enabled())
+
+
+def _sync_client() -> httpx.Client:
+    """Process-wide keep-alive client so sync calls reuse TCP/TLS connections."""
+    global _SYNC_CLIENT
+    if _SYNC_CLIENT is None:
+        _SYNC_CLIENT = httpx.Client(timeout=60, limits=_pool_limits(), http2=_http2_enabled())
+    return _SYNC_CLIENT
+
+
+def close_shared_clients() -> None:
+    """Close the shared sync pool (registered with atexit)."""
+    global _SYNC_CLIENT
+    if _SYNC_CLIENT is not None:
+        _SYNC_CLIENT.close()
+        _SYNC_CLIENT = None
+
+
+async def aclose_shared_clients() -> None:
+    """Close the shared async pool; call from the owning loop (e.g. app shutdown)."""
+    global _ASYNC_CLIENT, _ASYNC_SLOTS, _ASYNC_LOOP
+    if _ASYNC_CLIENT is not None:
+        await _ASYNC_CLIENT.aclose()
+    _ASYNC_CLIENT = _ASYNC_SLOTS = _ASYNC_LOOP = None
+
+
+atexit.register(close_shared_clients)
+
+
+def _async_transport() -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+    """Return the shared AsyncClient and concurrency semaphore for this loop.
+
+    Both objects are bound to the event loop that first uses them, so they are
+    rebuilt when called from a different loop (e.g. successive asyncio.run()).
+    """
+    global _ASYNC_CLIENT, _ASYNC_SLOTS, _ASYNC_LOOP
+    loop = asyncio.get_running_loop()
+    if _ASYNC_CLIENT is None or _ASYNC_LOOP is not loop:
+        _ASYNC_CLIENT = new_async_client()
+        _ASYNC_SLOTS = asyncio.Semaphore(ClientSettings.get().max_concurrency)
+        _ASYNC_LOOP = loop
+    return _ASYNC_CLIENT, _ASYNC_SLOTS
+
+
+def _retry_delay(resp: Optional[httpx.Response], attempt: int, backoffs: Tuple[float, ...]) -> float:
+    """Jittered backoff for retry number `attempt`, honoring Retry-After when present."""
+    sleep_s = backoffs[attempt - 1]
+    if resp is not None:
+        retry_after_hdr = resp.headers.get("Retry-After")
+        if retry_after_hdr:
+            try:
+                sleep_s = max(float(retry_after_hdr), 0.0) or sleep_s
+            except Exception:
+                pass
+    sleep_s += random.uniform(0, 0.25 * sleep_s)
+    return min(sleep_s, _MAX_BACKOFF_S)
+
+
+def _post_with_retry(
+    post: Callable[..., httpx.Response],
+    url: str,
+    body: bytes,
+    headers: Dict[str, str],
+    label: str,
+) -> httpx.Response:
+    """POST a pre-encoded JSON body with backoff on retryable statuses and network errors.
+
+    Returns the first response with a non-retryable status for the caller to
+    inspect. Raises HTTPStatusError when retryable statuses exhaust LLM_RETRY_MAX,
+    or re-raises the last network error.
+    """
+    settings = ClientSettings.get()
+    max_retries, backoffs = settings.retry_max, settings.backoffs
+    attempt = 0
+    while True:
+        try:
+            # Rate-limit guard before each provider request
+            _respect_min_interval()
+            resp = post(url, content=body, headers=headers)
+        except _NETWORK_ERRORS as e:
+            if attempt >= max_retries:
+                logging.error("%s: network error after %s retries: %s", label, attempt, e)
+                raise
+            attempt += 1
+            delay = _retry_delay(None, attempt, backoffs)
+            logging.warning("%s: network error, retry %s/%s in %.2fs: %s", label, attempt, max_retries, delay, e)
+            time.sleep(delay)
+            continue
+        if resp.status_code not in _RETRY_STATUSES:
+            return resp
+        # Release the connection first; matters for streamed responses whose body is unread
+        resp.close()
+        if attempt >= max_retries:
+            logging.error("%s returned %s after %s retries, giving up.", label, resp.status_code, attempt)
+            resp.raise_for_status()
+        attempt += 1
+        delay = _retry_delay(resp, attempt, backoffs)
+        logging.warning("%s returned %s, retry %s/%s in %.2fs", label, resp.status_code, attempt, max_retries, delay)
+        time.sleep(delay)
+
+
+async def _apost_with_retry(
+    post: Callable[..., Awaitable[httpx.Response]],
+    slots: asyncio.Semaphore,
+    url: str,
+    body: bytes,
+    headers: Dict[str, str],
+    label: str,
+) -> httpx.Response:
+    """Async mirror of _post_with_retry; only the request itself holds a concurrency slot."""
+    settings = ClientSettings.get()
+    max_retries, backoffs = settings.retry_max, settings.backoffs
+    attempt = 0
+    while True:
+        try:
+            await _arespect_min_interval()
+            async with slots:
+                resp = await post(url, content=body, headers=headers)
+        except _NETWORK_ERRORS as e:
+            if attempt >= max_retries:
+                logging.error("%s: network error after %s retries: %s", label, attempt, e)
+                raise
+            attempt += 1
+            delay = _retry_delay(None, attempt, backoffs)
+            logging.warning("%s: network error, retry %s/%s in %.2fs: %s", label, attempt, max_retries, delay, e)
+            await asyncio.sleep(delay)
+            continue
+        if resp.status_code not in _RETRY_STATUSES:
+            return resp
+        await resp.aclose()
+        if attempt >= max_retries:
+            logging.error("%s returned %s after %s retries, giving up.", label, resp.status_code, attempt)
+            resp.raise_for_status()
+        attempt += 1
+        delay = _retry_delay(resp, attempt, backoffs)
+        logging.warning("%s returned %s, retry %s/%s in %.2fs", label, resp.status_code, attempt, max_retries, delay)
+        await asyncio.sleep(delay)
+
+
+def _sse_event(line: str) -> Optional[Dict[str, Any]]:
+    """Decode one `data: {...}` server-sent-event line; None for keep-alives and [DONE]."""
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == "[DONE]":
+        return None
+    return _loads(data)
 
 
 class LLMClient:
@@ -67,7 +366,14 @@ class LLMClient:
       - Else raise.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        http_client: Optional[httpx.Client] = None,
+        async_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        # Injected clients override the shared module-level pools
+        self._http = http_client
+        self._async_http = async_client
         provider = (os.getenv("LLM_PROVIDER") or "").lower().strip()
         gemini_key = os.getenv("GEMINI_API_KEY")
         groq_key = os.getenv("GROQ_API_KEY")
@@ -87,6 +393,10 @@ class LLMClient:
             )
 
         self.provider = provider
+        try:
+            self.temperature = float(os.getenv("LLM_TEMPERATURE", "0.2"))
+        except ValueError:
+            self.temperature = 0.2
         if provider == "groq":
             if not groq_key:
                 raise RuntimeError("GROQ_API_KEY not set for provider 'groq'")
@@ -108,6 +418,16 @@ class LLMClient:
             self.base_url = os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta/openai")
             self.model = os.getenv("MODEL_NAME", "gemini-2.5-flash")
 
+    def close(self) -> None:
+        """Close an injected sync client; the shared pool is closed at exit."""
+        if self._http is not None:
+            self._http.close()
+
+    async def aclose(self) -> None:
+        """Close an injected async client."""
+        if self._async_http is not None:
+            await self._async_http.aclose()
+
     def generate(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
         # Gemini uses native API, others use OpenAI-compatible
         if self.provider == "gemini":
@@ -115,22 +435,27 @@ class LLMClient:
         else:
             return self._generate_openai_compatible(instructions, prompt)
 
-    def _generate_gemini(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
-        """Generate using Gemini's native API format with x-goog-api-key header.
+    async def agenerate(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
+        """Async variant of generate() sharing one pooled AsyncClient per event loop."""
+        if self.provider == "gemini":
+            return await self._agenerate_gemini(instructions, prompt)
+        else:
+            return await self._agenerate_openai_compatible(instructions, prompt)
 
-        Includes graceful fallback for models that are not available (e.g., "-live").
-        """
+    # -------- Request / response shapes --------
+    def _gemini_request(self, instructions: str, prompt: str) -> Tuple[Dict[str, str], Dict[str, Any], List[str]]:
+        """Build headers, payload and the ordered model fallback list for Gemini."""
         headers = {
             "Content-Type": "application/json",
             "x-goog-api-key": self.api_key,
         }
 
-        # Combine instructions and prompt for Gemini
-        combined_text = f"{instructions}\n\n{prompt}"
+        # Role instructions go in systemInstruction so the prefix stays identical across calls
         payload = {
-            "contents": [{"parts": [{"text": combined_text}]}],
+            "systemInstruction": {"parts": [{"text": instructions}]},
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
             "generationConfig": {
-                "temperature": 0.2,
+                "temperature": self.temperature,
                 "maxOutputTokens": 8192,
             },
         }
@@ -147,104 +472,37 @@ class LLMClient:
             model_candidates.append("gemini-2.5-flash")
         if "gemini-1.5-flash" not in model_candidates:
             model_candidates.append("gemini-1.5-flash")
+        return headers, payload, model_candidates
 
-        max_retries = int(os.getenv("LLM_RETRY_MAX", "4"))
-        base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+    @staticmethod
+    def _gemini_url(model_name: str) -> str:
+        return f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
 
-        last_error = None
-        with httpx.Client(timeout=60) as client:
-            for model_name in model_candidates:
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent"
-                attempt = 0
-                while True:
-                    try:
-                        _respect_min_interval()
-                        resp = client.post(url, json=payload, headers=headers)
-                        # Explicit model-not-found / invalid endpoint handling
-                        if resp.status_code in (400, 404):
-                            # Capture and move to next candidate
-                            last_error = resp.text
-                            logging.warning(
-                                "Gemini model '%s' not available (status %s). Trying fallback.",
-                                model_name,
-                                resp.status_code,
-                            )
-                            break  # break retry loop to try next model
-
-                        if resp.status_code in (429, 500, 502, 503, 504):
-                            if attempt >= max_retries:
-                                logging.error(
-                                    "Gemini returned %s after %s retries for model '%s', giving up.",
-                                    resp.status_code,
-                                    attempt,
-                                    model_name,
-                                )
-                                resp.raise_for_status()
-
-                            retry_after_hdr = resp.headers.get("Retry-After") or resp.headers.get("retry-after")
-                            retry_after_val = 0.0
-                            if retry_after_hdr:
-                                try:
-                                    retry_after_val = float(retry_after_hdr)
-                                except Exception:
-                                    retry_after_val = 0.0
-                            attempt += 1
-                            sleep_s = retry_after_val if retry_after_val > 0 else (base_delay * (2 ** (attempt - 1)))
-                            sleep_s += random.uniform(0, 0.25 * sleep_s)
-                            actual_sleep = min(sleep_s, 15.0)
-                            logging.warning(
-                                "Gemini returned %s, retry %s/%s in %.2fs (model '%s')",
-                                resp.status_code,
-                                attempt,
-                                max_retries,
-                                actual_sleep,
-                                model_name,
-                            )
-                            time.sleep(actual_sleep)
-                            continue
-
-                        resp.raise_for_status()
-                        data = resp.json()
-                        # Parse Gemini response
-                        content = ""
-                        try:
-                            candidates = data.get("candidates", [])
-                            if candidates and "content" in candidates[0]:
-                                parts = candidates[0]["content"].get("parts", [])
-                                if parts and "text" in parts[0]:
-                                    content = parts[0]["text"]
-                        except Exception as e:
-                            logging.warning(f"Failed to parse Gemini response: {e}")
-                            content = str(data)
-
-                        citations: List[str] = []
-                        confidence = 0.75
-                        return content, citations, confidence
-                    except (httpx.TimeoutException, httpx.ConnectError) as e:
-                        attempt += 1
-                        if attempt > max_retries:
-                            logging.error(f"Network error after {attempt} retries: {e}")
-                            last_error = str(e)
-                            break  # give up on this model candidate
-                        sleep_s = base_delay * (2 ** (attempt - 1)) + random.uniform(0, 0.25 * base_delay)
-                        actual_sleep = min(sleep_s, 15.0)
-                        logging.warning(
-                            "Network error, retry %s/%s in %.2fs (model '%s'): %s",
-                            attempt,
-                            max_retries,
-                            actual_sleep,
-                            model_name,
-                            e,
-                        )
-                        time.sleep(actual_sleep)
+    @staticmethod
+    def _gemini_stream_url(model_name: str) -> str:
+        return f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:streamGenerateContent?alt=sse"
 
-        # If we got here, all candidates failed
-        raise RuntimeError(f"Gemini generation failed for all candidates {model_candidates}: {last_error}")
+    @staticmethod
+    def _parse_gemini(data: Dict[str, Any]) -> Tuple[str, List[str], float]:
+        content = ""
+        try:
+            candidates = data.get("candidates", [])
+            if candidates and "content" in candidates[0]:
+                parts = candidates[0]["content"].get("parts", [])
+                if parts and "text" in parts[0]:
+                    content = parts[0]["text"]
+        except Exception as e:
+            logging.warning(f"Failed to parse Gemini response: {e}")
+            content = str(data)
 
-    def _generate_openai_compatible(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
-        """Generate using OpenAI-compatible API format (Groq, Grok, Gemini)."""
+        citations: List[str] = []
+        confidence = 0.75
+        return content, citations, confidence
+
+    def _openai_request(self, instructions: str, prompt: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """Build url, headers and payload for an OpenAI-compatible chat completion."""
         url = f"{self.base_url}/chat/completions"
-        
+
         # Gemini uses x-goog-api-key header, others use Bearer token
         if self.provider == "gemini":
             headers = {
@@ -256,61 +514,19 @@ class LLMClient:
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json",
             }
-        
+
         payload = {
             "model": self.model,
             "messages": [
                 {"role": "system", "content": instructions},
                 {"role": "user", "content": prompt},
             ],
-            "temperature": 0.2,
+            "temperature": self.temperature,
         }
+        return url, headers, payload
 
-        # Basic, provider-friendly retry with exponential backoff for 429/5xx/network
-        max_retries = int(os.getenv("LLM_RETRY_MAX", "4"))
-        base_delay = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
-        with httpx.Client(timeout=60) as client:
-            attempt = 0
-            last_status = None
-            while True:
-                try:
-                    # Rate-limit guard before each provider request
-                    _respect_min_interval()
-                    resp = client.post(url, json=payload, headers=headers)
-                    last_status = resp.status_code
-                    # Retry only for transient statuses
-                    if resp.status_code in (429, 500, 502, 503, 504):
-                        if attempt >= max_retries:
-                            logging.error(f"Provider returned {resp.status_code} after {attempt} retries, giving up.")
-                            resp.raise_for_status()  # will raise HTTPStatusError
-                        # Gather hint from headers
-                        retry_after_hdr = resp.headers.get("Retry-After") or resp.headers.get("retry-after")
-                        retry_after_val = 0.0
-                        if retry_after_hdr:
-                            try:
-                                retry_after_val = float(retry_after_hdr)
-                            except Exception:
-                                retry_after_val = 0.0
-                        attempt += 1
-                        sleep_s = retry_after_val if retry_after_val > 0 else (base_delay * (2 ** (attempt - 1)))
-                        sleep_s += random.uniform(0, 0.25 * sleep_s)
-                        actual_sleep = min(sleep_s, 15.0)
-                        logging.warning(f"Provider returned {resp.status_code}, retry {attempt}/{max_retries} in {actual_sleep:.2f}s")
-                        time.sleep(actual_sleep)
-                        continue
-                    resp.raise_for_status()
-                    data = resp.json()
-                    break
-                except (httpx.TimeoutException, httpx.ConnectError) as e:
-                    attempt += 1
-                    if attempt > max_retries:
-                        logging.error(f"Network error after {attempt} retries: {e}")
-                        raise
-                    sleep_s = base_delay * (2 ** (attempt - 1)) + random.uniform(0, 0.25 * base_delay)
-                    actual_sleep = min(sleep_s, 15.0)
-                    logging.warning(f"Network error, retry {attempt}/{max_retries} in {actual_sleep:.2f}s: {e}")
-                    time.sleep(actual_sleep)
-
+    @staticmethod
+    def _parse_openai(data: Dict[str, Any]) -> Tuple[str, List[str], float]:
         content = (
             data.get("choices", [{}])[0].get("message", {}).get("content")
             or data.get("choices", [{}])[0].get("text")
@@ -322,10 +538,229 @@ class LLMClient:
             or data.get("choices", [{}])[0].get("message", {}).get("citations")
             or []
         )
-        conf = data.get("confidence", 0.75)
+        return content, citations, LLMClient._confidence(data.get("confidence", 0.75))
+
+    @staticmethod
+    def _confidence(conf: Any) -> float:
         try:
             confidence = float(conf)
         except Exception:
             confidence = 0.75
-        confidence = max(0.0, min(1.0, confidence))
-        return content, citations, confidence
+        return max(0.0, min(1.0, confidence))
+
+    # -------- Streaming --------
+    def generate_stream(self, instructions: str, prompt: str) -> Iterator[str]:
+        """Yield response text as the provider streams it (server-sent events).
+
+        Retries and the Gemini model fallback apply until the stream opens; a
+        stream that breaks part-way through raises instead of restarting.
+        """
+        client = self._http or _sync_client()
+
+        def send(url: str, content: bytes, headers: Dict[str, str]) -> httpx.Response:
+            return client.send(client.build_request("POST", url, content=content, headers=headers), stream=True)
+
+        resp = None
+        last_error = None
+        for url, headers, body, label in self._stream_targets(instructions, prompt):
+            try:
+                resp = _post_with_retry(send, url, body, headers, label)
+            except _NETWORK_ERRORS as e:
+                if self.provider != "gemini":
+                    raise
+                last_error = str(e)
+                continue
+            if self.provider == "gemini" and resp.status_code in (400, 404):
+                last_error = resp.read().decode("utf-8", "replace")
+                resp.close()
+                logging.warning("%s not available (status %s). Trying fallback.", label, resp.status_code)
+                resp = None
+                continue
+            break
+        if resp is None:
+            raise RuntimeError(f"Gemini streaming failed for all candidates: {last_error}")
+        try:
+            if resp.is_error:
+                resp.read()
+                resp.raise_for_status()
+            for line in resp.iter_lines():
+                text = self._stream_delta(_sse_event(line))
+                if text:
+                    yield text
+        finally:
+            resp.close()
+
+    async def agenerate_stream(self, instructions: str, prompt: str) -> AsyncIterator[str]:
+        """Async variant of generate_stream() over the pooled AsyncClient."""
+        async for event in self._astream_events(instructions, prompt):
+            text = self._stream_delta(event)
+            if text:
+                yield text
+
+    async def agenerate_streamed(
+        self, instructions: str, prompt: str, on_delta: Callable[[str], None]
+    ) -> Tuple[str, List[str], float]:
+        """agenerate() over a streamed completion, passing each text fragment to on_delta.
+
+        Citations and confidence are read from the stream events the way
+        agenerate() reads them from a whole response.
+        """
+        parts: List[str] = []
+        citations: List[str] = []
+        confidence: Any = 0.75
+        async for event in self._astream_events(instructions, prompt):
+            text = self._stream_delta(event)
+            if text:
+                parts.append(text)
+                on_delta(text)
+            if event and self.provider != "gemini":
+                delta = (event.get("choices") or [{}])[0].get("delta") or {}
+                citations = event.get("citations") or delta.get("citations") or citations
+                confidence = event.get("confidence", confidence)
+        return "".join(parts), citations, self._confidence(confidence)
+
+    async def _astream_events(self, instructions: str, prompt: str) -> AsyncIterator[Dict[str, Any]]:
+        """Decoded server-sent events of a streamed completion."""
+        client, slots = _async_transport()
+        client = self._async_http or client
+
+        async def send(url: str, content: bytes, headers: Dict[str, str]) -> httpx.Response:
+            return await client.send(client.build_request("POST", url, content=content, headers=headers), stream=True)
+
+        resp = None
+        last_error = None
+        for url, headers, body, label in self._stream_targets(instructions, prompt):
+            try:
+                # The slot covers opening the stream; reading the body does not hold it
+                resp = await _apost_with_retry(send, slots, url, body, headers, label)
+            except _NETWORK_ERRORS as e:
+                if self.provider != "gemini":
+                    raise
+                last_error = str(e)
+                continue
+            if self.provider == "gemini" and resp.status_code in (400, 404):
+                last_error = (await resp.aread()).decode("utf-8", "replace")
+                await resp.aclose()
+                logging.warning("%s not available (status %s). Trying fallback.", label, resp.status_code)
+                resp = None
+                continue
+            break
+        if resp is None:
+            raise RuntimeError(f"Gemini streaming failed for all candidates: {last_error}")
+        try:
+            if resp.is_error:
+                await resp.aread()
+                resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                event = _sse_event(line)
+                if event:
+                    yield event
+        finally:
+            await resp.aclose()
+
+    def _stream_targets(
+        self, instructions: str, prompt: str
+    ) -> List[Tuple[str, Dict[str, str], bytes, str]]:
+        """(url, headers, encoded body, log label) to try in order for a streamed completion."""
+        if self.provider == "gemini":
+            headers, payload, model_candidates = self._gemini_request(instructions, prompt)
+            body = _dumps(payload)
+            return [
+                (self._gemini_stream_url(m), headers, body, f"Gemini '{m}'") for m in model_candidates
+            ]
+        url, headers, payload = self._openai_request(instructions, prompt)
+        return [(url, headers, _dumps({**payload, "stream": True}), "Provider")]
+
+    def _stream_delta(self, event: Optional[Dict[str, Any]]) -> str:
+        """Text carried by one decoded event of a Gemini or OpenAI-compatible stream."""
+        if not event:
+            return ""
+        if self.provider == "gemini":
+            candidates = event.get("candidates") or [{}]
+            parts = (candidates[0].get("content") or {}).get("parts") or []
+            return "".join(p.get("text", "") for p in parts)
+        choices = event.get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+    # -------- Gemini --------
+    def _generate_gemini(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
+        """Generate using Gemini's native API format with x-goog-api-key header.
+
+        Includes graceful fallback for models that are not available (e.g., "-live").
+        """
+        headers, payload, model_candidates = self._gemini_request(instructions, prompt)
+        # Encoded once and reused across retries and model fallbacks
+        body = _dumps(payload)
+        client = self._http or _sync_client()
+
+        last_error = None
+        for model_name in model_candidates:
+            try:
+                resp = _post_with_retry(
+                    client.post, self._gemini_url(model_name), body, headers, f"Gemini '{model_name}'"
+                )
+            except _NETWORK_ERRORS as e:
+                last_error = str(e)
+                continue  # give up on this model candidate
+            # Explicit model-not-found / invalid endpoint handling
+            if resp.status_code in (400, 404):
+                last_error = resp.text
+                logging.warning(
+                    "Gemini model '%s' not available (status %s). Trying fallback.",
+                    model_name,
+                    resp.status_code,
+                )
+                continue
+            resp.raise_for_status()
+            return self._parse_gemini(_loads(resp.content))
+
+        # If we got here, all candidates failed
+        raise RuntimeError(f"Gemini generation failed for all candidates {model_candidates}: {last_error}")
+
+    async def _agenerate_gemini(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
+        """Async mirror of _generate_gemini (same fallback and retry policy)."""
+        headers, payload, model_candidates = self._gemini_request(instructions, prompt)
+        body = _dumps(payload)
+        client, slots = _async_transport()
+        client = self._async_http or client
+
+        last_error = None
+        for model_name in model_candidates:
+            try:
+                resp = await _apost_with_retry(
+                    client.post, slots, self._gemini_url(model_name), body, headers, f"Gemini '{model_name}'"
+                )
+            except _NETWORK_ERRORS as e:
+                last_error = str(e)
+                continue
+            if resp.status_code in (400, 404):
+                last_error = resp.text
+                logging.warning(
+                    "Gemini model '%s' not available (status %s). Trying fallback.",
+                    model_name,
+                    resp.status_code,
+                )
+                continue
+            resp.raise_for_status()
+            return self._parse_gemini(_loads(resp.content))
+
+        raise RuntimeError(f"Gemini generation failed for all candidates {model_candidates}: {last_error}")
+
+    # -------- OpenAI-compatible (Groq, Grok) --------
+    def _generate_openai_compatible(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
+        """Generate using OpenAI-compatible API format (Groq, Grok, Gemini)."""
+        url, headers, payload = self._openai_request(instructions, prompt)
+        client = self._http or _sync_client()
+        # Provider-friendly retry with exponential backoff for 429/5xx/network
+        resp = _post_with_retry(client.post, url, _dumps(payload), headers, "Provider")
+        resp.raise_for_status()
+        return self._parse_openai(_loads(resp.content))
+
+    async def _agenerate_openai_compatible(self, instructions: str, prompt: str) -> Tuple[str, List[str], float]:
+        """Async mirror of _generate_openai_compatible."""
+        url, headers, payload = self._openai_request(instructions, prompt)
+        client, slots = _async_transport()
+        client = self._async_http or client
+        resp = await _apost_with_retry(client.post, slots, url, _dumps(payload), headers, "Provider")
+        resp.raise_for_status()
+        return self._parse_openai(_loads(resp.content))
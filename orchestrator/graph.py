@@ -6,37 +6,165 @@ Reader -> Critic -> Synthesizer -> Verifier
 
 Stops when either the maximum number of turns is reached or the
 Verifier's confidence exceeds a consensus threshold.
+
+The pipeline is driven by the coroutine Orchestrator.arun so provider
+round-trips never block the event loop; Orchestrator.run is a thin
+synchronous wrapper for scripts.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import os
+import re
 import uuid
-from datetime import datetime
-import time
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic_core import to_json
 
 from agents.roles.reader import ReaderAgent
 from agents.roles.critic import CriticAgent
 from agents.roles.synthesizer import SynthesizerAgent
 from agents.roles.verifier import VerifierAgent
 from agents.roles.followup import FollowUpAgent
+from orchestrator.summary import budget_summary
 from schemas.models import InsightReport, Message, Trace, Turn
 
 # Optional BM25 integration
 import os
 from typing import TYPE_CHECKING
 try:  # pragma: no cover
-    from retrieval.bm25 import BM25Retriever, load_and_chunk_pdfs
+    from retrieval.bm25 import corpus_digest, load_or_build_retriever
+except Exception:  # pragma: no cover
+    corpus_digest = None  # type: ignore
+    load_or_build_retriever = None  # type: ignore
+
+try:  # optional, faster JSON parsing
+    import orjson  # type: ignore
 except Exception:  # pragma: no cover
-    BM25Retriever = None  # type: ignore
-    load_and_chunk_pdfs = None  # type: ignore
+    orjson = None  # type: ignore
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+# Static task preambles. They lead each prompt, ahead of any run-specific text, so the
+# bytes after each role's system message are identical across rounds, turns and runs
+# and providers with automatic prefix caching (Groq, xAI, Gemini) can reuse them.
+_CRITIC_TASK = (
+    "Critically evaluate the Reader's findings. Identify gaps, unsupported claims, "
+    "and potential biases. Reference specific points from the Reader's analysis.\n\n"
+    "The Reader has provided the following analysis (after debate handoff):\n\n"
+)
+_SYNTH_TASK = (
+    "Synthesize the Reader's findings with the Critic's challenges. "
+    "Generate hypotheses that address the Critic's concerns while building on the Reader's insights. "
+    "Reference specific points from both agents.\n\n"
+)
+_VERIFY_TASK = (
+    "Verify the Synthesizer's hypotheses against the original evidence. "
+    "Consider the Reader's findings and the Critic's concerns. "
+    "Reference specific hypotheses and explain your confidence assessment.\n\n"
+    "--- Synthesizer's Hypotheses (after debate handoff) ---\n"
+)
+_FOLLOWUP_TASK = (
+    "Based on the complete multi-agent analysis below, propose follow-up research questions "
+    "and identify knowledge gaps. Reference specific findings from each agent.\n\n"
+)
+_DEBATE_ASK = (
+    "DEBATE: before proceeding, read the output below and ask up to 3 clarifying questions "
+    "you need to form a coherent understanding. Return ONLY a numbered list of questions, "
+    "or ONLY [DONE] if the output is already clear enough to proceed.\n\n"
+)
+_DEBATE_ANSWER = (
+    "DEBATE: answer the questions below clearly and concisely, filling any missing details "
+    "from your analysis. If a question is outside your scope, say so. Provide numbered answers.\n\n"
+)
+_DEBATE_SUMMARY = (
+    "DEBATE: produce a concise coherent summary of your understanding incorporating the answers below. "
+    "End the message with either [DONE] if you have enough to proceed, "
+    "or [MORE] if you still need clarification.\n\n"
+)
+
+# Token budgets for the topic-ranked extracts (orchestrator.summary) that replace
+# fixed character slices: per upstream section in the FollowUp prompt, and the report summary
+_FOLLOWUP_SECTION_TOKENS = 100
+_REPORT_SUMMARY_TOKENS = 75
+
+# Runs of text between periods, scanned lazily for the report's hypotheses
+_SENTENCE_RE = re.compile(r"[^.]+")
 
 DATA_ROOT = Path(__file__).resolve().parent.parent / "data" / "runs"
 DATA_ROOT.mkdir(parents=True, exist_ok=True)
 
 
+# Smallest streamed chunk written to trace.jsonl as a "delta" event
+_DELTA_MIN_CHARS = 200
+
+
+class _TraceLog:
+    """Append-only trace.jsonl written while a run is in progress.
+
+    One JSON object per line: an "init" event with the topic, a "message"
+    event per agent message, "delta" events carrying a streamed stage's text
+    while it is still being generated, and a final "complete" or "error" event. The
+    live SSE stream tails this file by byte offset instead of re-reading
+    the full trace.json, which is still written once at the end.
+    """
+
+    def __init__(self, run_dir: Path, topic: str) -> None:
+        run_dir.mkdir(parents=True, exist_ok=True)
+        self._f = (run_dir / "trace.jsonl").open("ab")
+        self.write_event("init", topic=topic)
+
+    def write_event(self, event: str, **data) -> None:
+        self._write({"event": event, **data})
+
+    def write_messages(self, turn_index: int, msgs) -> None:
+        for msg in msgs:
+            self._write({"event": "message", "turn": turn_index, **msg.model_dump(mode="json")})
+
+    def delta_writer(self, turn_index: int, role: str) -> Callable[[str], None]:
+        """on_delta callback appending a role's streamed text, a paragraph at a time.
+
+        Fragments are buffered until a blank line with at least
+        _DELTA_MIN_CHARS pending, so the log gets one write per paragraph
+        rather than per token. Whatever is still buffered when the stream ends
+        is covered by the stage's "message" event.
+        """
+        pending: List[str] = []
+        size = 0
+
+        def on_delta(text: str) -> None:
+            nonlocal size
+            # A blank line may arrive split across two fragments
+            boundary = "\n\n" in text or (text.startswith("\n") and bool(pending) and pending[-1].endswith("\n"))
+            pending.append(text)
+            size += len(text)
+            if size >= _DELTA_MIN_CHARS and boundary:
+                self.write_event("delta", turn=turn_index, role=role, text="".join(pending))
+                pending.clear()
+                size = 0
+
+        return on_delta
+
+    def _write(self, obj: dict) -> None:
+        if self._f.closed:
+            return
+        self._f.write(_dumps(obj) + b"\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
 class Orchestrator:
     """Coordinates agents and persists trace/report artifacts.
 
@@ -49,6 +177,32 @@ class Orchestrator:
         self.synthesizer = SynthesizerAgent()
         self.verifier = VerifierAgent()
         self.followup = FollowUpAgent()
+        # Agent-call gate shared by all runs on a loop (see _asend)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Per-run BM25 override readers: abs files_dir -> (corpus digest, retriever, {bm25_k: reader}).
+        # Only the latest digest per directory is kept, so edited corpora do not pile up.
+        self._bm25_readers: Dict[str, Tuple[str, Optional[object], Dict[int, ReaderAgent]]] = {}
+
+    async def _asend(self, agent, prompt: str, on_delta: Optional[Callable[[str], None]] = None) -> Message:
+        """agent.asend() gated by AGENT_MAX_CONCURRENCY (default: 4) across concurrent runs.
+
+        Cache hits and coalesced calls also hold a slot briefly; the provider
+        transport separately caps raw HTTP requests with LLM_MAX_CONCURRENCY.
+        The semaphore is rebuilt per event loop, since run() starts a new one.
+        """
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            try:
+                limit = max(1, int(os.getenv("AGENT_MAX_CONCURRENCY", "4")))
+            except ValueError:
+                limit = 4
+            self._slots = asyncio.Semaphore(limit)
+            self._slots_loop = loop
+        async with self._slots:
+            if on_delta is None:
+                return await agent.asend(prompt)
+            return await agent.asend(prompt, on_delta=on_delta)
 
     def run(
         self,
@@ -58,6 +212,27 @@ class Orchestrator:
         enable_bm25: bool | None = None,
         files_dir: str | None = None,
         bm25_k: int = 4,
+    ) -> str:
+        """Execute an orchestration run synchronously (see arun)."""
+        return asyncio.run(
+            self.arun(
+                topic=topic,
+                max_turns=max_turns,
+                consensus_threshold=consensus_threshold,
+                enable_bm25=enable_bm25,
+                files_dir=files_dir,
+                bm25_k=bm25_k,
+            )
+        )
+
+    async def arun(
+        self,
+        topic: str,
+        max_turns: int = 2,
+        consensus_threshold: float = 0.8,
+        enable_bm25: bool | None = None,
+        files_dir: str | None = None,
+        bm25_k: int = 4,
     ) -> str:
         """Execute an orchestration run.
 
@@ -73,22 +248,53 @@ class Orchestrator:
         trace = Trace(
             run_id=run_id,
             topic=topic,
-            created_at=datetime.utcnow(),
+            created_at=datetime.now(timezone.utc),
             status="running",
             turns=[],
         )
+        trace_log = _TraceLog(DATA_ROOT / run_id, topic)
+        try:
+            await self._drive(
+                trace,
+                trace_log,
+                topic=topic,
+                max_turns=max_turns,
+                consensus_threshold=consensus_threshold,
+                enable_bm25=enable_bm25,
+                files_dir=files_dir,
+                bm25_k=bm25_k,
+            )
+        except BaseException as exc:
+            trace_log.write_event("error", message=str(exc) or type(exc).__name__)
+            raise
+        finally:
+            trace_log.close()
+        return run_id
 
-        # Per-run retrieval override if requested
-        if enable_bm25 is not None and BM25Retriever and load_and_chunk_pdfs:
+    async def _drive(
+        self,
+        trace: Trace,
+        trace_log: "_TraceLog",
+        topic: str,
+        max_turns: int,
+        consensus_threshold: float,
+        enable_bm25: bool | None,
+        files_dir: str | None,
+        bm25_k: int,
+    ) -> None:
+        """Run the agent turns for `trace`, mirroring each message into `trace_log`."""
+        # Per-run retrieval override if requested (PDF parsing/indexing runs off-loop)
+        if enable_bm25 is not None and load_or_build_retriever:
             if enable_bm25:
                 use_dir = files_dir or os.getenv("BM25_FILES_DIR", "files")
-                chunks = load_and_chunk_pdfs(use_dir)
-                override = BM25Retriever(chunks) if chunks else None
-                self.reader = self._init_reader(override_retriever=override, bm25_k=bm25_k)
+                self.reader = await asyncio.to_thread(self._bm25_reader, use_dir, bm25_k)
             else:
-                self.reader = self._init_reader(override_retriever=None, bm25_k=bm25_k)
+                self.reader = await asyncio.to_thread(self._init_reader, override_retriever=None, bm25_k=bm25_k)
+        # Pin the reader for this run so a concurrent override cannot swap it mid-run
+        reader = self.reader
 
-        # Optional per-step delay to honor provider rate limits
+        # Optional fixed per-step delay, a coarse fallback for strict provider rate limits;
+        # AGENT_MAX_CONCURRENCY / LLM_RPM gate calls without idling between every step
         step_delay = 0.0
         try:
             step_delay = float(os.getenv("AGENT_STEP_DELAY_S", "0"))
@@ -101,21 +307,30 @@ class Orchestrator:
         except Exception:
             debate_rounds = 1
         debate_enabled = (os.getenv("DEBATE_ENABLE", "true").lower() == "true") and debate_rounds > 0
+        # Stream each stage's provider output into trace.jsonl as it is generated
+        stream_stages = os.getenv("AGENT_STREAM", "true").lower() == "true"
 
         for turn_index in range(max_turns):
             turn_messages: List[Message] = []
+
+            def record(*msgs: Message) -> None:
+                turn_messages.extend(msgs)
+                trace_log.write_messages(turn_index, msgs)
+
+            def live(role: str) -> Optional[Callable[[str], None]]:
+                return trace_log.delta_writer(turn_index, role) if stream_stages else None
             
             # Reader - extracts methods and findings
-            reader_msg = self.reader.send(topic if turn_index == 0 else topic)
-            turn_messages.append(reader_msg)
+            reader_msg = await self._asend(reader, topic, on_delta=live("reader"))
+            record(reader_msg)
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
             
             # Optional Debate: Reader -> Critic
             critic_handoff_text = reader_msg.content
             if debate_enabled:
-                handoff, debate_msgs = self._debate(
-                    agent_a=self.reader,
+                handoff, debate_msgs = await self._debate(
+                    agent_a=reader,
                     agent_b=self.critic,
                     context=reader_msg.content,
                     a_role="reader",
@@ -125,25 +340,21 @@ class Orchestrator:
                 )
                 critic_handoff_text = handoff or reader_msg.content
                 # Record debate messages in trace so we can see "who's talking"
-                turn_messages.extend(debate_msgs)
+                record(*debate_msgs)
                 if step_delay:
-                    time.sleep(step_delay)
+                    await asyncio.sleep(step_delay)
 
             # Critic - challenges reader's findings using the coherent handoff
-            critic_input = (
-                f"The Reader has provided the following analysis (after debate handoff):\n\n{critic_handoff_text}\n\n"
-                f"Critically evaluate the Reader's findings. Identify gaps, unsupported claims, "
-                f"and potential biases. Reference specific points from the Reader's analysis."
-            )
-            critic_msg = self.critic.send(critic_input)
-            turn_messages.append(critic_msg)
+            critic_input = "".join((_CRITIC_TASK, critic_handoff_text))
+            critic_msg = await self._asend(self.critic, critic_input, on_delta=live("critic"))
+            record(critic_msg)
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
 
             # Optional Debate: Critic -> Synthesizer
             critic_to_synth_text = critic_msg.content
             if debate_enabled:
-                handoff, debate_msgs = self._debate(
+                handoff, debate_msgs = await self._debate(
                     agent_a=self.critic,
                     agent_b=self.synthesizer,
                     context=critic_msg.content,
@@ -153,27 +364,25 @@ class Orchestrator:
                     step_delay=step_delay,
                 )
                 critic_to_synth_text = handoff or critic_msg.content
-                turn_messages.extend(debate_msgs)
+                record(*debate_msgs)
                 if step_delay:
-                    time.sleep(step_delay)
+                    await asyncio.sleep(step_delay)
 
             # Synthesizer - integrates reader and critic perspectives (using debated critic text)
-            synth_input = (
-                f"--- Reader's Analysis ---\n{reader_msg.content}\n\n"
-                f"--- Critic's Evaluation (after debate handoff) ---\n{critic_to_synth_text}\n\n"
-                f"Synthesize the Reader's findings with the Critic's challenges. "
-                f"Generate hypotheses that address the Critic's concerns while building on the Reader's insights. "
-                f"Reference specific points from both agents."
-            )
-            synth_msg = self.synthesizer.send(synth_input)
-            turn_messages.append(synth_msg)
+            synth_input = "".join((
+                _SYNTH_TASK,
+                "--- Reader's Analysis ---\n", reader_msg.content,
+                "\n\n--- Critic's Evaluation (after debate handoff) ---\n", critic_to_synth_text,
+            ))
+            synth_msg = await self._asend(self.synthesizer, synth_input, on_delta=live("synthesizer"))
+            record(synth_msg)
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
 
             # Optional Debate: Synthesizer -> Verifier
             synth_to_verifier_text = synth_msg.content
             if debate_enabled:
-                handoff, debate_msgs = self._debate(
+                handoff, debate_msgs = await self._debate(
                     agent_a=self.synthesizer,
                     agent_b=self.verifier,
                     context=synth_msg.content,
@@ -183,26 +392,21 @@ class Orchestrator:
                     step_delay=step_delay,
                 )
                 synth_to_verifier_text = handoff or synth_msg.content
-                turn_messages.extend(debate_msgs)
+                record(*debate_msgs)
                 if step_delay:
-                    time.sleep(step_delay)
+                    await asyncio.sleep(step_delay)
 
             # Verifier - assesses synthesis quality (using debated synth text)
-            verify_input = (
-                f"--- Synthesizer's Hypotheses (after debate handoff) ---\n{synth_to_verifier_text}\n\n"
-                f"Verify the Synthesizer's hypotheses against the original evidence. "
-                f"Consider the Reader's findings and the Critic's concerns. "
-                f"Reference specific hypotheses and explain your confidence assessment."
-            )
-            verifier_msg = self.verifier.send(verify_input)
-            turn_messages.append(verifier_msg)
+            verify_input = "".join((_VERIFY_TASK, synth_to_verifier_text))
+            verifier_msg = await self._asend(self.verifier, verify_input, on_delta=live("verifier"))
+            record(verifier_msg)
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
 
             # Optional Debate: Verifier -> FollowUp (to ensure coherent context for planning)
             verifier_to_follow_text = verifier_msg.content
             if debate_enabled:
-                handoff, debate_msgs = self._debate(
+                handoff, debate_msgs = await self._debate(
                     agent_a=self.verifier,
                     agent_b=self.followup,
                     context=verifier_msg.content,
@@ -212,23 +416,23 @@ class Orchestrator:
                     step_delay=step_delay,
                 )
                 verifier_to_follow_text = handoff or verifier_msg.content
-                turn_messages.extend(debate_msgs)
+                record(*debate_msgs)
                 if step_delay:
-                    time.sleep(step_delay)
+                    await asyncio.sleep(step_delay)
 
             # FollowUp - proposes next research directions
             followup_input = (
+                f"{_FOLLOWUP_TASK}"
                 f"--- Research Context ---\n"
                 f"Topic: {topic}\n\n"
-                f"Reader's Findings:\n{reader_msg.content[:500]}...\n\n"
-                f"Critic's Challenges (debated):\n{critic_to_synth_text[:500]}...\n\n"
-                f"Synthesizer's Hypotheses (debated):\n{synth_to_verifier_text[:500]}...\n\n"
-                f"Verifier's Assessment (debated, Confidence: {verifier_msg.confidence}):\n{verifier_to_follow_text[:500]}...\n\n"
-                f"Based on the complete multi-agent analysis above, propose follow-up research questions "
-                f"and identify knowledge gaps. Reference specific findings from each agent."
+                f"Reader's Findings:\n{budget_summary(reader_msg.content, topic, _FOLLOWUP_SECTION_TOKENS)}\n\n"
+                f"Critic's Challenges (debated):\n{budget_summary(critic_to_synth_text, topic, _FOLLOWUP_SECTION_TOKENS)}\n\n"
+                f"Synthesizer's Hypotheses (debated):\n{budget_summary(synth_to_verifier_text, topic, _FOLLOWUP_SECTION_TOKENS)}\n\n"
+                f"Verifier's Assessment (debated, Confidence: {verifier_msg.confidence}):\n"
+                f"{budget_summary(verifier_to_follow_text, topic, _FOLLOWUP_SECTION_TOKENS)}"
             )
-            followup_msg = self.followup.send(followup_input)
-            turn_messages.append(followup_msg)
+            followup_msg = await self._asend(self.followup, followup_input, on_delta=live("followup"))
+            record(followup_msg)
 
             trace.turns.append(Turn(index=turn_index, messages=turn_messages))
 
@@ -236,11 +440,37 @@ class Orchestrator:
                 break
 
         trace.status = "complete"
-        self._persist_trace(trace)
-        self._persist_report(trace)
-        return run_id
+        # trace.json and report.json are independent; write them concurrently
+        await asyncio.gather(
+            asyncio.to_thread(self._persist_trace, trace),
+            asyncio.to_thread(self._persist_report, trace),
+        )
+        trace_log.write_event("complete", status=trace.status)
 
     # -------- Initialization helpers --------
+    def _bm25_reader(self, files_dir: str, bm25_k: int) -> ReaderAgent:
+        """ReaderAgent over files_dir's PDFs, reused across runs while they are unchanged.
+
+        Runs with the same directory and PDFs share one retriever; each
+        bm25_k gets its own reader, so a concurrent run's k is never swapped
+        underneath it. Concurrent first builds may both load the index;
+        the last one stored wins and both are equivalent.
+        """
+        key = os.path.abspath(files_dir)
+        digest = corpus_digest(files_dir)
+        if digest is None:
+            # No PDFs there: same fallback as before (startup retriever rules)
+            return self._init_reader(override_retriever=None, bm25_k=bm25_k)
+        cached = self._bm25_readers.get(key)
+        if cached is None or cached[0] != digest:
+            cached = (digest, load_or_build_retriever(files_dir), {})
+            self._bm25_readers[key] = cached
+        _, retriever, readers = cached
+        reader = readers.get(bm25_k)
+        if reader is None:
+            reader = readers[bm25_k] = self._init_reader(override_retriever=retriever, bm25_k=bm25_k)
+        return reader
+
     def _init_reader(self, override_retriever: Optional[object] = None, bm25_k: int = 4) -> ReaderAgent:
         """Initialize ReaderAgent with optional BM25 retriever and knowledge base.
 
@@ -254,11 +484,9 @@ class Orchestrator:
         retriever = None
         if override_retriever is not None:
             retriever = override_retriever
-        elif BM25Retriever and load_and_chunk_pdfs and enable in {"true", "auto"}:
-            files_dir = os.getenv("BM25_FILES_DIR", "files")
-            chunks = load_and_chunk_pdfs(files_dir)
-            if chunks:
-                retriever = BM25Retriever(chunks)
+        elif load_or_build_retriever and enable in {"true", "auto"}:
+            # Reuses the on-disk index while the PDFs are unchanged
+            retriever = load_or_build_retriever(os.getenv("BM25_FILES_DIR", "files"))
         
         # Knowledge base path
         kb_path = os.getenv("KNOWLEDGE_BASE_PATH", "data/knowledge_base.json")
@@ -266,7 +494,7 @@ class Orchestrator:
         return ReaderAgent(retriever=retriever, bm25_k=bm25_k, knowledge_base_path=kb_path)
 
     # -------- Debate helper --------
-    def _debate(
+    async def _debate(
         self,
         agent_a,
         agent_b,
@@ -279,7 +507,8 @@ class Orchestrator:
         """Run a short clarification debate from agent A to agent B.
 
         The pattern per round:
-          1) B asks up to 3 clarifying questions about A's content
+          1) B asks up to 3 clarifying questions about A's content, or replies [DONE]
+             when it needs none, which ends the debate after this single call
           2) A answers concisely
           3) B produces a short coherent summary ending with [DONE] if sufficient else [MORE]
 
@@ -291,44 +520,47 @@ class Orchestrator:
         for r in range(1, max_rounds + 1):
             # B asks questions
             b_q_prompt = (
-                f"As the {b_role.upper()}, before proceeding, read the following {a_role.upper()}'s output "
-                f"and ask up to 3 clarifying questions you need to form a coherent understanding.\n\n"
-                f"=== {a_role.upper()} OUTPUT ===\n{context}\n\n"
-                f"Return ONLY a numbered list of questions."
+                f"{_DEBATE_ASK}"
+                f"You are the {b_role.upper()}, reading the {a_role.upper()}'s output.\n\n"
+                f"=== {a_role.upper()} OUTPUT ===\n{context}"
             )
-            b_q_msg = agent_b.send(b_q_prompt)
+            b_q_msg = await self._asend(agent_b, b_q_prompt)
+            # Fast path: B has nothing to clarify, so the answer and synthesis calls are skipped.
+            # Matched at the end of the reply so a question quoting the instruction is not taken for it.
+            no_questions = b_q_msg.content.strip().lower().endswith("[done]")
             b_q_msg.content = f"[DEBATE {a_role}->{b_role} | {b_role.upper()} asks | Round {r}]\n" + b_q_msg.content
             debate_messages.append(b_q_msg)
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
+
+            if no_questions:
+                break
 
             # A answers
             a_ans_prompt = (
-                f"As the {a_role.upper()}, answer the following questions clearly and concisely, "
-                f"filling any missing details from your analysis. If a question is outside your scope, say so.\n\n"
-                f"=== QUESTIONS FROM {b_role.upper()} (Round {r}) ===\n{b_q_msg.content}\n\n"
-                f"Provide numbered answers."
+                f"{_DEBATE_ANSWER}"
+                f"You are the {a_role.upper()}.\n\n"
+                f"=== QUESTIONS FROM {b_role.upper()} (Round {r}) ===\n{b_q_msg.content}"
             )
-            a_ans_msg = agent_a.send(a_ans_prompt)
+            a_ans_msg = await self._asend(agent_a, a_ans_prompt)
             a_ans_msg.content = f"[DEBATE {a_role}->{b_role} | {a_role.upper()} answers | Round {r}]\n" + a_ans_msg.content
             debate_messages.append(a_ans_msg)
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
 
             # B synthesizes understanding and signals readiness
             b_sum_prompt = (
-                f"As the {b_role.upper()}, produce a concise coherent summary of your understanding "
-                f"incorporating the answers. End the message with either [DONE] if you have enough to proceed, "
-                f"or [MORE] if you still need clarification."
-                f"\n\n=== {a_role.upper()} ORIGINAL OUTPUT ===\n{context}\n\n"
+                f"{_DEBATE_SUMMARY}"
+                f"You are the {b_role.upper()}.\n\n"
+                f"=== {a_role.upper()} ORIGINAL OUTPUT ===\n{context}\n\n"
                 f"=== {a_role.upper()} ANSWERS (Round {r}) ===\n{a_ans_msg.content}\n"
             )
-            b_sum_msg = agent_b.send(b_sum_prompt)
+            b_sum_msg = await self._asend(agent_b, b_sum_prompt)
             b_sum_msg.content = f"[DEBATE {a_role}->{b_role} | {b_role.upper()} synthesis | Round {r}]\n" + b_sum_msg.content
             debate_messages.append(b_sum_msg)
             latest_summary = b_sum_msg.content
             if step_delay:
-                time.sleep(step_delay)
+                await asyncio.sleep(step_delay)
 
             # Check readiness
             if "[done]" in b_sum_msg.content.lower():
@@ -342,21 +574,25 @@ class Orchestrator:
     def _persist_trace(self, trace: Trace) -> None:
         run_dir = DATA_ROOT / trace.run_id
         run_dir.mkdir(parents=True, exist_ok=True)
-        trace_path = run_dir / "trace.json"
-        with trace_path.open("w", encoding="utf-8") as f:
-            json.dump(trace.model_dump(), f, indent=2, default=str)
+        # Serialized straight from the model in pydantic-core, skipping the intermediate dict
+        (run_dir / "trace.json").write_bytes(to_json(trace, indent=2))
 
     def _persist_report(self, trace: Trace) -> None:
         # Build a report using last synthesizer, verifier, and followup messages.
         last_turn = trace.turns[-1]
-        synth = next((m for m in last_turn.messages if m.role == "synthesizer"), None)
-        verifier = next((m for m in last_turn.messages if m.role == "verifier"), None)
-        followup = next((m for m in last_turn.messages if m.role == "followup"), None)
+        # One pass; first message per role wins (later ones are debate replies)
+        by_role: Dict[str, Message] = {}
+        for m in last_turn.messages:
+            by_role.setdefault(m.role, m)
+        synth = by_role.get("synthesizer")
+        verifier = by_role.get("verifier")
+        followup = by_role.get("followup")
         
         hypotheses: List[str] = []
         if synth:
-            # Split mock hypotheses by sentences (placeholder logic).
-            hypotheses = [h.strip() for h in synth.content.split(".") if h.strip()][:5]
+            # Split mock hypotheses by sentences (placeholder logic), stopping after five.
+            parts = (m.group().strip() for m in _SENTENCE_RE.finditer(synth.content))
+            hypotheses = list(islice((h for h in parts if h), 5))
         
         citations = []
         if synth:
@@ -367,7 +603,7 @@ class Orchestrator:
             citations.extend(followup.citations)
         
         # Build summary with followup questions if available
-        summary = synth.content[:300] if synth else ""
+        summary = budget_summary(synth.content, trace.topic, _REPORT_SUMMARY_TOKENS) if synth else ""
         if followup:
             summary += f"\n\nFollow-up Research Directions:\n{followup.content[:200]}..."
         
@@ -380,23 +616,35 @@ class Orchestrator:
             citations=citations,
         )
         run_dir = DATA_ROOT / trace.run_id
-        report_path = run_dir / "report.json"
-        with report_path.open("w", encoding="utf-8") as f:
-            json.dump(report.model_dump(), f, indent=2)
+        (run_dir / "report.json").write_bytes(_dumps(report.model_dump(mode="json"), indent=True))
 
     # -------- Loaders --------
+    def load_trace_raw(self, run_id: str) -> bytes | None:
+        """Persisted trace.json bytes, for serving without a Pydantic round-trip."""
+        path = DATA_ROOT / run_id / "trace.json"
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def load_report_raw(self, run_id: str) -> bytes | None:
+        """Persisted report.json bytes, for serving without a Pydantic round-trip."""
+        path = DATA_ROOT / run_id / "report.json"
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
     def load_trace(self, run_id: str) -> Trace | None:
         path = DATA_ROOT / run_id / "trace.json"
         if not path.exists():
             return None
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(path.read_bytes())
         return Trace(**data)
 
     def load_report(self, run_id: str) -> InsightReport | None:
         path = DATA_ROOT / run_id / "report.json"
         if not path.exists():
             return None
-        with path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _loads(path.read_bytes())
         return InsightReport(**data)
@@ -0,0 +1,105 @@
+"""Token-budgeted extractive summaries for prompt hand-offs.
+
+budget_summary() keeps the sentences of a text most related to the run's
+topic (TF-IDF cosine over word tokens), packed greedily until a token budget
+is full and returned in their original order. Token counts use tiktoken's
+cl100k_base encoding when installed, otherwise an estimate of 4 characters
+per token.
+"""
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, List
+
+try:  # optional, exact token counts
+    import tiktoken  # type: ignore
+except Exception:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"\w{2,}")
+
+
+@lru_cache(maxsize=1)
+def _token_counter() -> Callable[[str], int]:
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.get_encoding("cl100k_base")
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception:  # encoding files unavailable offline
+            pass
+    return lambda text: (len(text) + 3) // 4
+
+
+def count_tokens(text: str) -> int:
+    return _token_counter()(text)
+
+
+def _tfidf(terms: Counter, idf: Dict[str, float]) -> Dict[str, float]:
+    return {t: n * idf.get(t, 0.0) for t, n in terms.items()}
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    dot = sum(w * b[t] for t, w in a.items() if t in b)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(w * w for w in a.values())) * math.sqrt(sum(w * w for w in b.values()))
+    return dot / norm
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    """Cut text at a word boundary so it fits max_tokens."""
+    words = text.split()
+    lo, hi = 0, len(words)
+    while lo < hi:  # longest word prefix within budget
+        mid = (lo + hi + 1) // 2
+        if count_tokens(" ".join(words[:mid])) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return " ".join(words[:lo])
+
+
+def budget_summary(text: str, topic: str, max_tokens: int = 200) -> str:
+    """The sentences of text most relevant to topic, within max_tokens.
+
+    Text already within budget is returned unchanged (stripped). Sentences
+    are ranked by TF-IDF cosine to the topic, ties broken by position, so a
+    text sharing no words with the topic degrades to its leading sentences;
+    repeated sentences are kept once.
+    If not even the best sentence fits, it is cut at a word boundary.
+    """
+    text = text.strip()
+    if max_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    sentences = [s.strip() for s in _SENTENCE_SPLIT_RE.split(text) if s.strip()]
+    terms = [Counter(_WORD_RE.findall(s.lower())) for s in sentences]
+    df: Counter = Counter()
+    for t in terms:
+        df.update(t.keys())
+    n = len(sentences)
+    idf = {term: math.log((1 + n) / (1 + d)) + 1.0 for term, d in df.items()}
+    query = _tfidf(Counter(_WORD_RE.findall(topic.lower())), idf)
+    scores = [_cosine(_tfidf(t, idf), query) for t in terms]
+    ranked = sorted(range(n), key=lambda i: (-scores[i], i))
+
+    chosen: List[int] = []
+    seen = set()
+    used = 0
+    for i in ranked:
+        if sentences[i] in seen:  # repeated lines add tokens, not information
+            continue
+        cost = count_tokens(sentences[i]) + (1 if chosen else 0)
+        if used + cost <= max_tokens:
+            chosen.append(i)
+            seen.add(sentences[i])
+            used += cost
+    if not chosen:
+        return _truncate(sentences[ranked[0]], max_tokens)
+    return " ".join(sentences[i] for i in sorted(chosen))
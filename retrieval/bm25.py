@@ -2,21 +2,56 @@
 
 - Loads PDFs from a directory (default: files/)
 - Splits into chunks with metadata (source, chunk_id, orig_page_index)
-- Builds a BM25 index using rank_bm25
+- Builds a BM25 index with bm25s (sparse-matrix scoring) when installed,
+  otherwise with rank_bm25's BM25Okapi
 - Exposes BM25Retriever.get_relevant_documents(query, k)
+- load_or_build_retriever() caches the built index under data/bm25_cache/<digest>/,
+  keyed by the PDFs' paths, sizes and mtimes; bm25s indexes are memory-mapped
+  on load, so unchanged corpora skip parsing and tokenization entirely
+
+Environment:
+    BM25_CACHE:      true|false (default: true)
+    BM25_CACHE_DIR:  Index cache directory (default: data/bm25_cache)
 """
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import pickle
 import re
+import shutil
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from glob import glob
-from typing import Any, Dict, List, Optional
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
-from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.document_loaders.parsers import PyPDFParser
+from langchain_core.documents.base import Blob
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from rank_bm25 import BM25Okapi
+import numpy as np
+
+try:  # optional, scores a query with one sparse matrix op instead of a Python loop
+    import bm25s  # type: ignore
+except Exception:  # pragma: no cover
+    bm25s = None  # type: ignore
+
+try:  # fallback backend
+    from rank_bm25 import BM25Okapi  # type: ignore
+except Exception:  # pragma: no cover
+    BM25Okapi = None  # type: ignore
+
+try:  # optional, faster chunk (de)serialization for the index cache
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+_DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "bm25_cache"
 
 
 @dataclass
@@ -25,62 +60,209 @@ class DocChunk:
     metadata: Dict[str, Any]
 
 
+# Word runs of two or more characters; {2,} replaces a post-filter on length
+_TOKEN_RE = re.compile(r"\w{2,}")
+
+
 def simple_tokenize(text: str) -> List[str]:
-    tokens = re.findall(r"\w+", text.lower())
-    return [t for t in tokens if len(t) > 1]
+    return _TOKEN_RE.findall(text.lower())
 
 
-def load_and_chunk_pdfs(
-    files_dir: str = "files", chunk_size: int = 1000, chunk_overlap: int = 200
+def load_and_chunk_pdf(
+    pdf_path: str, chunk_size: int = 1000, chunk_overlap: int = 200
 ) -> List[DocChunk]:
-    chunks: List[DocChunk] = []
-    pdf_paths = sorted(glob(os.path.join(files_dir, "*.pdf")))
-    if not pdf_paths:
+    """Parse and chunk a single PDF; returns [] when it cannot be loaded.
+
+    Module-level so it can be shipped to worker processes.
+    """
+    filename = os.path.basename(pdf_path)
+    try:
+        logging.info(f"Loading PDF: {pdf_path}")
+        # Read the file in one call and parse from memory: pypdf seeks and issues
+        # many small reads while walking xref tables and content streams.
+        with open(pdf_path, "rb") as fh:
+            data = fh.read()
+        docs = list(PyPDFParser().lazy_parse(Blob.from_data(data, path=pdf_path)))
+        logging.info(f"Loaded {len(docs)} pages from {filename}")
+    except Exception as e:
+        # Log the error instead of silently skipping
+        logging.error(f"Failed to load {pdf_path}: {e}")
         return []
+
+    for i, d in enumerate(docs):
+        if not getattr(d, "metadata", None):
+            d.metadata = {}
+        d.metadata["source"] = filename
+        d.metadata["orig_page_index"] = d.metadata.get("page", i)
+
     splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size, chunk_overlap=chunk_overlap
     )
+    chunks: List[DocChunk] = []
+    for idx, c in enumerate(splitter.split_documents(docs)):
+        meta = dict(c.metadata)
+        meta["chunk_id"] = f"{filename}__chunk{idx}"
+        chunks.append(DocChunk(page_content=c.page_content, metadata=meta))
+    return chunks
 
-    for pdf_path in pdf_paths:
-        filename = os.path.basename(pdf_path)
-        try:
-            logging.info(f"Loading PDF: {pdf_path}")
-            loader = PyPDFLoader(pdf_path)
-            docs = loader.load()
-            logging.info(f"Loaded {len(docs)} pages from {filename}")
-        except Exception as e:
-            # Log the error instead of silently skipping
-            logging.error(f"Failed to load {pdf_path}: {e}")
-            continue
-
-        for i, d in enumerate(docs):
-            if not getattr(d, "metadata", None):
-                d.metadata = {}
-            d.metadata["source"] = filename
-            d.metadata["orig_page_index"] = d.metadata.get("page", i)
-
-        for idx, c in enumerate(splitter.split_documents(docs)):
-            meta = dict(c.metadata)
-            meta["chunk_id"] = f"{filename}__chunk{idx}"
-            chunks.append(DocChunk(page_content=c.page_content, metadata=meta))
+
+def _iter_chunked_pdfs(
+    files_dir: str, chunk_size: int, chunk_overlap: int
+) -> Iterator[List[DocChunk]]:
+    """Chunks of each PDF in files_dir, one list per file in sorted path order.
+
+    PDF text extraction is CPU-bound and holds the GIL, so threads would not
+    help; files are parsed by one worker process per CPU. map() keeps file
+    order, so chunk order (and the index) is stable.
+    """
+    pdf_paths = sorted(glob(os.path.join(files_dir, "*.pdf")))
+    if len(pdf_paths) <= 1:
+        for pdf_path in pdf_paths:
+            yield load_and_chunk_pdf(pdf_path, chunk_size, chunk_overlap)
+        return
+    workers = min(len(pdf_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(
+            load_and_chunk_pdf, pdf_paths, repeat(chunk_size), repeat(chunk_overlap)
+        )
+
+
+def load_and_chunk_pdfs(
+    files_dir: str = "files", chunk_size: int = 1000, chunk_overlap: int = 200
+) -> List[DocChunk]:
+    """Parse and chunk every PDF in files_dir, in parallel."""
+    chunks: List[DocChunk] = []
+    for per_file in _iter_chunked_pdfs(files_dir, chunk_size, chunk_overlap):
+        chunks.extend(per_file)
     return chunks
 
 
+def load_and_chunk_pdfs_by_source(
+    files_dir: str = "files", chunk_size: int = 1000, chunk_overlap: int = 200
+) -> Dict[str, List[DocChunk]]:
+    """load_and_chunk_pdfs() grouped by source filename, in file order.
+
+    Each file is parsed into its own list already, so no per-chunk regrouping
+    is needed; files that yield no chunks are left out.
+    """
+    grouped: Dict[str, List[DocChunk]] = {}
+    for per_file in _iter_chunked_pdfs(files_dir, chunk_size, chunk_overlap):
+        if per_file:
+            grouped[per_file[0].metadata["source"]] = per_file
+    return grouped
+
+
 class BM25Retriever:
     """Simple BM25 retriever over DocChunk list."""
 
     def __init__(self, chunks: List[DocChunk]) -> None:
         self.chunks = chunks
-        self.tokenized_texts = [simple_tokenize(c.page_content) for c in chunks]
-        self.bm25 = BM25Okapi(self.tokenized_texts)
+        tokenized_texts = list(map(simple_tokenize, (c.page_content for c in chunks)))
+        if bm25s is not None:
+            self.bm25 = bm25s.BM25()
+            self.bm25.index(tokenized_texts, show_progress=False)
+        elif BM25Okapi is not None:
+            self.bm25 = BM25Okapi(tokenized_texts)
+        else:
+            raise ImportError("BM25Retriever needs either 'bm25s' or 'rank_bm25' installed")
 
     def get_relevant_documents(self, query: str, k: int = 3) -> List[DocChunk]:
         q_tokens = simple_tokenize(query)
-        if not q_tokens:
+        if not q_tokens or not self.chunks:
+            return []
+        # Both backends return a dense score per chunk
+        scores = np.asarray(self.bm25.get_scores(q_tokens))
+        k = min(k, len(scores))
+        if k <= 0:
             return []
-        scores = self.bm25.get_scores(q_tokens)
-        idx_scores = sorted(enumerate(scores), key=lambda x: x[1], reverse=True)
-        top = [i for i, sc in idx_scores[:k] if sc > 0]
-        if not top and idx_scores:
-            top = [i for i, _ in idx_scores[:k]]
+        # Top-k without a full sort, then order those k by score (ties by position)
+        idx = np.argpartition(-scores, k - 1)[:k]
+        idx = idx[np.lexsort((idx, -scores[idx]))]
+        top = [int(i) for i in idx if scores[i] > 0]
+        if not top:
+            top = [int(i) for i in idx]
         return [self.chunks[i] for i in top]
+
+    # -------- Persistence --------
+    def save(self, path: Path) -> None:
+        """Write chunks.jsonl plus the index (bm25s arrays, or a pickle for rank_bm25)."""
+        path.mkdir(parents=True, exist_ok=True)
+        with (path / "chunks.jsonl").open("wb") as fh:
+            for c in self.chunks:
+                line = {"page_content": c.page_content, "metadata": c.metadata}
+                fh.write(orjson.dumps(line) if orjson is not None else json.dumps(line).encode("utf-8"))
+                fh.write(b"\n")
+        if bm25s is not None and isinstance(self.bm25, bm25s.BM25):
+            self.bm25.save(str(path / "index"), show_progress=False)
+        else:
+            with (path / "index.pkl").open("wb") as fh:
+                pickle.dump(self.bm25, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "BM25Retriever":
+        """Inverse of save(); bm25s score arrays are memory-mapped unless mmap=False."""
+        self = cls.__new__(cls)
+        with (path / "chunks.jsonl").open("rb") as fh:
+            self.chunks = [DocChunk(**_loads(line)) for line in fh if line.strip()]
+        if (path / "index").is_dir():
+            if bm25s is None:
+                raise ImportError("cached BM25 index was built with 'bm25s', which is not installed")
+            self.bm25 = bm25s.BM25.load(str(path / "index"), mmap=mmap, show_progress=False)
+        else:
+            with (path / "index.pkl").open("rb") as fh:
+                self.bm25 = pickle.load(fh)
+        return self
+
+
+def corpus_digest(files_dir: str) -> Optional[str]:
+    """SHA-256 over (path, mtime_ns, size) of every PDF in files_dir, or None when there are none."""
+    entries = []
+    for pdf_path in sorted(glob(os.path.join(files_dir, "*.pdf"))):
+        st = os.stat(pdf_path)
+        entries.append(f"{os.path.abspath(pdf_path)}\0{st.st_mtime_ns}\0{st.st_size}")
+    if not entries:
+        return None
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def load_or_build_retriever(
+    files_dir: str,
+    load_chunks: Callable[[str], List[DocChunk]] = load_and_chunk_pdfs,
+) -> Optional[BM25Retriever]:
+    """BM25Retriever for the PDFs in files_dir, reusing the on-disk index when they are unchanged.
+
+    Returns None when the directory has no PDFs or they yield no chunks.
+    load_chunks lets callers substitute their own (e.g. parallel) ingestion.
+    """
+    digest = corpus_digest(files_dir)
+    if digest is None:
+        return None
+    if os.getenv("BM25_CACHE", "true").lower() != "true":
+        chunks = load_chunks(files_dir)
+        return BM25Retriever(chunks) if chunks else None
+
+    cache_dir = Path(os.getenv("BM25_CACHE_DIR") or _DEFAULT_CACHE_DIR) / digest
+    if cache_dir.is_dir():
+        try:
+            return BM25Retriever.load(cache_dir)
+        except Exception as exc:
+            # Partial write or a different backend: rebuild over it
+            logging.warning(f"Ignoring unreadable BM25 cache {cache_dir}: {exc}")
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    chunks = load_chunks(files_dir)
+    if not chunks:
+        return None
+    retriever = BM25Retriever(chunks)
+    # Build in a sibling temp dir and rename, so readers never see a half-written index
+    tmp_dir = cache_dir.with_name(f"{digest}.{os.getpid()}.tmp")
+    try:
+        retriever.save(tmp_dir)
+        os.replace(tmp_dir, cache_dir)
+    except OSError as exc:
+        # Another process may have won the rename; its index is equivalent
+        if not cache_dir.is_dir():
+            logging.warning(f"Failed to write BM25 cache {cache_dir}: {exc}")
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return retriever
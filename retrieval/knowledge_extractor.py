@@ -6,18 +6,132 @@ This module analyzes documents to extract:
 - Data points and statistics
 - Methodologies and approaches
 - Citations and references
+
+Environment:
+    EXTRACTION_SEMANTIC_CACHE:      true|false, reuse extractions of near-duplicate
+                                    chunks by embedding similarity (default: false)
+    EXTRACTION_SEMANTIC_THRESHOLD:  Minimum cosine similarity for reuse (default: 0.9)
+    SYNTHESIS_DIRECT_MAX_TOKENS:    Extractions totalling at most this many tokens are
+                                    merged without an LLM call (default: 500, 0 = never)
+    SYNTHESIS_DIRECT_MIN_JACCARD:   Extractions whose key_concepts overlap at least this
+                                    much (Jaccard) are merged without an LLM call
+                                    (default: 0.8, above 1 = never)
+
+The rule-based merge is on by default, so typical small documents get no
+LLM synthesis call; set SYNTHESIS_DIRECT_MAX_TOKENS=0 and
+SYNTHESIS_DIRECT_MIN_JACCARD=2 to always synthesize with the LLM. Invalid
+numbers are logged and replaced by their defaults.
 """
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import hashlib
 import json
 import logging
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Any, Optional
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, is_dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
-from retrieval.bm25 import load_and_chunk_pdfs, DocChunk
-from integrations.grok_client import LLMClient
+import httpx
+import numpy as np
+
+from retrieval.bm25 import load_and_chunk_pdfs_by_source, DocChunk
+from integrations.grok_client import LLMClient, _env_number
+from orchestrator.summary import count_tokens
+
+try:  # optional, incremental knowledge-base parsing
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover
+    ijson = None  # type: ignore
+
+try:  # optional, near-duplicate reuse of chunk extractions
+    from agents.semantic_cache import SemanticCache
+except Exception:  # pragma: no cover
+    SemanticCache = None  # type: ignore
+
+try:  # optional, faster JSON parsing
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+# A ```/```json fenced block (group 1), else the first '{' or '[' through the last '}' or ']' (group 2)
+_JSON_PAYLOAD_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```|([\[{].*[\]}])", re.DOTALL | re.IGNORECASE)
+
+
+def _json_default(obj):
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return vars(obj)  # shallow, unlike dataclasses.asdict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj, indent: bool = False) -> bytes:
+    """JSON bytes of obj; dataclasses (ExtractedKnowledge) serialize directly, without a copy."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=_json_default).encode("utf-8")
+
+
+def _document_cache_path(cache_dir: str, source: str) -> Path:
+    """<cache_dir>/<h[:2]>/<h[2:4]>/<source>.json, h the SHA-256 of source.
+
+    Sharding keeps directories small when a corpus has many thousands of
+    documents, so lookups and writes do not slow down with its size.
+    """
+    h = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / h[:2] / h[2:4] / f"{source}.json"
+
+
+def _adopt_flat_cache_file(cache_dir: str, source: str, cache_path: Path) -> bytes:
+    """Move a pre-sharding <cache_dir>/<source>.json to cache_path; its bytes.
+
+    Raises FileNotFoundError when there is no flat file either.
+    """
+    flat = Path(cache_dir) / f"{source}.json"
+    data = flat.read_bytes()
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(flat, cache_path)
+    logging.info(f"Moved cached knowledge for {source} to {cache_path}")
+    return data
+
+
+def _write_atomic(path: Path, data: bytes, durable: bool = True) -> None:
+    """Write data to path via a sibling temp file and os.replace().
+
+    An interrupted run leaves either the old file or the new one, never a
+    truncated one. durable also fsyncs before the rename, so the new contents
+    survive a crash; cheap-to-recompute entries can skip that.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+
+
+@functools.lru_cache(maxsize=1)
+def _direct_merge_limits() -> Tuple[int, float]:
+    """(SYNTHESIS_DIRECT_MAX_TOKENS, SYNTHESIS_DIRECT_MIN_JACCARD), read once."""
+    return (
+        int(_env_number("SYNTHESIS_DIRECT_MAX_TOKENS", 500, int)),
+        _env_number("SYNTHESIS_DIRECT_MIN_JACCARD", 0.8),
+    )
 
 
 @dataclass
@@ -45,13 +159,176 @@ class ExtractedKnowledge:
             self.citations = []
 
 
+class ContentCache:
+    """Chunk extractions keyed by a digest of the text sent to the LLM.
+
+    Boilerplate that recurs across chunks and papers (headers, licence text,
+    reference lists) is extracted once. Entries live in memory for the run
+    and, with disk_dir, in the sqlite table <disk_dir>/extractions.sqlite
+    across runs (WAL, so readers and the writer do not block each other).
+    Entries written by older versions as <disk_dir>/<digest[:2]>/<digest>.json
+    are still read and moved into the table on first use.
+    pending holds in-flight extraction tasks so identical chunks share one call.
+
+    With semantic_threshold, chunks that miss the exact digest are also
+    matched by embedding (agents.semantic_cache) against earlier chunks, and
+    a cosine similarity at or above the threshold reuses that extraction.
+    The vectors persist next to the entries in semantic-<namespace>.npz.
+    """
+
+    def __init__(
+        self,
+        disk_dir: Optional[Path] = None,
+        namespace: str = "",
+        semantic_threshold: Optional[float] = None,
+        semantic_capacity: int = 4096,
+    ) -> None:
+        self.disk_dir = disk_dir
+        self.namespace = namespace
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # get() also runs in worker threads (nearest()), so the connection is shared under a lock
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.pending: Dict[str, "asyncio.Future[Tuple[Dict[str, Any], bool]]"] = {}
+        self.semantic: Optional[SemanticCache] = None
+        self._vectors: List[Any] = []
+        self._vector_keys: List[str] = []
+        self._semantic_capacity = max(1, semantic_capacity)
+        if semantic_threshold is not None and SemanticCache is not None:
+            self.semantic = SemanticCache(threshold=semantic_threshold, capacity=self._semantic_capacity)
+            self._load_vectors()
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _legacy_path(self, key: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _vectors_path(self) -> Optional[Path]:
+        if self.disk_dir is None:
+            return None
+        return self.disk_dir / f"semantic-{self.namespace[:16]}.npz"
+
+    def _connection(self) -> sqlite3.Connection:
+        """The entry store, opened on first use; call with _db_lock held."""
+        if self._db is None:
+            assert self.disk_dir is not None
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.disk_dir / "extractions.sqlite", check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS ext (hash TEXT PRIMARY KEY, json BLOB NOT NULL)")
+            self._db = db
+        return self._db
+
+    def _store(self, key: str, data: bytes) -> None:
+        with self._db_lock:
+            db = self._connection()
+            db.execute("INSERT OR IGNORE INTO ext (hash, json) VALUES (?, ?)", (key, data))
+            db.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None or self.disk_dir is None:
+            return entry
+        try:
+            with self._db_lock:
+                row = self._connection().execute("SELECT json FROM ext WHERE hash = ?", (key,)).fetchone()
+            if row is not None:
+                entry = self._entries[key] = _loads(row[0])
+                return entry
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable content cache entry {key}: {e}")
+            return None
+        try:
+            data = self._legacy_path(key).read_bytes()
+            entry = self._entries[key] = _loads(data)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable content cache entry {key}: {e}")
+            return None
+        with contextlib.suppress(sqlite3.Error):
+            self._store(key, data)
+        return entry
+
+    def set(self, key: str, extraction: Dict[str, Any], vec: Any = None) -> None:
+        self._entries[key] = extraction
+        if vec is not None and self.semantic is not None:
+            self.semantic.store(self.namespace, vec, key)
+            self._vectors.append(vec)
+            self._vector_keys.append(key)
+        if self.disk_dir is None:
+            return
+        try:
+            self._store(key, _dumps(extraction))
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Failed to write content cache entry {key}: {e}")
+
+    def nearest(self, text: str) -> Tuple[Any, Optional[Dict[str, Any]]]:
+        """(embedding of text, extraction of a similar enough earlier chunk or None)."""
+        assert self.semantic is not None
+        vec, key = self.semantic.lookup(self.namespace, text)
+        return vec, (self.get(key) if key is not None else None)
+
+    def _load_vectors(self) -> None:
+        path = self._vectors_path()
+        if path is None:
+            return
+        try:
+            with np.load(path) as data:
+                vectors, keys = data["vectors"], [str(k) for k in data["keys"]]
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable semantic index {path}: {e}")
+            return
+        for vec, key in zip(vectors[-self._semantic_capacity:], keys[-self._semantic_capacity:]):
+            self.semantic.store(self.namespace, vec, key)
+            self._vectors.append(vec)
+            self._vector_keys.append(key)
+
+    def flush(self) -> None:
+        """Persist the semantic index and close the entry store (reopened if used again).
+
+        Exact entries are committed as they are set.
+        """
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+        path = self._vectors_path()
+        if path is None or not self._vectors:
+            return
+        vectors, keys = self._vectors[-self._semantic_capacity:], self._vector_keys[-self._semantic_capacity:]
+        if len({np.shape(v) for v in vectors}) != 1:
+            return  # embedder changed mid-run (model became unavailable); keep the old file
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+            np.savez(tmp, vectors=np.stack(vectors), keys=np.array(keys))
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.warning(f"Failed to write semantic index {path}: {e}")
+
+
 class KnowledgeExtractor:
     """Extract structured knowledge from documents using LLM."""
     
-    EXTRACTION_PROMPT = """You are an expert research analyst. Analyze the following text excerpt from a research paper or article and extract structured information.
+    # Extractions per group when a long document is reduced as a tree; up to
+    # twice this many are still combined by a single synthesis prompt
+    SYNTHESIS_FANOUT = 4
+    # Characters of a chunk sent for extraction (chunks from load_and_chunk_pdfs are 1000)
+    MAX_EXCERPT_CHARS = 3000
 
-TEXT:
-{text}
+    EXTRACTION_INSTRUCTIONS = "You are a research analyst extracting structured information."
+    SYNTHESIS_INSTRUCTIONS = "You are synthesizing research knowledge from multiple sources."
+
+    # Static instructions come first and the per-call text last, so providers
+    # with automatic prompt-prefix caching (Groq, Gemini, OpenAI-compatible
+    # servers) can reuse the shared prefix across calls.
+    EXTRACTION_PROMPT = """You are an expert research analyst. Analyze the text excerpt from a research paper or article given at the end and extract structured information.
 
 Extract the following information in JSON format:
 {{
@@ -72,13 +349,39 @@ Guidelines:
 - citations: Author names, paper titles, years mentioned (format: "Author (Year)")
 - summary: High-level overview of what this text is about
 
-Return ONLY valid JSON, no additional text."""
+Return ONLY valid JSON, no additional text.
+
+TEXT:
+{text}"""
+
+    BATCH_EXTRACTION_PROMPT = """You are an expert research analyst. Analyze each of the numbered text excerpts given at the end, taken from research papers or articles, and extract structured information from each one separately.
+
+Return a JSON array with exactly one object per excerpt, in the same order, each in this format:
+{{
+  "title": "Document title if mentioned, otherwise null",
+  "key_concepts": ["concept1", "concept2", ...],
+  "main_findings": ["finding1", "finding2", ...],
+  "data_points": ["statistic1", "measurement1", ...],
+  "methodologies": ["method1", "approach1", ...],
+  "citations": ["reference1", "reference2", ...],
+  "summary": "Brief 2-3 sentence summary of the content"
+}}
+
+Guidelines:
+- key_concepts: Core ideas, theories, terminology, technical terms
+- main_findings: Conclusions, results, discoveries, claims
+- data_points: Numbers, statistics, measurements, percentages, sample sizes
+- methodologies: Research methods, experimental designs, analytical approaches
+- citations: Author names, paper titles, years mentioned (format: "Author (Year)")
+- summary: High-level overview of what this text is about
+
+Return ONLY the valid JSON array, no additional text.
 
-    SYNTHESIS_PROMPT = """You are synthesizing knowledge extracted from multiple chunks of a document.
+EXCERPTS ({count}):
 
-Here are the extracted facts from different sections:
+{excerpts}"""
 
-{chunks_json}
+    SYNTHESIS_PROMPT = """You are synthesizing knowledge extracted from multiple chunks of a document. The extracted facts from different sections are given at the end.
 
 Create a comprehensive synthesis that:
 1. Combines and deduplicates information
@@ -98,17 +401,33 @@ Return a JSON object with these fields:
   "summary": "Comprehensive 3-5 sentence summary of the entire document"
 }}
 
-Return ONLY valid JSON, no additional text."""
+Return ONLY valid JSON, no additional text.
+
+EXTRACTED FACTS:
 
-    def __init__(self, llm_client: Optional[LLMClient] = None):
+{chunks_json}"""
+
+    def __init__(self, llm_client: Optional[LLMClient] = None, async_client: Optional[httpx.AsyncClient] = None):
         """Initialize the knowledge extractor.
         
         Args:
             llm_client: LLM client to use. If None, creates a new one.
+            async_client: Pooled HTTP client for the LLMClient created when
+                llm_client is None (see integrations.grok_client.new_async_client);
+                by default the shared per-loop pool is used.
         """
-        self.llm = llm_client or LLMClient()
+        self.llm = llm_client or LLMClient(async_client=async_client)
+        # EXTRACTION_PROMPT around {text}, formatted once; per chunk only the text is spliced in
+        self._extraction_head, self._extraction_tail = self.EXTRACTION_PROMPT.format(text="\0").split("\0")
         logging.info(f"KnowledgeExtractor initialized with provider: {self.llm.provider}")
     
+    def _excerpt(self, chunk: DocChunk) -> str:
+        text = chunk.page_content
+        return text if len(text) <= self.MAX_EXCERPT_CHARS else text[:self.MAX_EXCERPT_CHARS]
+
+    def _extraction_prompt(self, chunk: DocChunk) -> str:
+        return "".join((self._extraction_head, self._excerpt(chunk), self._extraction_tail))
+
     def extract_from_chunk(self, chunk: DocChunk) -> Dict[str, Any]:
         """Extract knowledge from a single document chunk.
         
@@ -118,30 +437,179 @@ Return ONLY valid JSON, no additional text."""
         Returns:
             Dictionary with extracted knowledge
         """
-        prompt = self.EXTRACTION_PROMPT.format(text=chunk.page_content[:3000])
-        
         try:
             content, _, _ = self.llm.generate(
-                instructions="You are a research analyst extracting structured information.",
-                prompt=prompt
+                instructions=self.EXTRACTION_INSTRUCTIONS,
+                prompt=self._extraction_prompt(chunk)
             )
-            
-            # Try to parse JSON from response
-            content = content.strip()
-            
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                lines = content.split("\n")
-                # Remove first and last lines (``` markers)
-                content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
-                content = content.replace("```json", "").replace("```", "").strip()
-            
-            extracted = json.loads(content)
-            extracted["source"] = chunk.metadata.get("source", "unknown")
-            extracted["chunk_id"] = chunk.metadata.get("chunk_id", "")
-            return extracted
-            
-        except json.JSONDecodeError as e:
+            return self._parse_extraction(chunk, content)[0]
+        except Exception as e:
+            return self._extraction_error(chunk, e)
+
+    async def extract_from_chunk_async(
+        self, chunk: DocChunk, content_cache: Optional[ContentCache] = None
+    ) -> Dict[str, Any]:
+        """Async variant of extract_from_chunk() over the client's pooled AsyncClient.
+
+        With content_cache, chunks whose text was already extracted (earlier
+        in this run or in a previous run) reuse that extraction instead of
+        calling the LLM again; identical chunks in flight share one call.
+        """
+        if content_cache is None:
+            return (await self._extract_async(chunk))[0]
+        key = content_cache.key(self._excerpt(chunk))
+        hit = content_cache.get(key)
+        if hit is None:
+            task = content_cache.pending.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._extract_into(content_cache, key, chunk))
+                content_cache.pending[key] = task
+                task.add_done_callback(lambda _t: content_cache.pending.pop(key, None))
+            hit, _ = await asyncio.shield(task)
+        else:
+            logging.info(f"  Reusing extraction for identical text in {chunk.metadata.get('chunk_id')}")
+        return dict(hit, source=chunk.metadata.get("source", "unknown"), chunk_id=chunk.metadata.get("chunk_id", ""))
+
+    def extract_from_chunks_batched(self, chunks: List[DocChunk], batch_size: int = 8) -> List[Dict[str, Any]]:
+        """Extract knowledge from several chunks with one LLM request per batch_size chunks.
+
+        The extraction instructions and request overhead are paid once per
+        batch instead of once per chunk. A batch whose response is not a JSON
+        array of one object per excerpt falls back to per-chunk requests.
+
+        Returns:
+            One extraction dictionary per chunk, in input order
+        """
+        results: List[Dict[str, Any]] = []
+        for start in range(0, len(chunks), max(1, batch_size)):
+            batch = chunks[start:start + max(1, batch_size)]
+            parsed = None
+            if len(batch) > 1:
+                try:
+                    content, _, _ = self.llm.generate(
+                        instructions=self.EXTRACTION_INSTRUCTIONS, prompt=self._batch_prompt(batch)
+                    )
+                    parsed = self._parse_batch(batch, content)
+                except Exception as e:
+                    logging.warning(f"Batched extraction failed, retrying per chunk: {e}")
+            results.extend(parsed if parsed is not None else [self.extract_from_chunk(c) for c in batch])
+        return results
+
+    async def extract_from_chunks_batched_async(
+        self, chunks: List[DocChunk], content_cache: Optional[ContentCache] = None
+    ) -> List[Dict[str, Any]]:
+        """Async, single-request variant of extract_from_chunks_batched() for one batch.
+
+        With content_cache, cached chunks are answered from it and only the
+        rest are sent; their clean extractions are stored for reuse.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(chunks)
+        misses: List[int] = []
+        keys: List[Optional[str]] = [None] * len(chunks)
+        for i, chunk in enumerate(chunks):
+            if content_cache is not None:
+                keys[i] = content_cache.key(self._excerpt(chunk))
+                hit = content_cache.get(keys[i])
+                if hit is not None:
+                    results[i] = dict(hit, source=chunk.metadata.get("source", "unknown"), chunk_id=chunk.metadata.get("chunk_id", ""))
+                    continue
+            misses.append(i)
+
+        batch = [chunks[i] for i in misses]
+        parsed = None
+        if len(batch) > 1:
+            try:
+                content, _, _ = await self.llm.agenerate(
+                    instructions=self.EXTRACTION_INSTRUCTIONS, prompt=self._batch_prompt(batch)
+                )
+                parsed = self._parse_batch(batch, content)
+            except Exception as e:
+                logging.warning(f"Batched extraction failed, retrying per chunk: {e}")
+        if parsed is None:
+            parsed = list(await asyncio.gather(
+                *(self.extract_from_chunk_async(c, content_cache) for c in batch)
+            ))
+        elif content_cache is not None:
+            for i, extracted in zip(misses, parsed):
+                content_cache.set(keys[i], {k: v for k, v in extracted.items() if k not in ("source", "chunk_id")})
+        for i, extracted in zip(misses, parsed):
+            results[i] = extracted
+        return results  # type: ignore[return-value]
+
+    def _batch_prompt(self, chunks: List[DocChunk]) -> str:
+        excerpts = "\n\n".join(
+            f"=== EXCERPT {n} ===\n{self._excerpt(c)}" for n, c in enumerate(chunks, 1)
+        )
+        return self.BATCH_EXTRACTION_PROMPT.format(count=len(chunks), excerpts=excerpts)
+
+    def _parse_batch(self, chunks: List[DocChunk], content: str) -> Optional[List[Dict[str, Any]]]:
+        """Per-chunk extractions from a batched response, or None if it does not line up."""
+        try:
+            items = _loads(self._strip_code_fence(content))
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
+            logging.warning(f"Failed to parse JSON array from batched LLM response: {e}")
+            return None
+        if not isinstance(items, list) or len(items) != len(chunks) or not all(isinstance(x, dict) for x in items):
+            logging.warning(f"Batched LLM response did not return {len(chunks)} extraction objects")
+            return None
+        for item, chunk in zip(items, chunks):
+            item["source"] = chunk.metadata.get("source", "unknown")
+            item["chunk_id"] = chunk.metadata.get("chunk_id", "")
+        return items
+
+    async def _extract_into(
+        self, content_cache: ContentCache, key: str, chunk: DocChunk
+    ) -> Tuple[Dict[str, Any], bool]:
+        """Extract chunk (or reuse a near-duplicate's extraction) and record it under key."""
+        vec = None
+        if content_cache.semantic is not None:
+            # Embedding may run a local model; keep it off the event loop
+            vec, near = await asyncio.to_thread(content_cache.nearest, self._excerpt(chunk))
+            if near is not None:
+                logging.info(f"  Reusing extraction of a near-duplicate chunk for {chunk.metadata.get('chunk_id')}")
+                content_cache.set(key, near)
+                return near, True
+        extracted, cacheable = await self._extract_async(chunk)
+        if not cacheable:
+            return extracted, False
+        hit = {k: v for k, v in extracted.items() if k not in ("source", "chunk_id")}
+        content_cache.set(key, hit, vec)
+        return hit, True
+
+    async def _extract_async(self, chunk: DocChunk) -> Tuple[Dict[str, Any], bool]:
+        """(extraction, whether it parsed cleanly and may be reused)."""
+        try:
+            content, _, _ = await self.llm.agenerate(
+                instructions=self.EXTRACTION_INSTRUCTIONS,
+                prompt=self._extraction_prompt(chunk)
+            )
+            return self._parse_extraction(chunk, content)
+        except Exception as e:
+            return self._extraction_error(chunk, e), False
+
+    def _extraction_namespace(self) -> str:
+        """Digest of everything besides the text that determines an extraction."""
+        src = "\0".join((
+            self.llm.provider, self.llm.model, repr(self.llm.temperature),
+            self.EXTRACTION_INSTRUCTIONS, self.EXTRACTION_PROMPT,
+        ))
+        return hashlib.sha256(src.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _strip_code_fence(content: str) -> str:
+        """The JSON payload of a response: a fenced block's body, else the outermost object or array."""
+        m = _JSON_PAYLOAD_RE.search(content)
+        if m is None:
+            return content.strip()
+        return m.group(1) if m.group(1) is not None else m.group(2)
+
+    def _parse_extraction(self, chunk: DocChunk, content: str) -> Tuple[Dict[str, Any], bool]:
+        """Turn an extraction response into (dict, True), or (empty structure, False) if it is not JSON."""
+        # Try to parse JSON from response
+        content = self._strip_code_fence(content)
+        try:
+            extracted = _loads(content)
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
             logging.warning(f"Failed to parse JSON from LLM response for chunk {chunk.metadata.get('chunk_id')}: {e}")
             logging.debug(f"Raw response: {content[:200]}...")
             # Return empty structure
@@ -154,18 +622,29 @@ Return ONLY valid JSON, no additional text."""
                 "methodologies": [],
                 "citations": [],
                 "summary": content[:200] if content else ""
-            }
-        except Exception as e:
-            logging.error(f"Error extracting from chunk: {e}")
-            return {
-                "source": chunk.metadata.get("source", "unknown"),
-                "chunk_id": chunk.metadata.get("chunk_id", ""),
-                "error": str(e)
-            }
+            }, False
+        extracted["source"] = chunk.metadata.get("source", "unknown")
+        extracted["chunk_id"] = chunk.metadata.get("chunk_id", "")
+        return extracted, True
+
+    @staticmethod
+    def _extraction_error(chunk: DocChunk, e: Exception) -> Dict[str, Any]:
+        logging.error(f"Error extracting from chunk: {e}")
+        return {
+            "source": chunk.metadata.get("source", "unknown"),
+            "chunk_id": chunk.metadata.get("chunk_id", ""),
+            "error": str(e)
+        }
     
     def synthesize_extractions(self, extractions: List[Dict[str, Any]], source: str) -> ExtractedKnowledge:
         """Synthesize multiple chunk extractions into unified knowledge.
         
+        More than 2 * SYNTHESIS_FANOUT extractions are reduced as a tree:
+        balanced groups of at most SYNTHESIS_FANOUT are synthesized on their
+        own and the partial syntheses are synthesized again, so no prompt
+        carries more than 2 * SYNTHESIS_FANOUT extractions however long the
+        document is. Fewer take the single call they always did.
+        
         Args:
             extractions: List of extraction dictionaries from chunks
             source: Source document name
@@ -173,96 +652,198 @@ Return ONLY valid JSON, no additional text."""
         Returns:
             Unified ExtractedKnowledge object
         """
-        if not extractions:
-            return ExtractedKnowledge(source=source)
+        if len(extractions) <= 1:
+            return self._knowledge_from(extractions[0] if extractions else None, source)
+        if len(extractions) > 2 * self.SYNTHESIS_FANOUT:
+            partial = [self.synthesize_extractions(group, source) for group in self._fanout_groups(extractions)]
+            return self.synthesize_extractions([vars(k) for k in partial], source)
         
-        # If only one extraction, convert directly
-        if len(extractions) == 1:
-            ext = extractions[0]
-            return ExtractedKnowledge(
-                source=source,
-                title=ext.get("title"),
-                key_concepts=ext.get("key_concepts", []),
-                main_findings=ext.get("main_findings", []),
-                data_points=ext.get("data_points", []),
-                methodologies=ext.get("methodologies", []),
-                citations=ext.get("citations", []),
-                summary=ext.get("summary")
-            )
+        reason = self._direct_merge_reason(extractions)
+        if reason:
+            logging.info(f"Merging {len(extractions)} extractions for {source} without LLM synthesis: {reason}")
+            return self._simple_synthesis(extractions, source)
         
         # Multiple extractions - use LLM to synthesize
-        chunks_json = json.dumps(extractions, indent=2)
-        prompt = self.SYNTHESIS_PROMPT.format(chunks_json=chunks_json)
-        
         try:
             content, _, _ = self.llm.generate(
-                instructions="You are synthesizing research knowledge from multiple sources.",
-                prompt=prompt
-            )
-            
-            # Clean and parse
-            content = content.strip()
-            if content.startswith("```"):
-                lines = content.split("\n")
-                content = "\n".join(lines[1:-1]) if len(lines) > 2 else content
-                content = content.replace("```json", "").replace("```", "").strip()
-            
-            synthesized = json.loads(content)
-            return ExtractedKnowledge(
-                source=source,
-                title=synthesized.get("title"),
-                key_concepts=synthesized.get("key_concepts", []),
-                main_findings=synthesized.get("main_findings", []),
-                data_points=synthesized.get("data_points", []),
-                methodologies=synthesized.get("methodologies", []),
-                citations=synthesized.get("citations", []),
-                summary=synthesized.get("summary")
+                instructions=self.SYNTHESIS_INSTRUCTIONS,
+                prompt=self._synthesis_prompt(extractions)
             )
-            
+            return self._knowledge_from(_loads(self._strip_code_fence(content)), source)
         except Exception as e:
             logging.error(f"Error synthesizing extractions: {e}")
             # Fallback: simple concatenation
             return self._simple_synthesis(extractions, source)
+
+    async def synthesize_extractions_async(
+        self,
+        extractions: List[Dict[str, Any]],
+        source: str,
+        slots: Optional[asyncio.Semaphore] = None
+    ) -> ExtractedKnowledge:
+        """Async variant of synthesize_extractions(); sibling groups are synthesized concurrently.
+
+        Each LLM call holds one of slots, when given, for its duration.
+        """
+        if len(extractions) <= 1:
+            return self._knowledge_from(extractions[0] if extractions else None, source)
+        if len(extractions) > 2 * self.SYNTHESIS_FANOUT:
+            partial = await asyncio.gather(*(
+                self.synthesize_extractions_async(group, source, slots)
+                for group in self._fanout_groups(extractions)
+            ))
+            return await self.synthesize_extractions_async([vars(k) for k in partial], source, slots)
+        reason = self._direct_merge_reason(extractions)
+        if reason:
+            logging.info(f"Merging {len(extractions)} extractions for {source} without LLM synthesis: {reason}")
+            return self._simple_synthesis(extractions, source)
+        try:
+            async with slots or contextlib.nullcontext():
+                content, _, _ = await self.llm.agenerate(
+                    instructions=self.SYNTHESIS_INSTRUCTIONS,
+                    prompt=self._synthesis_prompt(extractions)
+                )
+            return self._knowledge_from(_loads(self._strip_code_fence(content)), source)
+        except Exception as e:
+            logging.error(f"Error synthesizing extractions: {e}")
+            return self._simple_synthesis(extractions, source)
+
+    @staticmethod
+    def _direct_merge_reason(extractions: List[Dict[str, Any]]) -> Optional[str]:
+        """Why a rule-based merge is enough for these extractions, or None to synthesize with the LLM.
+
+        Little content, or chunks that mostly name the same key concepts,
+        leave the model nothing to consolidate that deduplication does not.
+        This is on by default (see the module docstring).
+        """
+        max_tokens, min_jaccard = _direct_merge_limits()
+        if max_tokens > 0:
+            tokens = count_tokens(KnowledgeExtractor._synthesis_payload(extractions))
+            if tokens <= max_tokens:
+                return f"{tokens} tokens <= {max_tokens}"
+        concept_sets = [
+            {c.casefold() for c in ext.get("key_concepts") or () if isinstance(c, str)}
+            for ext in extractions
+        ]
+        union = set().union(*concept_sets)
+        if union and min_jaccard <= 1:
+            jaccard = len(set.intersection(*concept_sets)) / len(union)
+            if jaccard >= min_jaccard:
+                return f"key_concepts Jaccard {jaccard:.2f} >= {min_jaccard}"
+        return None
+
+    def _fanout_groups(self, extractions: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """extractions split into the fewest groups of at most SYNTHESIS_FANOUT, sizes differing by at most one."""
+        k = max(2, self.SYNTHESIS_FANOUT)
+        n_groups = -(-len(extractions) // k)
+        size, extra = divmod(len(extractions), n_groups)
+        groups, start = [], 0
+        for i in range(n_groups):
+            end = start + size + (i < extra)
+            groups.append(extractions[start:end])
+            start = end
+        return groups
+
+    @staticmethod
+    def _synthesis_payload(extractions: List[Dict[str, Any]]) -> str:
+        """Compact JSON of the extractions as the synthesis prompt carries them.
+
+        No indentation, which roughly doubles the tokens, and no empty fields or
+        source/chunk_id bookkeeping, which give the model nothing to synthesize.
+        """
+        return _dumps([
+            {k: v for k, v in ext.items() if v and k not in ("source", "chunk_id")}
+            for ext in extractions
+        ]).decode("utf-8")
+
+    def _synthesis_prompt(self, extractions: List[Dict[str, Any]]) -> str:
+        return self.SYNTHESIS_PROMPT.format(chunks_json=self._synthesis_payload(extractions))
+
+    @staticmethod
+    def _knowledge_from(data: Optional[Dict[str, Any]], source: str) -> ExtractedKnowledge:
+        """ExtractedKnowledge from a single extraction or a synthesis response."""
+        if data is None:
+            return ExtractedKnowledge(source=source)
+        return ExtractedKnowledge(
+            source=source,
+            title=data.get("title"),
+            key_concepts=data.get("key_concepts", []),
+            main_findings=data.get("main_findings", []),
+            data_points=data.get("data_points", []),
+            methodologies=data.get("methodologies", []),
+            citations=data.get("citations", []),
+            summary=data.get("summary")
+        )
     
     def _simple_synthesis(self, extractions: List[Dict[str, Any]], source: str) -> ExtractedKnowledge:
-        """Fallback: simple concatenation without LLM synthesis."""
-        all_concepts = []
-        all_findings = []
-        all_data = []
-        all_methods = []
-        all_citations = []
+        """Fallback: simple concatenation without LLM synthesis.
+
+        Items are deduplicated case-insensitively as they are collected; the
+        first spelling seen is kept and first-seen order is preserved.
+        """
+        fields = ("key_concepts", "main_findings", "data_points", "methodologies", "citations")
+        unique: Dict[str, Dict[Any, Any]] = {field: {} for field in fields}
         summaries = []
+        title = None
         
         for ext in extractions:
-            all_concepts.extend(ext.get("key_concepts", []))
-            all_findings.extend(ext.get("main_findings", []))
-            all_data.extend(ext.get("data_points", []))
-            all_methods.extend(ext.get("methodologies", []))
-            all_citations.extend(ext.get("citations", []))
+            title = title or ext.get("title")
+            for field in fields:
+                seen = unique[field]
+                for item in ext.get(field) or ():
+                    seen.setdefault(item.casefold() if isinstance(item, str) else repr(item), item)
             if ext.get("summary"):
                 summaries.append(ext["summary"])
         
-        # Deduplicate
         return ExtractedKnowledge(
             source=source,
-            key_concepts=list(set(all_concepts)),
-            main_findings=list(set(all_findings)),
-            data_points=list(set(all_data)),
-            methodologies=list(set(all_methods)),
-            citations=list(set(all_citations)),
+            title=title,
+            key_concepts=list(unique["key_concepts"].values()),
+            main_findings=list(unique["main_findings"].values()),
+            data_points=list(unique["data_points"].values()),
+            methodologies=list(unique["methodologies"].values()),
+            citations=list(unique["citations"].values()),
             summary=" | ".join(summaries[:3]) if summaries else None
         )
     
     def process_document(
         self,
         chunks: List[DocChunk],
-        max_chunks: Optional[int] = None
+        max_chunks: Optional[int] = None,
+        concurrency: int = 4,
+        batch_size: int = 1
     ) -> ExtractedKnowledge:
         """Process all chunks from a document and extract unified knowledge.
         
         Args:
             chunks: List of chunks from the same document
             max_chunks: Maximum number of chunks to process (None = all)
+            concurrency: Maximum LLM calls in flight at once
+            batch_size: Chunks sent per extraction request (1 = one request per chunk)
+            
+        Returns:
+            Unified ExtractedKnowledge
+        """
+        return asyncio.run(self.aprocess_document(chunks, max_chunks, concurrency, batch_size=batch_size))
+
+    async def aprocess_document(
+        self,
+        chunks: List[DocChunk],
+        max_chunks: Optional[int] = None,
+        concurrency: int = 4,
+        slots: Optional[asyncio.Semaphore] = None,
+        content_cache: Optional[ContentCache] = None,
+        batch_size: int = 1
+    ) -> ExtractedKnowledge:
+        """Async process_document(): chunk extractions run concurrently.
+        
+        Args:
+            chunks: List of chunks from the same document
+            max_chunks: Maximum number of chunks to process (None = all)
+            concurrency: Maximum LLM calls in flight at once (ignored when slots is given)
+            slots: Semaphore shared with other documents' calls
+            content_cache: Reuse extractions of identical chunk text (see ContentCache)
+            batch_size: Chunks sent per extraction request (1 = one request per chunk)
             
         Returns:
             Unified ExtractedKnowledge
@@ -275,22 +856,41 @@ Return ONLY valid JSON, no additional text."""
         
         # Limit chunks if specified
         chunks_to_process = chunks[:max_chunks] if max_chunks else chunks
+        slots = slots or asyncio.Semaphore(max(1, concurrency))
+
+        async def extract(i: int, chunk: DocChunk) -> Dict[str, Any]:
+            async with slots:
+                logging.info(f"  Extracting from {source} chunk {i+1}/{len(chunks_to_process)}")
+                return await self.extract_from_chunk_async(chunk, content_cache)
+
+        async def extract_batch(start: int, batch: List[DocChunk]) -> List[Dict[str, Any]]:
+            async with slots:
+                logging.info(f"  Extracting from {source} chunks {start+1}-{start+len(batch)}/{len(chunks_to_process)}")
+                return await self.extract_from_chunks_batched_async(batch, content_cache)
+
+        # gather() keeps chunk order, so the synthesis prompt is unchanged
+        if batch_size > 1:
+            batches = await asyncio.gather(*(
+                extract_batch(start, chunks_to_process[start:start + batch_size])
+                for start in range(0, len(chunks_to_process), batch_size)
+            ))
+            extractions = [e for batch in batches for e in batch]
+        else:
+            extractions = list(await asyncio.gather(
+                *(extract(i, chunk) for i, chunk in enumerate(chunks_to_process))
+            ))
         
-        extractions = []
-        for i, chunk in enumerate(chunks_to_process):
-            logging.info(f"  Extracting from chunk {i+1}/{len(chunks_to_process)}")
-            extraction = self.extract_from_chunk(chunk)
-            extractions.append(extraction)
-        
-        logging.info(f"  Synthesizing {len(extractions)} extractions")
-        knowledge = self.synthesize_extractions(extractions, source)
-        return knowledge
+        logging.info(f"  Synthesizing {len(extractions)} extractions for {source}")
+        return await self.synthesize_extractions_async(extractions, source, slots)
     
     def process_directory(
         self,
         articles_dir: str = "articles",
         max_chunks_per_doc: Optional[int] = 5,
-        cache_dir: Optional[str] = None
+        cache_dir: Optional[str] = None,
+        concurrency: int = 4,
+        max_documents: int = 4,
+        batch_size: int = 1
     ) -> List[ExtractedKnowledge]:
         """Process all PDFs in a directory and extract knowledge.
         
@@ -298,60 +898,104 @@ Return ONLY valid JSON, no additional text."""
             articles_dir: Directory containing PDF files
             max_chunks_per_doc: Max chunks to process per document
             cache_dir: Directory to cache results (None = no caching)
+            concurrency: Maximum LLM calls in flight at once, across all documents
+            max_documents: Maximum documents being processed at once
+            batch_size: Chunks sent per extraction request (1 = one request per chunk)
             
         Returns:
             List of ExtractedKnowledge objects, one per document
         """
+        return asyncio.run(
+            self.aprocess_directory(
+                articles_dir, max_chunks_per_doc, cache_dir, concurrency, max_documents, batch_size
+            )
+        )
+
+    async def aprocess_directory(
+        self,
+        articles_dir: str = "articles",
+        max_chunks_per_doc: Optional[int] = 5,
+        cache_dir: Optional[str] = None,
+        concurrency: int = 4,
+        max_documents: int = 4,
+        batch_size: int = 1
+    ) -> List[ExtractedKnowledge]:
+        """Async process_directory() with two tiers of parallelism.
+
+        Up to max_documents documents are in progress at once, and their
+        chunk and synthesis calls share a separate limit of concurrency LLM
+        calls. Admitting only a few documents lets each one finish (and be
+        cached) early, instead of every document holding a partial result.
+        """
         logging.info(f"Loading PDFs from {articles_dir}")
-        all_chunks = load_and_chunk_pdfs(files_dir=articles_dir)
+        docs_chunks = await asyncio.to_thread(load_and_chunk_pdfs_by_source, files_dir=articles_dir)
         
-        if not all_chunks:
+        if not docs_chunks:
             logging.warning(f"No chunks loaded from {articles_dir}")
             return []
         
-        # Group chunks by source document
-        docs_chunks: Dict[str, List[DocChunk]] = {}
-        for chunk in all_chunks:
-            source = chunk.metadata.get("source", "unknown")
-            if source not in docs_chunks:
-                docs_chunks[source] = []
-            docs_chunks[source].append(chunk)
-        
-        logging.info(f"Found {len(docs_chunks)} documents with {len(all_chunks)} total chunks")
+        logging.info(f"Found {len(docs_chunks)} documents with {sum(map(len, docs_chunks.values()))} total chunks")
         
-        # Process each document
-        results = []
-        for source, chunks in docs_chunks.items():
+        slots = asyncio.Semaphore(max(1, concurrency))
+        doc_slots = asyncio.Semaphore(max(1, max_documents))
+        # Shared by all documents so repeated text across papers is extracted once
+        semantic = os.getenv("EXTRACTION_SEMANTIC_CACHE", "false").lower() == "true"
+        content_cache = ContentCache(
+            Path(cache_dir) / "content" if cache_dir else None,
+            namespace=self._extraction_namespace(),
+            semantic_threshold=_env_number("EXTRACTION_SEMANTIC_THRESHOLD", 0.9) if semantic else None,
+        )
+
+        made_dirs: set = set()  # cache shard directories already created this run
+
+        async def _process_one(source: str, chunks: List[DocChunk]) -> ExtractedKnowledge:
+            async with doc_slots:
+                return await _process_document(source, chunks)
+
+        async def _process_document(source: str, chunks: List[DocChunk]) -> ExtractedKnowledge:
             # Check cache first
             if cache_dir:
-                cache_path = Path(cache_dir) / f"{source}.json"
-                if cache_path.exists():
-                    logging.info(f"Loading cached knowledge for {source}")
+                cache_path = _document_cache_path(cache_dir, source)
+                # Open directly rather than exists() first: one lookup per document
+                try:
                     try:
-                        with open(cache_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            knowledge = ExtractedKnowledge(**data)
-                            results.append(knowledge)
-                            continue
-                    except Exception as e:
-                        logging.warning(f"Failed to load cache for {source}: {e}")
+                        raw = cache_path.read_bytes()
+                    except FileNotFoundError:
+                        raw = _adopt_flat_cache_file(cache_dir, source, cache_path)
+                    data = _loads(raw)
+                    logging.info(f"Loaded cached knowledge for {source}")
+                    return ExtractedKnowledge(**data)
+                except FileNotFoundError:
+                    pass
+                except Exception as e:
+                    logging.warning(f"Failed to load cache for {source}: {e}")
             
             # Extract knowledge
-            knowledge = self.process_document(chunks, max_chunks=max_chunks_per_doc)
-            results.append(knowledge)
+            knowledge = await self.aprocess_document(
+                chunks, max_chunks=max_chunks_per_doc, slots=slots, content_cache=content_cache,
+                batch_size=batch_size
+            )
             
             # Save to cache
             if cache_dir:
-                Path(cache_dir).mkdir(parents=True, exist_ok=True)
-                cache_path = Path(cache_dir) / f"{source}.json"
+                cache_path = _document_cache_path(cache_dir, source)
                 try:
-                    with open(cache_path, 'w', encoding='utf-8') as f:
-                        json.dump(asdict(knowledge), f, indent=2)
+                    if cache_path.parent not in made_dirs:
+                        cache_path.parent.mkdir(parents=True, exist_ok=True)
+                        made_dirs.add(cache_path.parent)
+                    _write_atomic(cache_path, _dumps(knowledge, indent=True))
                     logging.info(f"Cached knowledge to {cache_path}")
                 except Exception as e:
                     logging.warning(f"Failed to cache {source}: {e}")
-        
-        return results
+            return knowledge
+
+        # Process each document; results keep directory order
+        try:
+            return list(await asyncio.gather(
+                *(_process_one(source, chunks) for source, chunks in docs_chunks.items())
+            ))
+        finally:
+            content_cache.flush()
 
 
 def save_knowledge_base(knowledge_list: List[ExtractedKnowledge], output_path: str):
@@ -361,10 +1005,26 @@ def save_knowledge_base(knowledge_list: List[ExtractedKnowledge], output_path: s
         knowledge_list: List of ExtractedKnowledge objects
         output_path: Path to output JSON file
     """
-    data = [asdict(k) for k in knowledge_list]
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    logging.info(f"Saved knowledge base to {output_path} ({len(data)} documents)")
+    _write_atomic(Path(output_path), _dumps(knowledge_list, indent=True))
+    logging.info(f"Saved knowledge base to {output_path} ({len(knowledge_list)} documents)")
+
+
+def iter_knowledge_base(input_path: str) -> Iterator[ExtractedKnowledge]:
+    """Yield the documents of a knowledge-base JSON file one at a time.
+    
+    With ijson installed the file is parsed incrementally, so only one
+    document is in memory at once; otherwise it is parsed in one go.
+    
+    Args:
+        input_path: Path to input JSON file
+    """
+    if ijson is None:
+        for item in _loads(Path(input_path).read_bytes()):
+            yield ExtractedKnowledge(**item)
+        return
+    with open(input_path, "rb") as f:
+        for item in ijson.items(f, "item", use_float=True):
+            yield ExtractedKnowledge(**item)
 
 
 def load_knowledge_base(input_path: str) -> List[ExtractedKnowledge]:
@@ -376,6 +1036,4 @@ def load_knowledge_base(input_path: str) -> List[ExtractedKnowledge]:
     Returns:
         List of ExtractedKnowledge objects
     """
-    with open(input_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    return [ExtractedKnowledge(**item) for item in data]
+    return list(iter_knowledge_base(input_path))
@@ -40,6 +40,24 @@ def main():
         default=5,
         help="Maximum chunks to process per document (default: 5)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum LLM extraction calls in flight at once (default: 4)"
+    )
+    parser.add_argument(
+        "--max-documents",
+        type=int,
+        default=4,
+        help="Maximum documents processed at once (default: 4)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Chunks sent per extraction request (default: 1)"
+    )
     parser.add_argument(
         "--cache-dir",
         type=str,
@@ -125,6 +143,8 @@ def main():
     print(f"Articles directory: {args.articles_dir}")
     print(f"Output file: {args.output}")
     print(f"Max chunks per document: {args.max_chunks}")
+    print(f"Concurrency: {args.concurrency} calls, {args.max_documents} documents")
+    print(f"Chunks per extraction request: {args.batch_size}")
     print(f"Cache directory: {args.cache_dir if not args.no_cache else 'disabled'}")
     print()
     
@@ -151,7 +171,10 @@ def main():
         knowledge_list = extractor.process_directory(
             articles_dir=args.articles_dir,
             max_chunks_per_doc=args.max_chunks,
-            cache_dir=cache_dir
+            cache_dir=cache_dir,
+            concurrency=args.concurrency,
+            max_documents=args.max_documents,
+            batch_size=args.batch_size
         )
         
         if not knowledge_list:
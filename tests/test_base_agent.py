@@ -0,0 +1,72 @@
+"""Tests for BaseAgent's shared provider calls.
+
+Run with: python -m unittest discover tests
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import unittest
+from typing import List
+from unittest import mock
+
+from agents import base_agent
+from agents._env import ProviderEnv
+from agents.base_agent import AgentConfig, BaseAgent
+
+
+class _EchoAgent(BaseAgent):
+    def role_prompt(self) -> str:
+        return self.config.instructions
+
+
+class _StreamingClient:
+    """Streams a fixed reply in pieces, counting the calls it serves."""
+
+    PIECES = ("Shared ", "streamed ", "reply")
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def agenerate_streamed(self, instructions: str, prompt: str, on_delta):
+        self.calls += 1
+        for piece in self.PIECES:
+            await asyncio.sleep(0.01)
+            on_delta(piece)
+        return "".join(self.PIECES), ["https://example.org/paper"], 0.9
+
+
+class CoalescedStreamingTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch.dict(os.environ, {"LLM_PROVIDER": "groq", "LLM_CACHE": "false"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(ProviderEnv.refresh)
+        ProviderEnv.refresh()
+
+    async def test_concurrent_streaming_callers_all_receive_deltas(self) -> None:
+        client = _StreamingClient()
+        agent = _EchoAgent(AgentConfig(role_name="Reader", instructions="Summarize."))
+        leader: List[str] = []
+        follower: List[str] = []
+
+        async def join_late():
+            await asyncio.sleep(0.015)  # after the first piece has streamed
+            return await agent.asend("same prompt", on_delta=follower.append)
+
+        with mock.patch.object(base_agent, "_shared_llm_client", return_value=client):
+            first, second = await asyncio.gather(
+                agent.asend("same prompt", on_delta=leader.append),
+                join_late(),
+            )
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(leader, list(_StreamingClient.PIECES))
+        self.assertEqual(follower, list(_StreamingClient.PIECES))
+        self.assertEqual(first.content, "Shared streamed reply")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second.citations, ["https://example.org/paper"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+"""Tests for LLMClient's streamed completions.
+
+Run with: python -m unittest discover tests
+"""
+from __future__ import annotations
+
+import unittest
+from typing import List
+from unittest import mock
+
+from integrations.grok_client import LLMClient
+
+
+class StreamedCompletionTest(unittest.IsolatedAsyncioTestCase):
+    async def test_streamed_reply_keeps_citations_and_confidence(self) -> None:
+        events = [
+            {"choices": [{"delta": {"content": "Evidence "}}], "citations": ["https://example.org/a"]},
+            {"choices": [{"delta": {"content": "found."}}], "citations": ["https://example.org/a"]},
+            {"choices": [{"delta": {}}], "confidence": "0.6"},
+        ]
+
+        async def fake_events(instructions: str, prompt: str):
+            for event in events:
+                yield event
+
+        client = LLMClient.__new__(LLMClient)
+        client.provider = "groq"
+        deltas: List[str] = []
+        with mock.patch.object(client, "_astream_events", fake_events):
+            result = await client.agenerate_streamed("Summarize.", "prompt", deltas.append)
+
+        self.assertEqual(deltas, ["Evidence ", "found."])
+        self.assertEqual(result, ("Evidence found.", ["https://example.org/a"], 0.6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,96 +3,135 @@ Animated graph builder that automatically creates an animation replay
 showing the progression of agent conversations.
 """
 import json
+import re
 from typing import Dict, List, Any
 
+from visualization.templates import PageTemplate
+from visualization.trace_stream import TraceSource, open_trace
 
-def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
-    """
-    Build an HTML page with automatic animation of the agent conversation flow.
-    Shows agents appearing one by one and messages flowing between them.
-    """
-    # Extract messages from turns structure
-    messages = []
-    turns = trace_data.get('turns', [])
-    for turn in turns:
-        turn_messages = turn.get('messages', [])
-        messages.extend(turn_messages)
-    
-    run_id = trace_data.get('run_id', 'unknown')
-    topic = trace_data.get('topic', 'Research Topic')
-    
-    # Extract agent sequence and debate info
-    agent_sequence = []
-    debate_exchanges = []
-    
-    for msg in messages:
-        role = msg.get('role', '')
-        content = msg.get('content', '')
-        
-        if '[DEBATE' in content:
-            # Parse debate info
-            import re
-            match = re.search(r'\[DEBATE ([^|]+)\|([^|]+)\|', content)
-            if match:
-                transition = match.group(1).strip()
-                speaker = match.group(2).strip()
-                debate_exchanges.append({
-                    'transition': transition,
-                    'speaker': speaker,
-                    'role': role
-                })
+try:  # optional, faster serialization of the embedded animation data
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# "[DEBATE <transition>|<speaker>|..." marker that opens a debate message
+_DEBATE_RE = re.compile(r'\[DEBATE ([^|]+)\|([^|]+)\|')
+
+# Above this many steps the per-step diagram sources are built in the browser
+# instead, so long runs do not embed a quadratic amount of Mermaid text
+MAX_PREBUILT_STEPS = 200
+
+# Debate edges drawn per step; older ones collapse into a single placeholder
+# node so long runs keep the diagram small enough for Mermaid to lay out
+MAX_VISIBLE_DEBATES = 20
+
+# Mirrors the client-side colors table
+_AGENT_COLORS = {
+    'reader': '#3b82f6',
+    'critic': '#ef4444',
+    'synthesizer': '#10b981',
+    'verifier': '#f59e0b',
+    'followup': '#8b5cf6',
+}
+
+# Node styles are declared once as classes at the top of every step's diagram
+# and nodes refer to them by name with :::
+_CLASS_DEFS = [
+    f'    classDef {cls} fill:{color},stroke:#333,stroke-width:2px,color:#fff'
+    for cls, color in [*((f'{key}Style', c) for key, c in _AGENT_COLORS.items()), ('agentStyle', '#64748b')]
+]
+
+
+def _step_sources(agent_sequence: List[str], debate_exchanges: List[Dict[str, Any]]) -> List[str]:
+    """Mermaid source of every animation step, as buildSource() in the page builds it."""
+    agent_lines: List[List[str]] = []
+    prev_key = None
+    for agent in agent_sequence:
+        key = agent.lower().replace(' ', '', 1)
+        cls = f'{key}Style' if key in _AGENT_COLORS else 'agentStyle'
+        lines = [f'    {key}["{agent}"]:::{cls}']
+        if prev_key is not None:
+            lines.append(f'    {prev_key} --> {key}')
+        agent_lines.append(lines)
+        prev_key = key
+    debate_lines: List[List[str]] = []
+    for idx, debate in enumerate(debate_exchanges):
+        parts = [p.strip() for p in debate['transition'].split('->')]
+        if len(parts) == 2:
+            debate_lines.append([f'    {parts[0].lower()} -.->|"debate {idx + 1}"| {parts[1].lower()}'])
         else:
-            # Regular agent message
-            if role and role not in agent_sequence:
-                agent_sequence.append(role)
-    
-    # Convert to JSON for JavaScript
-    agents_json = json.dumps(agent_sequence)
-    debates_json = json.dumps(debate_exchanges)
-    
-    html = f"""
+            debate_lines.append([])
+
+    n_agents = len(agent_sequence)
+    sources = []
+    lines = ['graph LR', *_CLASS_DEFS]
+    shown_agents = shown_debates = 0
+    for step in range(max(n_agents + len(debate_exchanges), 1)):
+        # Agent lines only ever grow; debates show a window of the latest ones
+        while shown_agents < min(step + 1, n_agents):
+            lines.extend(agent_lines[shown_agents])
+            shown_agents += 1
+        shown_debates = max(shown_debates, step - n_agents)
+        first = max(0, shown_debates - MAX_VISIBLE_DEBATES)
+        step_lines = list(lines)
+        if first:
+            step_lines.append(f'    earlierDebates["… {first} earlier debates"]')
+        for debate in debate_lines[first:shown_debates]:
+            step_lines.extend(debate)
+        sources.append('\n'.join(step_lines))
+    return sources
+
+
+def _to_json(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+# Page markup; the @@name@@ slots are filled in by build_animated_graph_page()
+_PAGE = PageTemplate("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Animated Agent Flow - {run_id[:8]}</title>
+    <title>Animated Agent Flow - @@run_id_short@@</title>
     <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
     <style>
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 8px 32px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0 0 10px 0;
             font-size: 2em;
-        }}
-        .topic {{
+        }
+        .topic {
             font-size: 1.1em;
             opacity: 0.9;
             margin-top: 15px;
-        }}
-        .content {{
+        }
+        .content {
             padding: 30px;
-        }}
-        .controls {{
+        }
+        .controls {
             display: flex;
             gap: 15px;
             align-items: center;
@@ -101,8 +140,8 @@ def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
             padding: 20px;
             background: #f8fafc;
             border-radius: 8px;
-        }}
-        .btn {{
+        }
+        .btn {
             padding: 12px 24px;
             border: none;
             border-radius: 6px;
@@ -113,60 +152,67 @@ def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
             align-items: center;
             gap: 8px;
             font-weight: 600;
-        }}
-        .btn:hover {{
+        }
+        .btn:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
-        .btn-play {{
+        }
+        .btn-play {
             background: #10b981;
             color: white;
-        }}
-        .btn-pause {{
+        }
+        .btn-pause {
             background: #f59e0b;
             color: white;
-        }}
-        .btn-restart {{
+        }
+        .btn-restart {
             background: #3b82f6;
             color: white;
-        }}
-        .btn-speed {{
+        }
+        .btn-speed {
             background: #8b5cf6;
             color: white;
-        }}
-        .progress-container {{
+        }
+        .progress-container {
             margin: 20px 0;
             padding: 20px;
             background: #f1f5f9;
             border-radius: 8px;
-        }}
-        .progress-bar {{
+        }
+        .progress-bar {
             width: 100%;
             height: 8px;
             background: #e2e8f0;
             border-radius: 4px;
             overflow: hidden;
-        }}
-        .progress-fill {{
+        }
+        .progress-fill {
             height: 100%;
             background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
             width: 0%;
             transition: width 0.3s;
-        }}
-        .progress-text {{
+        }
+        .progress-text {
             margin-top: 10px;
             text-align: center;
             color: #64748b;
             font-size: 0.9em;
-        }}
-        .graph-container {{
+        }
+        .graph-container {
             background: #f8fafc;
             padding: 30px;
             border-radius: 8px;
             min-height: 500px;
             position: relative;
-        }}
-        .message-overlay {{
+        }
+        #mermaid-graph {
+            text-align: center;
+        }
+        #graph-canvas {
+            max-width: 100%;
+            height: auto;
+        }
+        .message-overlay {
             position: absolute;
             top: 20px;
             right: 20px;
@@ -176,31 +222,37 @@ def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
             box-shadow: 0 4px 12px rgba(0,0,0,0.1);
             max-width: 300px;
             display: none;
-            animation: slideIn 0.3s;
-        }}
-        .message-overlay.active {{
+            /* overlayHold only times the overlay: its end hides it again */
+            animation: slideIn 0.3s, overlayHold 1.5s;
+        }
+        .message-overlay.active {
             display: block;
-        }}
-        @keyframes slideIn {{
-            from {{
+        }
+        @keyframes overlayHold {
+            to {
+                visibility: visible;
+            }
+        }
+        @keyframes slideIn {
+            from {
                 transform: translateX(100%);
                 opacity: 0;
-            }}
-            to {{
+            }
+            to {
                 transform: translateX(0);
                 opacity: 1;
-            }}
-        }}
-        .message-title {{
+            }
+        }
+        .message-title {
             font-weight: bold;
             color: #1e293b;
             margin-bottom: 8px;
-        }}
-        .message-content {{
+        }
+        .message-content {
             color: #64748b;
             font-size: 0.9em;
-        }}
-        .legend {{
+        }
+        .legend {
             display: flex;
             flex-wrap: wrap;
             gap: 15px;
@@ -208,24 +260,24 @@ def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
             padding: 20px;
             background: #f1f5f9;
             border-radius: 8px;
-        }}
-        .legend-item {{
+        }
+        .legend-item {
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
-        .legend-color {{
+        }
+        .legend-color {
             width: 24px;
             height: 24px;
             border-radius: 4px;
-        }}
+        }
     </style>
 </head>
 <body>
     <div class="container">
         <div class="header">
             <h1>🎬 Animated Agent Conversation Flow</h1>
-            <div class="topic">{topic}</div>
+            <div class="topic">@@topic@@</div>
         </div>
         
         <div class="content">
@@ -256,10 +308,9 @@ def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
                     <div class="message-title" id="message-title">Agent Message</div>
                     <div class="message-content" id="message-content">...</div>
                 </div>
-                <pre class="mermaid" id="mermaid-graph">
-                    graph LR
-                    Start[Starting Animation...] 
-                </pre>
+                <div id="mermaid-graph">
+                    <canvas id="graph-canvas"></canvas>
+                </div>
             </div>
             
             <div class="legend">
@@ -292,163 +343,306 @@ def build_animated_graph_page(trace_data: Dict[str, Any]) -> str:
     </div>
     
     <script>
-        mermaid.initialize({{ 
-            startOnLoad: true,
+        mermaid.initialize({ 
+            startOnLoad: false,
             theme: 'default',
-            flowchart: {{
+            flowchart: {
                 curve: 'basis',
-                padding: 20
-            }}
-        }});
+                padding: 20,
+                // Plain SVG text labels: foreignObject labels do not paint onto a canvas
+                htmlLabels: false
+            }
+        });
         
         // Animation data
-        const agentSequence = {agents_json};
-        const debateExchanges = {debates_json};
+        const agentSequence = @@agents_json@@;
+        const debateExchanges = @@debates_json@@;
         const totalSteps = agentSequence.length + debateExchanges.length;
+        // Diagram source of every step, or null when the run is too long to embed them
+        const stepSources = @@step_sources_json@@;
+        const maxVisibleDebates = @@max_visible_debates@@;
         
         // Animation state
         let currentStep = 0;
         let isPlaying = false;
-        let animationInterval = null;
+        let animationFrame = null;
+        let lastStepTs = null;
         let speeds = [0.5, 1, 2, 3];
         let currentSpeedIndex = 1;
         let stepDelay = 2000; // milliseconds
         
         // Agent colors
-        const colors = {{
+        const colors = {
             'reader': '#3b82f6',
             'critic': '#ef4444',
             'synthesizer': '#10b981',
             'verifier': '#f59e0b',
             'followup': '#8b5cf6'
-        }};
+        };
+        // One Mermaid class per color, mirroring _CLASS_DEFS in animated_graph.py
+        const classDefs = [...Object.entries(colors).map(([key, color]) => [key + 'Style', color]), ['agentStyle', '#64748b']]
+            .map(([cls, color]) => `    classDef ${cls} fill:${color},stroke:#333,stroke-width:2px,color:#fff`);
         
-        function updateGraph(step) {{
-            const lines = ['graph LR'];
-            const visibleAgents = agentSequence.slice(0, Math.min(step + 1, agentSequence.length));
-            const visibleDebates = step > agentSequence.length ? 
-                debateExchanges.slice(0, step - agentSequence.length) : [];
-            
-            // Add visible agents
-            for (let i = 0; i < visibleAgents.length; i++) {{
-                const agent = visibleAgents[i];
-                const agentKey = agent.toLowerCase().replace(' ', '');
-                const color = colors[agentKey] || '#64748b';
-                
-                lines.push(`    ${{agentKey}}["${{agent}}"]`);
-                lines.push(`    style ${{agentKey}} fill:${{color}},stroke:#333,stroke-width:2px,color:#fff`);
-                
-                if (i > 0) {{
-                    const prevAgent = visibleAgents[i-1].toLowerCase().replace(' ', '');
-                    lines.push(`    ${{prevAgent}} --> ${{agentKey}}`);
-                }}
-            }}
-            
-            // Add visible debates
-            visibleDebates.forEach((debate, idx) => {{
-                const parts = debate.transition.split('->').map(s => s.trim());
-                if (parts.length === 2) {{
-                    const keyA = parts[0].toLowerCase();
-                    const keyB = parts[1].toLowerCase();
-                    lines.push(`    ${{keyA}} -.->|"debate ${{idx+1}}"| ${{keyB}}`);
-                }}
-            }});
-            
-            const mermaidCode = lines.join('\\n');
-            const container = document.getElementById('mermaid-graph');
-            container.textContent = mermaidCode;
-            container.removeAttribute('data-processed');
-            mermaid.init(undefined, container);
+        // Each distinct diagram is laid out by Mermaid once, off-DOM, and kept as a
+        // decoded bitmap; steps (and replays) then only repaint the canvas.
+        const canvas = document.getElementById('graph-canvas');
+        const ctx = canvas.getContext('2d');
+        const frames = new Map();  // mermaid source -> Promise<Image>
+        let renderCount = 0;
+        let latestFrame = 0;
+
+        function loadFrame(mermaidCode) {
+            let frame = frames.get(mermaidCode);
+            if (!frame) {
+                frame = mermaid.render('graph-frame-' + (renderCount++), mermaidCode).then(({ svg }) => {
+                    // Give the SVG an intrinsic size so the image decodes at layout size
+                    const doc = new DOMParser().parseFromString(svg, 'image/svg+xml');
+                    const root = doc.documentElement;
+                    const box = root.viewBox.baseVal;
+                    root.setAttribute('width', box.width);
+                    root.setAttribute('height', box.height);
+                    root.removeAttribute('style');
+                    const img = new Image();
+                    img.src = 'data:image/svg+xml;charset=utf-8,' +
+                        encodeURIComponent(new XMLSerializer().serializeToString(root));
+                    return img.decode().then(() => img);
+                });
+                frames.set(mermaidCode, frame);
+            }
+            return frame;
+        }
+
+        function drawFrame(img) {
+            const ratio = window.devicePixelRatio || 1;
+            const width = img.naturalWidth, height = img.naturalHeight;
+            if (canvas.width !== Math.round(width * ratio) || canvas.height !== Math.round(height * ratio)) {
+                canvas.width = Math.round(width * ratio);
+                canvas.height = Math.round(height * ratio);
+                canvas.style.width = width + 'px';
+            }
+            ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+            ctx.clearRect(0, 0, width, height);
+            ctx.drawImage(img, 0, 0, width, height);
+        }
+
+        // Client-side equivalent of _step_sources() in animated_graph.py. Agent and
+        // debate lines go into append-only buffers; each step shows all agents and
+        // the last maxVisibleDebates debates.
+        function buildSources() {
+            const agentKey = agent => agent.toLowerCase().replace(' ', '');
+            const mermaidLines = ['graph LR', ...classDefs];
+            const debateLines = [];
+            const built = [];
+            let shownAgents = 0, shownDebates = 0;
+            for (let step = 0; step < Math.max(totalSteps, 1); step++) {
+                for (; shownAgents < Math.min(step + 1, agentSequence.length); shownAgents++) {
+                    const agent = agentSequence[shownAgents];
+                    const key = agentKey(agent);
+                    const cls = Object.prototype.hasOwnProperty.call(colors, key) ? key + 'Style' : 'agentStyle';
+                    mermaidLines.push(`    ${key}["${agent}"]:::${cls}`);
+                    if (shownAgents > 0) {
+                        mermaidLines.push(`    ${agentKey(agentSequence[shownAgents - 1])} --> ${key}`);
+                    }
+                }
+                for (; shownDebates < step - agentSequence.length; shownDebates++) {
+                    const parts = debateExchanges[shownDebates].transition.split('->').map(s => s.trim());
+                    debateLines.push(parts.length === 2 ?
+                        [`    ${parts[0].toLowerCase()} -.->|"debate ${shownDebates + 1}"| ${parts[1].toLowerCase()}`] : []);
+                }
+                const first = Math.max(0, shownDebates - maxVisibleDebates);
+                const stepLines = mermaidLines.slice();
+                if (first) stepLines.push(`    earlierDebates["… ${first} earlier debates"]`);
+                for (let i = first; i < shownDebates; i++) stepLines.push(...debateLines[i]);
+                built.push(stepLines.join('\\n'));
+            }
+            return built;
+        }
+        
+        // Diagram source of every step, built once; steps past the end repeat the last
+        const sources = stepSources || buildSources();
+        
+        function updateGraph(step) {
+            const mermaidCode = sources[Math.min(step, sources.length - 1)];
+            const frameId = ++latestFrame;
+            loadFrame(mermaidCode).then(img => {
+                // A slow render must not overwrite a later step
+                if (frameId === latestFrame) drawFrame(img);
+            }).catch(err => console.error('Graph render failed', err));
+            // Lay out the next step while this one is on screen
+            if (step + 1 < sources.length) {
+                loadFrame(sources[step + 1]).catch(() => {});
+            }
             
             // Update progress
             const progress = ((step + 1) / totalSteps) * 100;
             document.getElementById('progress-fill').style.width = progress + '%';
             document.getElementById('progress-text').textContent = 
-                `Step ${{step + 1}} of ${{totalSteps}}: ${{getCurrentStepName(step)}}`;
+                `Step ${step + 1} of ${totalSteps}: ${getCurrentStepName(step)}`;
             
             // Show message overlay
             showMessage(step);
-        }}
+        }
         
-        function getCurrentStepName(step) {{
-            if (step < agentSequence.length) {{
+        function getCurrentStepName(step) {
+            if (step < agentSequence.length) {
                 return agentSequence[step] + ' enters';
-            }} else {{
+            } else {
                 const debateIdx = step - agentSequence.length;
-                if (debateIdx < debateExchanges.length) {{
+                if (debateIdx < debateExchanges.length) {
                     return 'Debate: ' + debateExchanges[debateIdx].speaker;
-                }}
-            }}
+                }
+            }
             return 'Complete';
-        }}
+        }
         
-        function showMessage(step) {{
-            const overlay = document.getElementById('message-overlay');
-            const title = document.getElementById('message-title');
-            const content = document.getElementById('message-content');
-            
-            if (step < agentSequence.length) {{
-                title.textContent = agentSequence[step].toUpperCase() + ' Agent';
-                content.textContent = `Processing and analyzing information...`;
-                overlay.classList.add('active');
-                setTimeout(() => overlay.classList.remove('active'), 1500);
-            }} else {{
+        const overlay = document.getElementById('message-overlay');
+        overlay.addEventListener('animationend', event => {
+            if (event.animationName === 'overlayHold') overlay.classList.remove('active');
+        });
+        
+        function messageNode(className, text) {
+            const node = document.createElement('div');
+            node.className = className;
+            node.textContent = text;
+            return node;
+        }
+        
+        // The overlay text is built detached and swapped in with one DOM write per frame
+        function showMessage(step) {
+            let title, body;
+            if (step < agentSequence.length) {
+                title = agentSequence[step].toUpperCase() + ' Agent';
+                body = `Processing and analyzing information...`;
+            } else {
                 const debateIdx = step - agentSequence.length;
-                if (debateIdx < debateExchanges.length) {{
-                    const debate = debateExchanges[debateIdx];
-                    title.textContent = debate.speaker;
-                    content.textContent = `Debating between ${{debate.transition}}`;
-                    overlay.classList.add('active');
-                    setTimeout(() => overlay.classList.remove('active'), 1500);
-                }}
-            }}
-        }}
+                if (debateIdx >= debateExchanges.length) return;
+                const debate = debateExchanges[debateIdx];
+                title = debate.speaker;
+                body = `Debating between ${debate.transition}`;
+            }
+            const frag = document.createDocumentFragment();
+            frag.append(messageNode('message-title', title), messageNode('message-content', body));
+            requestAnimationFrame(() => {
+                overlay.replaceChildren(frag);
+                overlay.classList.add('active');
+            });
+        }
         
-        function playAnimation() {{
+        function playAnimation() {
             if (isPlaying) return;
             
             isPlaying = true;
             document.getElementById('btn-play').style.display = 'none';
             document.getElementById('btn-pause').style.display = 'flex';
             
-            animationInterval = setInterval(() => {{
-                if (currentStep < totalSteps) {{
-                    updateGraph(currentStep);
-                    currentStep++;
-                }} else {{
-                    pauseAnimation();
-                }}
-            }}, stepDelay / speeds[currentSpeedIndex]);
-        }}
+            lastStepTs = null;
+            animationFrame = requestAnimationFrame(tick);
+        }
         
-        function pauseAnimation() {{
+        // Driven by requestAnimationFrame, so it pauses in background tabs. When
+        // several steps fall due in one frame only the last one is drawn.
+        function tick(ts) {
+            if (!isPlaying) return;
+            if (lastStepTs === null) lastStepTs = ts;
+            const interval = stepDelay / speeds[currentSpeedIndex];
+            let due = -1;
+            while (ts - lastStepTs >= interval && currentStep < totalSteps) {
+                due = currentStep++;
+                lastStepTs += interval;
+            }
+            if (due >= 0) updateGraph(due);
+            if (currentStep < totalSteps) {
+                animationFrame = requestAnimationFrame(tick);
+            } else {
+                // Leave the last step on screen for one interval, as before
+                animationFrame = requestAnimationFrame(function finish(now) {
+                    if (!isPlaying) return;
+                    if (now - lastStepTs >= interval) pauseAnimation();
+                    else animationFrame = requestAnimationFrame(finish);
+                });
+            }
+        }
+        
+        function pauseAnimation() {
             isPlaying = false;
-            clearInterval(animationInterval);
+            cancelAnimationFrame(animationFrame);
             document.getElementById('btn-play').style.display = 'flex';
             document.getElementById('btn-pause').style.display = 'none';
-        }}
+        }
         
-        function restartAnimation() {{
+        function restartAnimation() {
             pauseAnimation();
             currentStep = 0;
             updateGraph(0);
             document.getElementById('progress-text').textContent = 'Ready to play';
-        }}
+        }
         
-        function cycleSpeed() {{
+        function cycleSpeed() {
             currentSpeedIndex = (currentSpeedIndex + 1) % speeds.length;
             document.getElementById('speed-text').textContent = speeds[currentSpeedIndex] + 'x';
             
-            if (isPlaying) {{
-                clearInterval(animationInterval);
-                playAnimation();
-            }}
-        }}
+            // tick() reads the speed every frame, so a running animation adapts
+        }
         
         // Initialize
         updateGraph(0);
     </script>
 </body>
 </html>
+    """)
+
+
+def build_animated_graph_page(trace_data: TraceSource) -> str:
+    """
+    Build an HTML page with automatic animation of the agent conversation flow.
+    Shows agents appearing one by one and messages flowing between them.
+    trace_data is the parsed trace or the path of a trace.json, which is
+    read in a single streaming pass.
     """
-    return html
+    trace_data, messages = open_trace(trace_data)
+    
+    # Extract agent sequence and debate info
+    agent_sequence = []
+    seen_roles = set()
+    debate_exchanges = []
+    
+    for _, msg in messages:
+        role = msg.get('role', '')
+        content = msg.get('content', '')
+        
+        if '[DEBATE' in content:
+            # Parse debate info
+            match = _DEBATE_RE.search(content)
+            if match:
+                transition = match.group(1).strip()
+                speaker = match.group(2).strip()
+                debate_exchanges.append({
+                    'transition': transition,
+                    'speaker': speaker,
+                    'role': role
+                })
+        else:
+            # Regular agent message
+            if role and role not in seen_roles:
+                seen_roles.add(role)
+                agent_sequence.append(role)
+    
+    run_id = trace_data.get('run_id', 'unknown')
+    topic = trace_data.get('topic', 'Research Topic')
+    
+    # Convert to JSON for JavaScript
+    agents_json = _to_json(agent_sequence)
+    debates_json = _to_json(debate_exchanges)
+    if len(agent_sequence) + len(debate_exchanges) < MAX_PREBUILT_STEPS:
+        step_sources_json = _to_json(_step_sources(agent_sequence, debate_exchanges))
+    else:
+        step_sources_json = 'null'
+    
+    return _PAGE.render(
+        run_id_short=run_id[:8],
+        topic=topic,
+        agents_json=agents_json,
+        debates_json=debates_json,
+        step_sources_json=step_sources_json,
+        max_visible_debates=MAX_VISIBLE_DEBATES,
+    )
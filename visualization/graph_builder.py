@@ -1,26 +1,44 @@
 """Build visual graphs of agent conversation flows from trace data."""
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional
 import json
 
+from visualization.mermaid_render import render_mermaid_svg
+from visualization.templates import PageTemplate
+from visualization.trace_stream import TraceSource, open_trace
+
+
+# Mermaid node definition per agent role; other roles get "Name[Name]"
+_ROLE_NODES: dict[str, str] = {
+    "reader": "Reader[Reader<br/>Extracts findings]",
+    "critic": "Critic[Critic<br/>Challenges claims]",
+    "synthesizer": "Synthesizer[Synthesizer<br/>Merges perspectives]",
+    "verifier": "Verifier[Verifier<br/>Assesses quality]",
+    "followup": "Followup[FollowUp<br/>Proposes questions]",
+}
+
 
 def build_mermaid_flowchart(trace_data: dict[str, Any]) -> str:
     """Generate a Mermaid flowchart from trace data.
     
     Shows the agent pipeline with debate loops and message counts.
     """
+    turns = trace_data.get("turns")
+    # Focus on first turn for visualization
+    return _flowchart(turns[0].get("messages", []) if turns else None)
+
+
+def _flowchart(messages: Optional[list[dict[str, Any]]]) -> str:
+    """Flowchart of the first turn's messages; None when the trace has no turns."""
     lines = ["flowchart TD"]
     lines.append("    Start([Start: Topic]) --> Reader")
     
     # Extract roles and debate patterns
-    if not trace_data.get("turns"):
+    if messages is None:
         lines.append("    Reader --> End([No data])")
         return "\n".join(lines)
     
-    turn = trace_data["turns"][0]  # Focus on first turn for visualization
-    messages = turn.get("messages", [])
-    
     # Track agent sequence and debate exchanges
     agent_sequence = []
     debate_exchanges = []
@@ -53,57 +71,48 @@ def build_mermaid_flowchart(trace_data: dict[str, Any]) -> str:
         agent_sequence.append(role)
         i += 1
     
-    # Build main flow
-    prev_agent = "Reader"
-    agent_nodes = {"reader": "Reader[Reader<br/>Extracts findings]"}
+    # Capitalized display name per role, computed once per distinct name
+    display = {"reader": "Reader"}
     
-    for idx, role in enumerate(agent_sequence):
-        if role == "reader":
-            continue
-        
-        role_display = role.capitalize()
-        node_id = role
-        
-        # Define node shapes and descriptions
-        if role == "critic":
-            agent_nodes[role] = f"{role_display}[Critic<br/>Challenges claims]"
-        elif role == "synthesizer":
-            agent_nodes[role] = f"{role_display}[Synthesizer<br/>Merges perspectives]"
-        elif role == "verifier":
-            agent_nodes[role] = f"{role_display}[Verifier<br/>Assesses quality]"
-        elif role == "followup":
-            agent_nodes[role] = f"{role_display}[FollowUp<br/>Proposes questions]"
-        else:
-            agent_nodes[role] = f"{role_display}[{role_display}]"
+    def show(name: str) -> str:
+        shown = display.get(name)
+        if shown is None:
+            shown = display[name] = name.capitalize()
+        return shown
+    
+    # Build main flow
+    agent_nodes = {"reader": _ROLE_NODES["reader"]}
+    for role in agent_sequence:
+        if role not in agent_nodes:
+            node_def = _ROLE_NODES.get(role)
+            if node_def is None:
+                role_display = show(role)
+                node_def = f"{role_display}[{role_display}]"
+            agent_nodes[role] = node_def
     
     # Add nodes
-    for node_id, node_def in agent_nodes.items():
+    for node_def in agent_nodes.values():
         lines.append(f"    {node_def}")
     
     # Add main flow edges
     flow_sequence = ["reader"] + [r for r in agent_sequence if r != "reader"]
-    for i in range(len(flow_sequence) - 1):
-        from_agent = flow_sequence[i].capitalize()
-        to_agent = flow_sequence[i + 1].capitalize()
-        lines.append(f"    {from_agent} --> {to_agent}")
+    for from_role, to_role in zip(flow_sequence, flow_sequence[1:]):
+        lines.append(f"    {show(from_role)} --> {show(to_role)}")
     
     # Add debate subgraphs
     for idx, debate in enumerate(debate_exchanges):
-        from_to = debate["from_to"]
-        if "->" in from_to:
-            agents = from_to.split("->")
-            if len(agents) == 2:
-                from_agent = agents[0].strip().capitalize()
-                to_agent = agents[1].strip().capitalize()
-                
-                debate_id = f"D{idx}"
-                lines.append(f"    {from_agent} -.->|debate| {debate_id}{{{{Debate}}}}")
-                lines.append(f"    {debate_id} -.->|clarified| {to_agent}")
+        agents = debate["from_to"].split("->")
+        if len(agents) == 2:
+            from_agent = show(agents[0].strip())
+            to_agent = show(agents[1].strip())
+            
+            debate_id = f"D{idx}"
+            lines.append(f"    {from_agent} -.->|debate| {debate_id}{{{{Debate}}}}")
+            lines.append(f"    {debate_id} -.->|clarified| {to_agent}")
     
     # End node
     if flow_sequence:
-        last_agent = flow_sequence[-1].capitalize()
-        lines.append(f"    {last_agent} --> End([Complete])")
+        lines.append(f"    {show(flow_sequence[-1])} --> End([Complete])")
     
     # Style
     lines.append("    style Start fill:#e1f5e1")
@@ -117,52 +126,52 @@ def build_mermaid_flowchart(trace_data: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
-def build_html_page(trace_data: dict[str, Any]) -> str:
-    """Generate a full HTML page with embedded Mermaid visualization."""
-    mermaid_chart = build_mermaid_flowchart(trace_data)
-    
-    # Count messages and debates
-    total_messages = 0
-    debate_count = 0
-    if trace_data.get("turns"):
-        for turn in trace_data["turns"]:
-            messages = turn.get("messages", [])
-            total_messages += len(messages)
-            for msg in messages:
-                if "[DEBATE" in msg.get("content", ""):
-                    debate_count += 1
-    
-    debate_rounds = debate_count // 3  # Each debate has 3 messages (ask, answer, synthesis)
-    
-    html = f"""<!DOCTYPE html>
+# Client-side rendering, used when the diagram could not be pre-rendered to SVG
+_MERMAID_SCRIPT = """    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
+"""
+_MERMAID_INIT = """    <script>
+        mermaid.initialize({ 
+            startOnLoad: true,
+            theme: 'default',
+            flowchart: {
+                useMaxWidth: true,
+                htmlLabels: true,
+                curve: 'basis'
+            }
+        });
+    </script>
+"""
+
+
+# Page markup; the @@name@@ slots are filled in by build_html_page()
+_PAGE = PageTemplate("""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Agent Conversation Flow - {trace_data.get('run_id', 'Unknown')}</title>
-    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-    <style>
-        body {{
+    <title>Agent Conversation Flow - @@title_run_id@@</title>
+@@mermaid_script@@    <style>
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.2);
             padding: 30px;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #333;
             margin-bottom: 10px;
             font-size: 28px;
-        }}
-        .metadata {{
+        }
+        .metadata {
             background: #f5f5f5;
             padding: 15px;
             border-radius: 8px;
@@ -170,63 +179,63 @@ def build_html_page(trace_data: dict[str, Any]) -> str:
             display: flex;
             gap: 30px;
             flex-wrap: wrap;
-        }}
-        .metadata-item {{
+        }
+        .metadata-item {
             display: flex;
             flex-direction: column;
-        }}
-        .metadata-label {{
+        }
+        .metadata-label {
             font-size: 12px;
             color: #666;
             text-transform: uppercase;
             letter-spacing: 0.5px;
             margin-bottom: 5px;
-        }}
-        .metadata-value {{
+        }
+        .metadata-value {
             font-size: 16px;
             color: #333;
             font-weight: 600;
-        }}
-        .chart-container {{
+        }
+        .chart-container {
             background: #fafafa;
             padding: 30px;
             border-radius: 8px;
             margin-bottom: 20px;
             overflow-x: auto;
-        }}
-        .legend {{
+        }
+        .legend {
             background: #f0f0f0;
             padding: 15px;
             border-radius: 8px;
             margin-top: 20px;
-        }}
-        .legend h3 {{
+        }
+        .legend h3 {
             margin-top: 0;
             color: #555;
             font-size: 16px;
-        }}
-        .legend-items {{
+        }
+        .legend-items {
             display: flex;
             gap: 20px;
             flex-wrap: wrap;
-        }}
-        .legend-item {{
+        }
+        .legend-item {
             display: flex;
             align-items: center;
             gap: 8px;
-        }}
-        .legend-color {{
+        }
+        .legend-color {
             width: 20px;
             height: 20px;
             border-radius: 4px;
             border: 1px solid #ddd;
-        }}
-        .actions {{
+        }
+        .actions {
             display: flex;
             gap: 15px;
             margin-top: 20px;
-        }}
-        .btn {{
+        }
+        .btn {
             padding: 10px 20px;
             border: none;
             border-radius: 6px;
@@ -236,21 +245,21 @@ def build_html_page(trace_data: dict[str, Any]) -> str:
             text-decoration: none;
             display: inline-block;
             transition: all 0.3s;
-        }}
-        .btn-primary {{
+        }
+        .btn-primary {
             background: #667eea;
             color: white;
-        }}
-        .btn-primary:hover {{
+        }
+        .btn-primary:hover {
             background: #5568d3;
-        }}
-        .btn-secondary {{
+        }
+        .btn-secondary {
             background: #e0e0e0;
             color: #333;
-        }}
-        .btn-secondary:hover {{
+        }
+        .btn-secondary:hover {
             background: #d0d0d0;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -260,35 +269,32 @@ def build_html_page(trace_data: dict[str, Any]) -> str:
         <div class="metadata">
             <div class="metadata-item">
                 <div class="metadata-label">Run ID</div>
-                <div class="metadata-value">{trace_data.get('run_id', 'N/A')[:12]}...</div>
+                <div class="metadata-value">@@run_id_short@@...</div>
             </div>
             <div class="metadata-item">
                 <div class="metadata-label">Topic</div>
-                <div class="metadata-value">{trace_data.get('topic', 'N/A')[:50]}...</div>
+                <div class="metadata-value">@@topic_short@@...</div>
             </div>
             <div class="metadata-item">
                 <div class="metadata-label">Status</div>
-                <div class="metadata-value">{trace_data.get('status', 'N/A').upper()}</div>
+                <div class="metadata-value">@@status@@</div>
             </div>
             <div class="metadata-item">
                 <div class="metadata-label">Total Messages</div>
-                <div class="metadata-value">{total_messages}</div>
+                <div class="metadata-value">@@total_messages@@</div>
             </div>
             <div class="metadata-item">
                 <div class="metadata-label">Debate Rounds</div>
-                <div class="metadata-value">{debate_rounds}</div>
+                <div class="metadata-value">@@debate_rounds@@</div>
             </div>
             <div class="metadata-item">
                 <div class="metadata-label">Turns</div>
-                <div class="metadata-value">{len(trace_data.get('turns', []))}</div>
+                <div class="metadata-value">@@turn_count@@</div>
             </div>
         </div>
         
         <div class="chart-container">
-            <div class="mermaid">
-{mermaid_chart}
-            </div>
-        </div>
+@@diagram@@        </div>
         
         <div class="legend">
             <h3>Legend</h3>
@@ -323,23 +329,56 @@ def build_html_page(trace_data: dict[str, Any]) -> str:
         </div>
         
         <div class="actions">
-            <a href="/api/runs/{trace_data.get('run_id', '')}/trace" class="btn btn-primary">View Full Trace JSON</a>
-            <a href="/api/runs/{trace_data.get('run_id', '')}/insight" class="btn btn-secondary">View Insight Report</a>
+            <a href="/api/runs/@@run_id@@/trace" class="btn btn-primary">View Full Trace JSON</a>
+            <a href="/api/runs/@@run_id@@/insight" class="btn btn-secondary">View Insight Report</a>
             <a href="/" class="btn btn-secondary">Back to Home</a>
         </div>
     </div>
     
-    <script>
-        mermaid.initialize({{ 
-            startOnLoad: true,
-            theme: 'default',
-            flowchart: {{
-                useMaxWidth: true,
-                htmlLabels: true,
-                curve: 'basis'
-            }}
-        }});
-    </script>
-</body>
-</html>"""
-    return html
+@@mermaid_init@@</body>
+</html>""")
+
+
+def build_html_page(trace_data: TraceSource) -> str:
+    """Generate a full HTML page with embedded Mermaid visualization.
+
+    trace_data is the parsed trace or the path of a trace.json, which is
+    read in a single streaming pass.
+    """
+    trace_data, messages = open_trace(trace_data)
+    
+    # Count messages and debates; only the first turn is kept for the chart
+    total_messages = 0
+    debate_count = 0
+    first_turn: list[dict[str, Any]] = []
+    for turn_index, msg in messages:
+        total_messages += 1
+        if "[DEBATE" in msg.get("content", ""):
+            debate_count += 1
+        if turn_index == 0:
+            first_turn.append(msg)
+    mermaid_chart = _flowchart(first_turn if trace_data["turn_count"] else None)
+    
+    debate_rounds = debate_count // 3  # Each debate has 3 messages (ask, answer, synthesis)
+    
+    svg = render_mermaid_svg(mermaid_chart)
+    if svg is not None:
+        diagram = f'            <div class="diagram">{svg}</div>\n'
+        mermaid_script = mermaid_init = ""
+    else:
+        diagram = f'            <div class="mermaid">\n{mermaid_chart}\n            </div>\n'
+        mermaid_script, mermaid_init = _MERMAID_SCRIPT, _MERMAID_INIT
+    
+    return _PAGE.render(
+        mermaid_script=mermaid_script,
+        diagram=diagram,
+        mermaid_init=mermaid_init,
+        title_run_id=trace_data.get('run_id', 'Unknown'),
+        run_id_short=trace_data.get('run_id', 'N/A')[:12],
+        topic_short=trace_data.get('topic', 'N/A')[:50],
+        status=trace_data.get('status', 'N/A').upper(),
+        total_messages=total_messages,
+        debate_rounds=debate_rounds,
+        turn_count=trace_data['turn_count'],
+        run_id=trace_data.get('run_id', ''),
+    )
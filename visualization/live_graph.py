@@ -2,24 +2,50 @@
 Live graph builder for real-time visualization of agent conversations.
 Streams updates as messages are added to the trace.
 """
+import gzip
 import json
-from typing import Dict, List, Any
+import re
+import struct
+from typing import Dict, List, Any, Optional, Tuple
 
+from visualization.templates import PageTemplate
 
-def build_live_html_page() -> str:
-    """
-    Build an HTML page with live updates via Server-Sent Events.
-    The page connects to /graph/live/{run_id}/stream endpoint.
-    """
-    html = """
+try:  # optional, smaller precompressed live page
+    import brotli  # type: ignore
+except Exception:  # pragma: no cover
+    brotli = None  # type: ignore
+
+try:  # optional, faster serialization of SSE payloads
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+
+
+# Binary WebSocket frames: type tag byte, then these string fields in order.
+# Only the fields the live page reads are sent.
+_FRAME_TYPES = ("init", "message", "delta", "complete", "error")
+_FRAME_FIELDS: Dict[str, tuple] = {
+    "init": ("topic",),
+    "message": ("role", "debate", "transition", "speaker"),
+    "delta": ("role", "text"),
+    "complete": ("message",),
+    "error": ("message",),
+}
+_FRAME_TAGS = {name: i + 1 for i, name in enumerate(_FRAME_TYPES)}
+_MAX_FIELD_BYTES = 0xFFFF
+
+# The live page takes no inputs (the run id is read from the URL client-side),
+# so it is one constant, encoded once
+_LIVE_HTML = PageTemplate("""
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Live Agent Conversation Graph</title>
-    <script src="https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/gif.js@0.2.0/dist/gif.js"></script>
     <style>
         body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -61,6 +87,9 @@ def build_live_html_page() -> str:
         .status.completed {
             background: #60a5fa;
         }
+        .status.error {
+            background: #ef4444;
+        }
         @keyframes pulse {
             0%, 100% { opacity: 1; }
             50% { opacity: 0.7; }
@@ -234,7 +263,7 @@ def build_live_html_page() -> str:
                     <span>⏹</span> Stop Recording
                 </button>
                 <button id="btn-download" class="btn btn-download" onclick="downloadAnimation()" disabled>
-                    <span>⬇</span> Download GIF
+                    <span>⬇</span> Download Video
                 </button>
                 <div id="recording-indicator" class="recording-indicator">● RECORDING</div>
             </div>
@@ -279,149 +308,444 @@ def build_live_html_page() -> str:
         </div>
     </div>
     
+    <!-- Recording compositor, started as a worker from a Blob URL -->
+    <script type="text/js-worker" id="record-worker">
+        let ctx = null;
+        let bitmap = null;  // current diagram, already scaled to fit the frame
+        
+        self.onmessage = ({ data }) => {
+            if (data.canvas) {
+                ctx = data.canvas.getContext('2d');
+                return;
+            }
+            if (data.bitmap) {
+                if (bitmap) bitmap.close();
+                bitmap = data.bitmap;
+            }
+            if (!ctx || !bitmap) return;
+            const { width, height } = ctx.canvas;
+            ctx.fillStyle = '#f8fafc';
+            ctx.fillRect(0, 0, width, height);
+            ctx.drawImage(bitmap, (width - bitmap.width) / 2, (height - bitmap.height) / 2);
+            
+            // Add timestamp overlay
+            ctx.fillStyle = 'rgba(0, 0, 0, 0.7)';
+            ctx.fillRect(10, 10, 200, 40);
+            ctx.fillStyle = 'white';
+            ctx.font = '14px Arial';
+            ctx.fillText(`Messages: ${data.messageCount}`, 20, 30);
+            ctx.fillText(`Stage: ${data.stage}`, 20, 48);
+        };
+    </script>
+    
     <script>
-        mermaid.initialize({ 
-            startOnLoad: true,
-            theme: 'default',
-            flowchart: {
-                curve: 'basis',
-                padding: 20
+        // Mermaid is imported on first render, so it does not hold up the first
+        // paint or the SSE connection
+        let mermaidReady = null;
+        
+        function ensureMermaid() {
+            if (!mermaidReady) {
+                mermaidReady = import('https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.esm.min.mjs').then(m => {
+                    const mermaid = m.default;
+                    mermaid.initialize({ 
+                        // updateGraph() renders the container itself, from the first call on
+                        startOnLoad: false,
+                        theme: 'default',
+                        flowchart: {
+                            curve: 'basis',
+                            padding: 20
+                        }
+                    });
+                    return mermaid;
+                });
+                // A failed load is retried by the next render
+                mermaidReady.catch(() => { mermaidReady = null; });
             }
-        });
+            return mermaidReady;
+        }
         
         let messageCount = 0;
         let debateCount = 0;
-        let agentSequence = [];
-        let debateExchanges = [];
+        // Entries carry their diagram keys, derived once when they arrive
+        let agentSequence = [];  // {name, key, cls}
+        // Only the latest MAX_VISIBLE_DEBATES debates are kept and drawn; older ones
+        // collapse into one placeholder node, as on the animated page
+        const MAX_VISIBLE_DEBATES = 20;
+        let debateExchanges = [];  // {transition, speaker, role, keyA, keyB}
+        let debatesSeen = 0;
+        const seenRoles = new Set();
         let currentAgent = null;
         let isCompleted = false;
         
         const runId = window.location.pathname.split('/').pop();
         document.getElementById('run-id').textContent = runId.substring(0, 8) + '...';
         
-        // Connect to SSE stream
-        const eventSource = new EventSource(`/graph/live/${runId}/stream`);
+        // Elements updated by the stream, looked up once
+        const elTopic = document.getElementById('topic');
+        const elMessageCount = document.getElementById('message-count');
+        const elDebateCount = document.getElementById('debate-count');
+        const elStage = document.getElementById('current-stage');
+        const elCurrentAgent = document.getElementById('current-agent');
+        const elAgentName = document.getElementById('agent-name');
+        const elStatus = document.getElementById('status');
+        const STATUS_TEXT = {
+            completed: '✓ COMPLETED',
+            error: '✗ ERROR',
+            disconnected: '✗ CONNECTION ERROR'
+        };
         
-        eventSource.onmessage = function(event) {
-            const data = JSON.parse(event.data);
-            
+        // One class swap per status change; the colors live in the stylesheet
+        function setStatus(state) {
+            elStatus.className = 'status ' + (state === 'disconnected' ? 'error' : state);
+            elStatus.textContent = STATUS_TEXT[state];
+        }
+        
+        // Stat text is kept here by the message handler and written to the page in
+        // the same frame as the graph render; null means the agent banner is hidden
+        let agentLabel = null;
+        const shownStats = {};
+        
+        function setText(el, key, value) {
+            if (shownStats[key] !== value) {
+                shownStats[key] = value;
+                el.textContent = value;
+            }
+        }
+        
+        function renderStats() {
+            setText(elMessageCount, 'messages', String(messageCount));
+            setText(elDebateCount, 'debates', String(debateCount));
+            if (agentSequence.length) setText(elStage, 'stage', String(agentSequence.length));
+            if (agentLabel !== null) setText(elAgentName, 'agent', agentLabel);
+            const display = agentLabel !== null ? 'block' : 'none';
+            if (shownStats.display !== display) {
+                shownStats.display = display;
+                elCurrentAgent.style.display = display;
+            }
+        }
+        
+        function handleUpdate(data) {
             if (data.type === 'init') {
-                document.getElementById('topic').textContent = data.topic || 'Research in progress...';
+                elTopic.textContent = data.topic || 'Research in progress...';
             }
             else if (data.type === 'message') {
                 messageCount++;
-                document.getElementById('message-count').textContent = messageCount;
+                graphDirty = true;
                 
                 const role = data.role;
-                const content = data.content || '';
                 
-                // Check if this is a debate message
-                if (content.includes('[DEBATE') && content.includes('|')) {
+                // The server parses the debate header; message bodies are not sent
+                if (data.debate) {
                     debateCount++;
-                    document.getElementById('debate-count').textContent = debateCount;
                     
-                    // Parse debate info from content
-                    const debateMatch = content.match(/\[DEBATE ([^|]+)\|([^|]+)\|/);
-                    if (debateMatch) {
-                        const transition = debateMatch[1].trim();
-                        const speaker = debateMatch[2].trim();
-                        debateExchanges.push({ transition, speaker, role });
-                    }
+                    const transition = data.transition;
+                    const speaker = data.speaker;
+                    const [agentA, agentB] = transition.split('->').map(s => s.trim());
+                    debateExchanges.push({
+                        transition, speaker, role,
+                        keyA: agentA && agentB ? agentA.toLowerCase() : null,
+                        keyB: agentA && agentB ? agentB.toLowerCase() : null
+                    });
+                    debatesSeen++;
+                    if (debateExchanges.length > MAX_VISIBLE_DEBATES) debateExchanges.shift();
                 } else {
                     // Regular agent message
-                    if (role && !agentSequence.includes(role)) {
-                        agentSequence.push(role);
+                    if (role && !seenRoles.has(role)) {
+                        seenRoles.add(role);
+                        const key = role.toLowerCase().replace(' ', '');
+                        const cls = Object.prototype.hasOwnProperty.call(colors, key) ? key + 'Style' : 'agentStyle';
+                        agentSequence.push({ name: role, key, cls });
                     }
                     currentAgent = role;
                     
                     // Update current stage
                     if (role) {
-                        const stageNum = agentSequence.length;
-                        document.getElementById('current-stage').textContent = stageNum;
-                        document.getElementById('current-agent').style.display = 'block';
-                        document.getElementById('agent-name').textContent = role.toUpperCase();
+                        agentLabel = role.toUpperCase();
                     }
                 }
                 
-                // Rebuild graph
-                updateGraph();
+                // Rebuild graph and stats, at most once per frame however fast messages arrive
+                scheduleUpdate();
+            }
+            else if (data.type === 'delta') {
+                // A stage is still generating; show who is writing
+                if (data.role) {
+                    agentLabel = data.role.toUpperCase() + ' (writing...)';
+                    scheduleUpdate();
+                }
             }
             else if (data.type === 'complete') {
                 isCompleted = true;
-                document.getElementById('status').className = 'status completed';
-                document.getElementById('status').textContent = '✓ COMPLETED';
-                document.getElementById('current-agent').style.display = 'none';
-                eventSource.close();
+                setStatus('completed');
+                agentLabel = null;
+                scheduleUpdate();
+                closeStream();
             }
             else if (data.type === 'error') {
-                document.getElementById('status').className = 'status';
-                document.getElementById('status').style.background = '#ef4444';
-                document.getElementById('status').textContent = '✗ ERROR';
-                document.getElementById('current-agent').style.display = 'none';
-                eventSource.close();
+                setStatus('error');
+                agentLabel = null;
+                scheduleUpdate();
+                closeStream();
             }
-        };
+        }
         
-        eventSource.onerror = function(event) {
-            console.error('SSE error:', event);
+        function showConnectionError() {
             if (!isCompleted) {
-                document.getElementById('status').className = 'status';
-                document.getElementById('status').style.background = '#ef4444';
-                document.getElementById('status').textContent = '✗ CONNECTION ERROR';
+                setStatus('disconnected');
             }
+        }
+        
+        // Updates arrive over a WebSocket as binary frames when possible, and as
+        // SSE JSON events otherwise. A frame is a type byte followed by the type's
+        // fields in FRAME_FIELDS order, each a big-endian uint16 byte length and
+        // that many UTF-8 bytes (see encode_live_frame() in live_graph.py).
+        const FRAME_TYPES = @@frame_types@@;
+        const FRAME_FIELDS = @@frame_fields@@;
+        const frameDecoder = new TextDecoder();
+        let stream = null;
+        let streamClosed = false;
+        
+        function decodeFrame(buffer) {
+            const bytes = new Uint8Array(buffer);
+            const view = new DataView(buffer);
+            const type = FRAME_TYPES[bytes[0]];
+            const data = { type };
+            let pos = 1;
+            for (const field of FRAME_FIELDS[type] || []) {
+                const length = view.getUint16(pos);
+                pos += 2;
+                data[field] = frameDecoder.decode(bytes.subarray(pos, pos + length));
+                pos += length;
+            }
+            return data;
+        }
+        
+        function closeStream() {
+            streamClosed = true;
+            if (stream) stream.close();
+        }
+        
+        function connectSse() {
+            const eventSource = new EventSource(`/graph/live/${runId}/stream`);
+            stream = eventSource;
+            eventSource.onmessage = event => handleUpdate(JSON.parse(event.data));
+            eventSource.onerror = function(event) {
+                console.error('SSE error:', event);
+                showConnectionError();
+            };
+        }
+        
+        function connectStream() {
+            if (typeof WebSocket === 'undefined') return connectSse();
+            const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+            const ws = new WebSocket(`${protocol}://${window.location.host}/graph/live/${runId}/ws`);
+            ws.binaryType = 'arraybuffer';
+            let opened = false;
+            stream = ws;
+            ws.onopen = () => { opened = true; };
+            ws.onmessage = event => handleUpdate(decodeFrame(event.data));
+            ws.onclose = () => {
+                if (streamClosed) return;
+                // No handshake (proxy or server without WebSocket support): use SSE
+                if (!opened) connectSse();
+                else showConnectionError();
+            };
+        }
+        
+        let latestRender = 0;
+        let renderScheduled = false;
+        
+        function scheduleUpdate() {
+            if (renderScheduled) return;
+            renderScheduled = true;
+            requestAnimationFrame(() => {
+                renderScheduled = false;
+                renderStats();
+                updateGraph();
+            });
+        }
+        
+        // Agent color mapping
+        const colors = {
+            'reader': '#3b82f6',
+            'critic': '#ef4444',
+            'synthesizer': '#10b981',
+            'verifier': '#f59e0b',
+            'followup': '#8b5cf6'
         };
+        // Node styles are declared once as classes; nodes refer to them with :::
+        const headerLines = ['graph LR'];
+        for (const [key, color] of [...Object.entries(colors), ['agent', '#64748b']]) {
+            headerLines.push(`    classDef ${key}Style fill:${color},stroke:#333,stroke-width:2px,color:#fff`);
+        }
+        
+        // Agents and debates only ever append, so their diagram lines are kept
+        // and each update emits lines for the new entries only
+        const agentLines = [];
+        const debateLines = [];  // one per kept debate; '' when it draws no edge
+        let lastAgentCount = 0;
+        let lastDebateCount = 0;
         
         function updateGraph() {
-            const lines = ['graph LR'];
-            
-            // Agent color mapping
-            const colors = {
-                'reader': '#3b82f6',
-                'critic': '#ef4444',
-                'synthesizer': '#10b981',
-                'verifier': '#f59e0b',
-                'followup': '#8b5cf6'
-            };
+            if (latestRender > 0 && agentSequence.length === lastAgentCount &&
+                    debatesSeen === lastDebateCount) {
+                return;
+            }
             
             // Add agent sequence nodes and edges
-            for (let i = 0; i < agentSequence.length; i++) {
+            for (let i = lastAgentCount; i < agentSequence.length; i++) {
                 const agent = agentSequence[i];
-                const agentKey = agent.toLowerCase().replace(' ', '');
-                const color = colors[agentKey] || '#64748b';
-                
-                lines.push(`    ${agentKey}["${agent}"]`);
-                lines.push(`    style ${agentKey} fill:${color},stroke:#333,stroke-width:2px,color:#fff`);
-                
+                agentLines.push(`    ${agent.key}["${agent.name}"]:::${agent.cls}`);
                 if (i > 0) {
-                    const prevAgent = agentSequence[i-1].toLowerCase().replace(' ', '');
-                    lines.push(`    ${prevAgent} --> ${agentKey}`);
+                    agentLines.push(`    ${agentSequence[i-1].key} --> ${agent.key}`);
                 }
             }
+            lastAgentCount = agentSequence.length;
             
-            // Add debate exchanges as dotted lines
-            debateExchanges.forEach((debate, idx) => {
-                const [agentA, agentB] = debate.transition.split('->').map(s => s.trim());
-                if (agentA && agentB) {
-                    const keyA = agentA.toLowerCase();
-                    const keyB = agentB.toLowerCase();
-                    lines.push(`    ${keyA} -.->|"debate ${idx+1}"| ${keyB}`);
-                }
-            });
+            // Add debate exchanges as dotted lines; debateExchanges[0] is debate number
+            // debatesSeen - debateExchanges.length + 1
+            const firstKept = debatesSeen - debateExchanges.length;
+            for (let idx = Math.max(lastDebateCount, firstKept); idx < debatesSeen; idx++) {
+                const debate = debateExchanges[idx - firstKept];
+                debateLines.push(debate.keyA !== null ?
+                    `    ${debate.keyA} -.->|"debate ${idx+1}"| ${debate.keyB}` : '');
+            }
+            while (debateLines.length > MAX_VISIBLE_DEBATES) debateLines.shift();
+            lastDebateCount = debatesSeen;
             
-            const mermaidCode = lines.join('\n');
-            const container = document.getElementById('mermaid-graph');
-            container.textContent = mermaidCode;
-            container.removeAttribute('data-processed');
-            mermaid.init(undefined, container);
+            const lines = headerLines.concat(agentLines);
+            if (firstKept > 0) lines.push(`    earlierDebates["… ${firstKept} earlier debates"]`);
+            for (const line of debateLines) {
+                if (line) lines.push(line);
+            }
+            const mermaidCode = lines.join('\\n');
+            if (mermaidCode === shownSource) return;
+            // mermaid.render() lays the diagram out off-DOM; the container is
+            // touched once, and only if no later update has been requested since
+            const renderId = ++latestRender;
+            renderSvg(mermaidCode, renderId).then(svg => {
+                if (renderId === latestRender) {
+                    document.getElementById('mermaid-graph').innerHTML = svg;
+                    shownSource = mermaidCode;
+                    graphDirty = true;
+                }
+            }).catch(err => console.error('Graph render failed', err));
+        }
+        
+        // Rendered SVG per diagram source, so a repeated graph state skips layout
+        const svgCache = new Map();  // mermaid source -> Promise<svg>, in LRU order
+        const SVG_CACHE_SIZE = 50;
+        let shownSource = null;
+        
+        function renderSvg(mermaidCode, renderId) {
+            let svg = svgCache.get(mermaidCode);
+            if (svg) {
+                svgCache.delete(mermaidCode);
+            } else {
+                svg = ensureMermaid()
+                    .then(mermaid => mermaid.render('live-graph-' + renderId, mermaidCode))
+                    .then(r => r.svg);
+                svg.catch(() => svgCache.delete(mermaidCode));
+            }
+            svgCache.set(mermaidCode, svg);
+            if (svgCache.size > SVG_CACHE_SIZE) {
+                svgCache.delete(svgCache.keys().next().value);
+            }
+            return svg;
         }
         
         // Initial graph render
         updateGraph();
         
+        connectStream();
+        
         // ===== RECORDING FUNCTIONALITY =====
+        // Frames are drawn onto one canvas whose stream a MediaRecorder encodes
+        // as WebM, so a recording holds only compressed video chunks.
         let isRecording = false;
-        let recordedFrames = [];
-        let recordingInterval = null;
+        let recorder = null;
+        let recordedChunks = [];
+        let recordingFrame = null;
+        let graphDirty = false;  // set by new messages and new diagrams
+        let lastCaptureTs = 0;
+        const CAPTURE_INTERVAL_MS = 500;
+        const RECORD_WIDTH = 1280, RECORD_HEIGHT = 720;
+        const recordCanvas = document.createElement('canvas');
+        recordCanvas.width = RECORD_WIDTH;
+        recordCanvas.height = RECORD_HEIGHT;
+        // Where OffscreenCanvas is supported, frames are composited in a worker
+        // and the page only rasterizes each new diagram once; otherwise they
+        // are drawn here
+        const recordWorker = startRecordWorker();
+        const recordCtx = recordWorker ? null : recordCanvas.getContext('2d');
+        
+        function startRecordWorker() {
+            if (!recordCanvas.transferControlToOffscreen || typeof Worker === 'undefined' || !window.createImageBitmap) {
+                return null;
+            }
+            try {
+                const source = document.getElementById('record-worker').textContent;
+                const worker = new Worker(URL.createObjectURL(new Blob([source], {type: 'text/javascript'})));
+                const canvas = recordCanvas.transferControlToOffscreen();
+                worker.postMessage({ canvas }, [canvas]);
+                return worker;
+            } catch (err) {
+                console.warn('Recording worker unavailable, drawing frames on the page', err);
+                return null;
+            }
+        }
+        
+        // One serializer and one image are reused for every frame
+        const frameSerializer = new XMLSerializer();
+        const frameImg = new Image();
+        let frameSize = { width: 1, height: 1 };
+        let frameUrl = null;
+        let loadingSvg = null;  // diagram element frameImg is decoding
+        let decodedSvg = null;  // diagram element frameImg holds, decoded
+        
+        frameImg.onload = function() {
+            const svg = loadingSvg;
+            if (!recordWorker) {
+                decodedSvg = svg;
+                drawFrame();
+                return;
+            }
+            // Rasterize once at the size it is drawn, and hand the bitmap over
+            const scale = Math.min(RECORD_WIDTH / frameSize.width, RECORD_HEIGHT / frameSize.height, 1);
+            createImageBitmap(frameImg, {
+                resizeWidth: Math.max(1, Math.round(frameSize.width * scale)),
+                resizeHeight: Math.max(1, Math.round(frameSize.height * scale)),
+            }).then(bitmap => {
+                if (loadingSvg !== svg) {  // a newer diagram is already decoding
+                    bitmap.close();
+                    return;
+                }
+                decodedSvg = svg;
+                recordWorker.postMessage({ bitmap, messageCount, stage: agentSequence.length }, [bitmap]);
+            }).catch(err => console.error('Frame rasterization failed', err));
+        };
+        
+        function drawFrame() {
+            if (recordWorker) {
+                recordWorker.postMessage({ messageCount, stage: agentSequence.length });
+                return;
+            }
+            const ctx = recordCtx;
+            ctx.fillStyle = '#f8fafc';
+            ctx.fillRect(0, 0, RECORD_WIDTH, RECORD_HEIGHT);
+            // Fit the diagram into the fixed video frame
+            const scale = Math.min(RECORD_WIDTH / frameSize.width, RECORD_HEIGHT / frameSize.height, 1);
+            const width = frameSize.width * scale, height = frameSize.height * scale;
+            ctx.drawImage(frameImg, (RECORD_WIDTH - width) / 2, (RECORD_HEIGHT - height) / 2, width, height);
+            
+            // Add timestamp overlay
+            ctx.fillStyle = 'rgba(0, 0, 0, 0.7)';
+            ctx.fillRect(10, 10, 200, 40);
+            ctx.fillStyle = 'white';
+            ctx.font = '14px Arial';
+            ctx.fillText(`Messages: ${messageCount}`, 20, 30);
+            ctx.fillText(`Stage: ${agentSequence.length}`, 20, 48);
+        }
         
         function captureFrame() {
             const graphContainer = document.querySelector('.graph-container');
@@ -429,127 +753,95 @@ def build_live_html_page() -> str:
             
             if (!svg) return null;
             
-            // Create canvas from SVG
-            const canvas = document.createElement('canvas');
-            const bbox = svg.getBoundingClientRect();
-            canvas.width = bbox.width;
-            canvas.height = bbox.height;
-            const ctx = canvas.getContext('2d');
+            // Only the stats changed since the last decode: redraw the decoded image
+            if (svg === decodedSvg) {
+                drawFrame();
+                return;
+            }
             
-            // Serialize SVG to data URL
-            const svgData = new XMLSerializer().serializeToString(svg);
-            const svgBlob = new Blob([svgData], {type: 'image/svg+xml;charset=utf-8'});
-            const url = URL.createObjectURL(svgBlob);
+            // The viewBox gives the diagram size without forcing a layout
+            const box = svg.viewBox && svg.viewBox.baseVal;
+            frameSize = { width: (box && box.width) || 1, height: (box && box.height) || 1 };
             
-            const img = new Image();
-            img.onload = function() {
-                ctx.fillStyle = '#f8fafc';
-                ctx.fillRect(0, 0, canvas.width, canvas.height);
-                ctx.drawImage(img, 0, 0);
-                
-                // Add timestamp overlay
-                ctx.fillStyle = 'rgba(0, 0, 0, 0.7)';
-                ctx.fillRect(10, 10, 200, 40);
-                ctx.fillStyle = 'white';
-                ctx.font = '14px Arial';
-                ctx.fillText(`Messages: ${messageCount}`, 20, 30);
-                ctx.fillText(`Stage: ${agentSequence.length}`, 20, 48);
-                
-                recordedFrames.push(canvas.toDataURL('image/png'));
-                URL.revokeObjectURL(url);
-            };
-            img.src = url;
+            // Serialize SVG to an object URL; the previous one is no longer needed
+            // once the image has moved on to this one
+            const svgBlob = new Blob([frameSerializer.serializeToString(svg)], {type: 'image/svg+xml;charset=utf-8'});
+            if (frameUrl) URL.revokeObjectURL(frameUrl);
+            frameUrl = URL.createObjectURL(svgBlob);
+            loadingSvg = svg;
+            decodedSvg = null;
+            frameImg.src = frameUrl;
         }
         
         function startRecording() {
             if (isRecording) return;
+            if (typeof MediaRecorder === 'undefined' || !recordCanvas.captureStream) {
+                alert('Recording is not supported in this browser.');
+                return;
+            }
             
+            const mimeType = ['video/webm;codecs=vp9', 'video/webm;codecs=vp8', 'video/webm']
+                .find(type => MediaRecorder.isTypeSupported(type));
+            recordedChunks = [];
+            recorder = new MediaRecorder(recordCanvas.captureStream(), mimeType ? { mimeType } : {});
+            recorder.ondataavailable = event => {
+                if (event.data.size > 0) recordedChunks.push(event.data);
+            };
+            recorder.onstop = () => {
+                document.getElementById('btn-download').disabled = recordedChunks.length === 0;
+                console.log(`Recording stopped. Captured ${recordedChunks.length} chunks`);
+            };
+            recorder.start(1000);
             isRecording = true;
-            recordedFrames = [];
             
             document.getElementById('btn-record').disabled = true;
             document.getElementById('btn-stop').disabled = false;
             document.getElementById('recording-indicator').classList.add('active');
             
-            // Capture frame every 500ms
-            recordingInterval = setInterval(captureFrame, 500);
+            // Capture at most every 500ms, and only after something changed;
+            // requestAnimationFrame also pauses capture in background tabs
             captureFrame(); // Capture first frame immediately
+            graphDirty = false;
+            lastCaptureTs = performance.now();
+            recordingFrame = requestAnimationFrame(recordTick);
             
             console.log('Recording started');
         }
         
+        function recordTick(ts) {
+            if (!isRecording) return;
+            if (graphDirty && ts - lastCaptureTs >= CAPTURE_INTERVAL_MS) {
+                captureFrame();
+                graphDirty = false;
+                lastCaptureTs = ts;
+            }
+            recordingFrame = requestAnimationFrame(recordTick);
+        }
+        
         function stopRecording() {
             if (!isRecording) return;
             
             isRecording = false;
-            clearInterval(recordingInterval);
+            cancelAnimationFrame(recordingFrame);
+            recorder.stop();
             
             document.getElementById('btn-stop').disabled = true;
-            document.getElementById('btn-download').disabled = false;
             document.getElementById('recording-indicator').classList.remove('active');
-            
-            console.log(`Recording stopped. Captured ${recordedFrames.length} frames`);
         }
         
-        async function downloadAnimation() {
-            if (recordedFrames.length === 0) {
+        function downloadAnimation() {
+            if (recordedChunks.length === 0) {
                 alert('No frames recorded!');
                 return;
             }
             
-            // Show loading message
-            const downloadBtn = document.getElementById('btn-download');
-            downloadBtn.textContent = 'Creating GIF...';
-            downloadBtn.disabled = true;
+            const video = new Blob(recordedChunks, {type: 'video/webm'});
+            downloadFile(video, `agent-conversation-${runId.substring(0, 8)}.webm`);
             
-            try {
-                // Create GIF using recorded frames
-                const images = await Promise.all(
-                    recordedFrames.map(dataUrl => {
-                        return new Promise((resolve) => {
-                            const img = new Image();
-                            img.onload = () => resolve(img);
-                            img.src = dataUrl;
-                        });
-                    })
-                );
-                
-                // Create canvas for each frame
-                const canvas = document.createElement('canvas');
-                canvas.width = images[0].width;
-                canvas.height = images[0].height;
-                const ctx = canvas.getContext('2d');
-                
-                // Generate WebM video as fallback (since GIF.js might not be available)
-                // Create a simple frame-by-frame download
-                const zip = await createFramesZip(recordedFrames);
-                downloadFile(zip, `agent-conversation-${runId.substring(0, 8)}-frames.zip`);
-                
-                downloadBtn.innerHTML = '<span>⬇</span> Download GIF';
-                downloadBtn.disabled = false;
-                
-                // Reset recording
-                document.getElementById('btn-record').disabled = false;
-                recordedFrames = [];
-                
-                alert(`Downloaded ${images.length} frames as ZIP file!\\n\\nYou can use tools like GIMP, Photoshop, or online converters to create a GIF from these frames.`);
-                
-            } catch (error) {
-                console.error('Error creating animation:', error);
-                alert('Error creating animation. See console for details.');
-                downloadBtn.innerHTML = '<span>⬇</span> Download GIF';
-                downloadBtn.disabled = false;
-            }
-        }
-        
-        async function createFramesZip(frames) {
-            // Simple implementation: create a text file with data URLs
-            // In production, you'd use JSZip library
-            let zipContent = '';
-            frames.forEach((frame, i) => {
-                zipContent += `Frame ${i + 1}:\\n${frame}\\n\\n`;
-            });
-            return new Blob([zipContent], {type: 'text/plain'});
+            // Reset recording
+            document.getElementById('btn-download').disabled = true;
+            document.getElementById('btn-record').disabled = false;
+            recordedChunks = [];
         }
         
         function downloadFile(blob, filename) {
@@ -565,20 +857,106 @@ def build_live_html_page() -> str:
     </script>
 </body>
 </html>
+    """).render(
+    frame_types=json.dumps([None, *_FRAME_TYPES]),
+    frame_fields=json.dumps(_FRAME_FIELDS),
+)
+_LIVE_HTML_BYTES = _LIVE_HTML.encode("utf-8")
+_LIVE_HTML_GZ = gzip.compress(_LIVE_HTML_BYTES, compresslevel=9)
+_LIVE_HTML_BR = brotli.compress(_LIVE_HTML_BYTES, quality=11) if brotli is not None else None
+
+
+def build_live_html_page() -> str:
+    """
+    Build an HTML page with live updates via Server-Sent Events.
+    The page connects to /graph/live/{run_id}/stream endpoint.
+    """
+    return _LIVE_HTML
+
+
+def build_live_html_bytes() -> bytes:
+    """build_live_html_page() as UTF-8 bytes, for writing straight to a response."""
+    return _LIVE_HTML_BYTES
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.partition(";")
+        if name.strip() == coding:
+            q = params.strip()
+            return not (q.startswith("q=") and q[2:].strip() in ("0", "0.0", "0.00", "0.000"))
+    return False
+
+
+def build_live_html_compressed(accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+    """
+    The live page for a request's Accept-Encoding header, compressed once at import.
+    
+    Returns:
+        (body, content coding): brotli when accepted and available, else gzip
+        when accepted, else the plain UTF-8 page with a coding of None
+    """
+    if _LIVE_HTML_BR is not None and _accepts(accept_encoding, "br"):
+        return _LIVE_HTML_BR, "br"
+    if _accepts(accept_encoding, "gzip"):
+        return _LIVE_HTML_GZ, "gzip"
+    return _LIVE_HTML_BYTES, None
+
+
+# "[DEBATE <transition>|<speaker>|..." header that starts a debate message
+_DEBATE_RE = re.compile(r"\[DEBATE ([^|]+)\|([^|]+)\|")
+
+
+def message_update(role: str, content: str, index: int) -> Dict[str, Any]:
     """
-    return html
+    Data of a live "message" update.
+    
+    Only what the live page draws is sent: the role and, for debate
+    messages, the transition and speaker from the debate header. The
+    message body itself is left out.
+    """
+    match = _DEBATE_RE.match(content)
+    return {
+        "role": role,
+        "debate": match is not None,
+        "transition": match.group(1).strip() if match else "",
+        "speaker": match.group(2).strip() if match else "",
+        "index": index,
+    }
 
 
-def generate_sse_update(update_type: str, data: Dict[str, Any]) -> str:
+def generate_sse_update(update_type: str, data: Dict[str, Any]) -> bytes:
     """
     Generate a Server-Sent Event message.
     
     Args:
-        update_type: Type of update (init, message, complete, error)
+        update_type: Type of update (init, message, delta, complete, error)
         data: Data payload to send
     
     Returns:
-        Formatted SSE message string
+        Formatted SSE message, UTF-8 encoded
     """
     payload = {"type": update_type, **data}
-    return f"data: {json.dumps(payload)}\n\n"
+    if orjson is not None:
+        body = orjson.dumps(payload)
+    else:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return _SSE_PREFIX + body + _SSE_SUFFIX
+
+
+def encode_live_frame(update_type: str, data: Dict[str, Any]) -> bytes:
+    """
+    Encode a live update as a binary WebSocket frame.
+    
+    The frame is one type tag byte followed by the type's fields from
+    _FRAME_FIELDS, each a big-endian uint16 byte length and that many UTF-8
+    bytes. Fields longer than 65535 bytes are cut at a character boundary.
+    """
+    parts = [bytes((_FRAME_TAGS[update_type],))]
+    for field in _FRAME_FIELDS[update_type]:
+        raw = str(data.get(field) or "").encode("utf-8")
+        if len(raw) > _MAX_FIELD_BYTES:
+            raw = raw[:_MAX_FIELD_BYTES].decode("utf-8", "ignore").encode("utf-8")
+        parts.append(struct.pack(">H", len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
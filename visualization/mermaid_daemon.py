@@ -0,0 +1,109 @@
+"""Long-lived headless Chromium that keeps mermaid.js loaded for server-side renders.
+
+Launching mmdc starts a browser per diagram, which costs far more than the
+layout itself. When playwright is installed, render_sync() instead sends the
+source to one browser page started on first use, so each further diagram
+costs only Mermaid's layout. Playwright's sync API is bound to the thread
+that started it, so every browser call runs on one dedicated worker thread.
+The browser is shut down at exit.
+
+Environment:
+    MERMAID_JS_URL:  mermaid.js loaded into the page
+                     (default: https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+try:  # optional, persistent browser renderer
+    from playwright.sync_api import sync_playwright  # type: ignore
+except Exception:  # pragma: no cover
+    sync_playwright = None  # type: ignore
+
+_DEFAULT_MERMAID_JS = "https://cdn.jsdelivr.net/npm/mermaid@10/dist/mermaid.min.js"
+
+_executor: Optional[ThreadPoolExecutor] = None
+_state: Dict[str, Any] = {}  # playwright, browser, page; touched only on the worker thread
+_failed = False
+_lock = threading.Lock()
+_render_count = 0
+
+
+def available() -> bool:
+    """Whether a browser render may be attempted (playwright installed, no failed start)."""
+    return sync_playwright is not None and not _failed
+
+
+def _start(config: Dict[str, Any]) -> None:
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch()
+    page = browser.new_page()
+    page.set_content("<!DOCTYPE html><html><body></body></html>")
+    page.add_script_tag(url=os.getenv("MERMAID_JS_URL", _DEFAULT_MERMAID_JS))
+    page.evaluate(
+        "config => mermaid.initialize(Object.assign({startOnLoad: false}, config))",
+        config,
+    )
+    _state.update(playwright=playwright, browser=browser, page=page)
+
+
+def _render(source: str, config: Dict[str, Any], diagram_id: str) -> str:
+    if "page" not in _state:
+        _start(config)
+    result = _state["page"].evaluate(
+        "([id, src]) => mermaid.render(id, src).then(r => r.svg)",
+        [diagram_id, source],
+    )
+    return str(result)
+
+
+def _stop() -> None:
+    browser, playwright = _state.pop("browser", None), _state.pop("playwright", None)
+    _state.clear()
+    try:
+        if browser is not None:
+            browser.close()
+        if playwright is not None:
+            playwright.stop()
+    except Exception:  # pragma: no cover - best effort at exit
+        pass
+
+
+def render_sync(source: str, config: Dict[str, Any], timeout: float = 30.0) -> Optional[str]:
+    """SVG for source from the shared browser page, or None if the browser is unavailable."""
+    global _executor, _failed, _render_count
+    if not available():
+        return None
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mermaid-daemon")
+            atexit.register(shutdown)
+        _render_count += 1
+        diagram_id = f"diagram-{_render_count}"
+        executor = _executor
+    try:
+        return executor.submit(_render, source, config, diagram_id).result(timeout=timeout)
+    except Exception as exc:
+        if "page" not in _state:
+            # Never started (no browser binary, no network for mermaid.js): stop trying
+            _failed = True
+            logging.warning(f"Mermaid browser renderer unavailable, falling back: {exc}")
+        else:
+            logging.warning(f"Mermaid browser render failed: {json.dumps(source[:80])}: {exc}")
+        return None
+
+
+def shutdown() -> None:
+    """Close the browser and its worker thread."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.submit(_stop).result()
+        executor.shutdown()
@@ -0,0 +1,74 @@
+"""Server-side Mermaid rendering, for pages that never change.
+
+render_mermaid_svg() turns a diagram source into inline SVG, so the browser
+needs neither mermaid.js nor a layout pass. It uses the persistent browser
+of visualization.mermaid_daemon when playwright is installed, and otherwise
+runs mermaid-cli (mmdc) once per diagram. It returns None when neither is
+available or rendering fails, and callers then fall back to client-side
+rendering. Results are cached per source.
+
+Environment:
+    MERMAID_PRERENDER:  auto|true|false; auto renders only when playwright or
+                        the CLI is available (default: auto)
+    MERMAID_CLI:        mermaid-cli executable (default: mmdc)
+    MERMAID_TIMEOUT_S:  Seconds allowed per render (default: 30)
+"""
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from visualization import mermaid_daemon
+
+# Mirrors the mermaid.initialize() options of the client-side pages
+_DEFAULT_CONFIG: Dict[str, Any] = {
+    "theme": "default",
+    "flowchart": {"useMaxWidth": True, "htmlLabels": True, "curve": "basis"},
+}
+
+
+def _cli(mode: str) -> Optional[str]:
+    cli = shutil.which(os.getenv("MERMAID_CLI", "mmdc"))
+    if cli is None and mode in ("1", "true", "on"):
+        logging.warning("MERMAID_PRERENDER requested but no Mermaid renderer is available; rendering client-side")
+    return cli
+
+
+@functools.lru_cache(maxsize=128)
+def render_mermaid_svg(source: str) -> Optional[str]:
+    """Inline SVG markup for a Mermaid diagram, or None to render it in the browser."""
+    mode = os.getenv("MERMAID_PRERENDER", "auto").lower()
+    if mode in ("0", "false", "off"):
+        return None
+    timeout = float(os.getenv("MERMAID_TIMEOUT_S", "30"))
+    if mermaid_daemon.available():
+        svg = mermaid_daemon.render_sync(source, _DEFAULT_CONFIG, timeout)
+        if svg is not None:
+            return svg
+    cli = _cli(mode)
+    if cli is None:
+        return None
+    with tempfile.TemporaryDirectory(prefix="mermaid-") as tmp:
+        tmp_dir = Path(tmp)
+        (tmp_dir / "diagram.mmd").write_text(source, encoding="utf-8")
+        (tmp_dir / "config.json").write_text(json.dumps(_DEFAULT_CONFIG), encoding="utf-8")
+        try:
+            subprocess.run(
+                [cli, "--quiet", "-i", str(tmp_dir / "diagram.mmd"), "-o", str(tmp_dir / "diagram.svg"),
+                 "-c", str(tmp_dir / "config.json"), "-b", "transparent"],
+                check=True,
+                capture_output=True,
+                timeout=timeout,
+            )
+            return (tmp_dir / "diagram.svg").read_text(encoding="utf-8")
+        except (OSError, subprocess.SubprocessError) as exc:
+            stderr = getattr(exc, "stderr", None) or b""
+            logging.warning(f"mermaid-cli render failed, rendering client-side: {exc} {stderr.decode(errors='replace')[:200]}")
+            return None
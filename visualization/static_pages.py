@@ -0,0 +1,77 @@
+"""Graph pages of completed runs, materialized as gzip files.
+
+A completed run's trace never changes, so the first render of each of its
+pages is also written to GRAPH_CACHE_DIR as <run_id>.<kind>.html.gz. Later
+requests are answered straight from that file, with no page building or
+compression in Python. A file older than its trace.json is stale and is
+ignored until the next render replaces it. The files do not track changes to
+the page builders themselves; clear the directory after upgrading.
+
+Environment:
+    GRAPH_CACHE_DIR:  Directory of materialized pages (default: data/graph_cache)
+"""
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+try:  # optional, reads the status without parsing the turns
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover
+    ijson = None  # type: ignore
+
+_DEFAULT_DIR = Path(__file__).resolve().parent.parent / "data" / "graph_cache"
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("GRAPH_CACHE_DIR") or _DEFAULT_DIR)
+
+
+def page_path(kind: str, run_id: str) -> Path:
+    """Where the gzipped 'flow' or 'animated' page of run_id is materialized."""
+    return _cache_dir() / f"{run_id}.{kind}.html.gz"
+
+
+def fresh_page(kind: str, run_id: str, trace_path: str) -> Optional[Path]:
+    """The materialized page if it exists and is not older than the trace."""
+    path = page_path(kind, run_id)
+    try:
+        if path.stat().st_mtime_ns >= os.stat(trace_path).st_mtime_ns:
+            return path
+    except OSError:
+        pass
+    return None
+
+
+def trace_status(trace_path: str) -> Optional[str]:
+    """The top-level status of a trace.json, or None if it cannot be read."""
+    try:
+        with open(trace_path, "rb") as f:
+            if ijson is None:
+                return json.load(f).get("status")
+            # status precedes turns in trace.json, so this stops early
+            for prefix, event, value in ijson.parse(f):
+                if prefix == "status" and event == "string":
+                    return value
+    except Exception:  # unreadable or malformed trace
+        pass
+    return None
+
+
+def materialize(kind: str, run_id: str, gzipped: bytes) -> Path:
+    """Write a page's gzip bytes to its cache file, atomically."""
+    path = page_path(kind, run_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(gzipped)
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+    return path
+
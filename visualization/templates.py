@@ -0,0 +1,32 @@
+"""Static HTML page templates with named slots.
+
+Pages embed large CSS and JavaScript blocks full of braces, dollar signs and
+percent signs, which str.format, string.Template and %-formatting would all
+require escaping. A template here marks its slots as @@name@@ instead; it is
+split into static parts once, at import, and rendering joins the parts with
+the slot values.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, List, Tuple
+
+_SLOT_RE = re.compile(r"@@(\w+)@@")
+
+
+class PageTemplate:
+    """A text split at its @@name@@ slots; render(**values) fills them in."""
+
+    __slots__ = ("_parts", "_names")
+
+    def __init__(self, text: str) -> None:
+        pieces = _SLOT_RE.split(text)
+        self._parts: Tuple[str, ...] = tuple(pieces[0::2])
+        self._names: Tuple[str, ...] = tuple(pieces[1::2])
+
+    def render(self, **values: Any) -> str:
+        out: List[str] = [self._parts[0]]
+        for name, part in zip(self._names, self._parts[1:]):
+            out.append(str(values[name]))
+            out.append(part)
+        return "".join(out)
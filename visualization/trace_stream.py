@@ -0,0 +1,72 @@
+"""Single-pass access to a run trace for the graph page builders.
+
+open_trace() accepts either the parsed trace dict or the path of a
+trace.json. Paths are parsed incrementally with ijson when it is installed,
+so messages are handed out one at a time instead of the whole trace being
+held in memory.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple, Union
+
+try:  # optional, incremental parsing of trace.json
+    import ijson  # type: ignore
+except Exception:  # pragma: no cover
+    ijson = None  # type: ignore
+
+TraceSource = Union[Dict[str, Any], str, Path]
+
+_MESSAGE_PREFIX = "turns.item.messages.item"
+_SCALAR_EVENTS = frozenset(("string", "number", "boolean", "null"))
+
+
+def open_trace(trace: TraceSource) -> Tuple[Dict[str, Any], Iterator[Tuple[int, Dict[str, Any]]]]:
+    """(header, messages) for a trace dict or trace.json path.
+
+    messages yields (turn index, message) in trace order. header holds the
+    top-level scalar fields (run_id, topic, status, ...) plus "turn_count";
+    for a path it is complete only once messages has been exhausted.
+    """
+    if isinstance(trace, dict):
+        header = {k: v for k, v in trace.items() if k != "turns"}
+        turns = trace.get("turns") or []
+        header["turn_count"] = len(turns)
+        return header, (
+            (i, msg) for i, turn in enumerate(turns) for msg in turn.get("messages", [])
+        )
+    header: Dict[str, Any] = {}
+    return header, _stream_messages(Path(trace), header)
+
+
+def _stream_messages(path: Path, header: Dict[str, Any]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if ijson is None:
+        trace = json.loads(path.read_bytes())
+        full, messages = open_trace(trace)
+        yield from messages
+        header.update(full)
+        return
+    turn = -1
+    builder = None
+    depth = 0
+    with path.open("rb") as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                    if depth == 0:
+                        yield turn, builder.value
+                        builder = None
+            elif prefix == _MESSAGE_PREFIX and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                depth = 1
+            elif prefix == "turns.item" and event == "start_map":
+                turn += 1
+            elif event in _SCALAR_EVENTS and prefix and "." not in prefix:
+                header[prefix] = value
+    header["turn_count"] = turn + 1